@@ -0,0 +1,169 @@
+"""
+Particionamento do cadastro por agência
+Um arquivo SQLite por agência, aberto sob demanda; consultas globais em paralelo
+
+A agência padrão ("0001") continua usando `banco_clientes.db`; as demais
+ficam em `banco_clientes_<agencia>.db` no mesmo diretório. Operações de uma
+agência usam apenas o seu arquivo (`banco(agencia)`), enquanto estatísticas,
+listagens e buscas são enviadas a todas as agências em um pool de threads (o
+SQLite libera o GIL durante as consultas) e os resultados são combinados.
+
+`ProcessadorOperacoes(agencias=...)` cadastra e localiza os clientes no banco
+da agência informada em cada operação. O menu de `desafio.py` e o
+`sistema_clientes.py` seguem usando apenas o banco padrão.
+
+CPF e CNPJ são únicos dentro de cada agência.
+"""
+
+import heapq
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from database import DB_PATH, DatabaseManager, obter_gerenciador
+
+AGENCIA_PADRAO = "0001"
+
+# Código de agência: quatro dígitos (também compõe o nome do arquivo).
+_REGEX_AGENCIA = re.compile(r"\d{4}")
+
+T = TypeVar("T")
+
+
+class GerenciadorAgencias:
+    """Abre o banco de cada agência sob demanda e distribui as consultas globais."""
+
+    def __init__(self, diretorio=None, max_threads: Optional[int] = None):
+        self.diretorio = Path(diretorio) if diretorio else DB_PATH.parent
+        self.max_threads = max_threads or min(32, (os.cpu_count() or 1) + 4)
+        self._abertas: Dict[str, DatabaseManager] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._trava = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.encerrar()
+
+    def caminho(self, agencia: str) -> Path:
+        """Arquivo do banco da agência; `ValueError` se o código for inválido."""
+        if not _REGEX_AGENCIA.fullmatch(str(agencia)):
+            raise ValueError(f"Agência inválida: {agencia!r}")
+        if agencia == AGENCIA_PADRAO:
+            return self.diretorio / DB_PATH.name
+        return self.diretorio / f"{DB_PATH.stem}_{agencia}{DB_PATH.suffix}"
+
+    def banco(self, agencia: str = AGENCIA_PADRAO) -> DatabaseManager:
+        """Gerenciador do banco da agência, criado no primeiro uso."""
+        gerenciador = self._abertas.get(agencia)
+        if gerenciador is None:
+            gerenciador = obter_gerenciador(self.caminho(agencia))
+            with self._trava:
+                self._abertas.setdefault(agencia, gerenciador)
+        return gerenciador
+
+    def agencias(self) -> List[str]:
+        """Agências com banco no diretório ou já abertas, em ordem."""
+        encontradas = set(self._abertas)
+        if self.caminho(AGENCIA_PADRAO).exists():
+            encontradas.add(AGENCIA_PADRAO)
+        prefixo = f"{DB_PATH.stem}_"
+        for arquivo in self.diretorio.glob(f"{prefixo}*{DB_PATH.suffix}"):
+            agencia = arquivo.stem[len(prefixo):]
+            if _REGEX_AGENCIA.fullmatch(agencia):
+                encontradas.add(agencia)
+        return sorted(encontradas)
+
+    def difundir(self, funcao: Callable[[DatabaseManager], T],
+                 agencias: Optional[List[str]] = None) -> Dict[str, T]:
+        """Executa `funcao(banco)` em todas as agências, em paralelo."""
+        agencias = self.agencias() if agencias is None else agencias
+        if len(agencias) <= 1:
+            return {agencia: funcao(self.banco(agencia)) for agencia in agencias}
+
+        with self._trava:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_threads, thread_name_prefix="agencia"
+                )
+        futuros = {
+            agencia: self._executor.submit(funcao, self.banco(agencia))
+            for agencia in agencias
+        }
+        return {agencia: futuro.result() for agencia, futuro in futuros.items()}
+
+    def buscar_cliente_por_documento(self, documento: str) -> Optional[Dict]:
+        """Busca o cliente em todas as agências; o resultado traz a `agencia`."""
+        resultados = self.difundir(lambda db: db.buscar_cliente_por_documento(documento))
+        for agencia, cliente in resultados.items():
+            if cliente:
+                return {**cliente, "agencia": agencia}
+        return None
+
+    def buscar_por_nome(self, termo: str, limite: int = 20) -> List[Dict]:
+        """Busca por nome em todas as agências, ordenando pela relevância."""
+        resultados = self.difundir(lambda db: db.buscar_por_nome(termo, limite))
+        combinados = [
+            {**cliente, "agencia": agencia}
+            for agencia, clientes in resultados.items()
+            for cliente in clientes
+        ]
+        return heapq.nsmallest(limite, combinados, key=lambda c: c["relevancia"])
+
+    def listar_pessoas_fisicas(self) -> List[Dict]:
+        """Pessoas físicas de todas as agências, ordenadas por nome."""
+        return self._listar(lambda db: db.listar_pessoas_fisicas(), "nome")
+
+    def listar_pessoas_juridicas(self) -> List[Dict]:
+        """Pessoas jurídicas de todas as agências, ordenadas por razão social."""
+        return self._listar(lambda db: db.listar_pessoas_juridicas(), "razao_social")
+
+    def _listar(self, funcao, ordem: str) -> List[Dict]:
+        # Cada agência já devolve a lista ordenada: basta intercalar.
+        listas = [
+            [{**cliente, "agencia": agencia} for cliente in clientes]
+            for agencia, clientes in self.difundir(funcao).items()
+        ]
+        return list(heapq.merge(*listas, key=lambda cliente: cliente[ordem]))
+
+    def contar_por_uf(self) -> Dict[str, int]:
+        """Clientes ativos por UF, somados entre as agências."""
+        total = Counter()
+        for contagem in self.difundir(lambda db: db.contar_por_uf()).values():
+            total.update(contagem)
+        return dict(sorted(total.items(), key=lambda item: (-item[1], item[0])))
+
+    def obter_estatisticas(self) -> Dict:
+        """Estatísticas de todas as agências, com o total `por_agencia`."""
+        por_agencia = self.difundir(lambda db: db.obter_estatisticas())
+        estatisticas = {
+            'pessoas_fisicas': 0,
+            'pessoas_juridicas': 0,
+            'total': 0,
+            'por_mes': Counter(),
+            'por_uf': Counter(),
+            'por_faixa_etaria': Counter(),
+            'por_agencia': {},
+        }
+        for agencia, parcial in por_agencia.items():
+            for chave in ('pessoas_fisicas', 'pessoas_juridicas', 'total'):
+                estatisticas[chave] += parcial[chave]
+            for chave in ('por_mes', 'por_uf', 'por_faixa_etaria'):
+                estatisticas[chave].update(parcial[chave])
+            estatisticas['por_agencia'][agencia] = parcial['total']
+
+        estatisticas['por_mes'] = dict(sorted(estatisticas['por_mes'].items()))
+        estatisticas['por_uf'] = dict(sorted(estatisticas['por_uf'].items()))
+        estatisticas['por_faixa_etaria'] = dict(estatisticas['por_faixa_etaria'])
+        return estatisticas
+
+    def encerrar(self):
+        """Finaliza o pool de threads."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
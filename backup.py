@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Backups online do banco de clientes
+Usa a API de backup do SQLite em passos, com retenção e verificação de integridade
+
+Exemplos:
+    python backup.py --diretorio backups --manter 7
+    python backup.py --diretorio backups --manter 24 --intervalo 3600
+    python backup.py --medir 200000
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from database import DatabaseManager, obter_gerenciador
+from instrumentacao import Histograma
+from metricas import metricas
+
+
+class GerenciadorBackups:
+    """Executa backups verificados, sob demanda ou periodicamente."""
+
+    def __init__(
+        self,
+        db: Optional[DatabaseManager] = None,
+        diretorio="backups",
+        manter: int = 7,
+        intervalo: Optional[float] = None,
+        paginas_por_passo: int = 256,
+        pausa: float = 0.005,
+    ):
+        self.db = db or obter_gerenciador()
+        self.diretorio = Path(diretorio)
+        self.manter = manter
+        self.intervalo = intervalo
+        self.paginas_por_passo = paginas_por_passo
+        self.pausa = pausa
+        self._parar = threading.Event()
+        self._thread = None
+
+    @property
+    def _prefixo(self) -> str:
+        return Path(self.db.db_path).stem
+
+    def executar(self) -> Optional[Path]:
+        """Faz um backup, verifica a integridade e aplica a retenção.
+
+        A cópia é gravada em um arquivo temporário e só recebe o nome final
+        depois de aprovada no `integrity_check`.
+        """
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        carimbo = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        destino = self.diretorio / f"{self._prefixo}-{carimbo}.db"
+        temporario = destino.with_name(f".{destino.name}.tmp")
+
+        if not self.db.fazer_backup(temporario, self.paginas_por_passo, self.pausa):
+            metricas.incrementar("banco_backups_total", resultado="erro")
+            temporario.unlink(missing_ok=True)
+            return None
+
+        if not self.db.verificar_integridade(temporario):
+            print(f"❌ Backup {destino.name} reprovado na verificação de integridade!")
+            metricas.incrementar("banco_backups_total", resultado="corrompido")
+            temporario.unlink(missing_ok=True)
+            return None
+
+        os.replace(temporario, destino)
+        metricas.incrementar("banco_backups_total", resultado="sucesso")
+        self.aplicar_retencao()
+        return destino
+
+    def listar(self) -> List[Path]:
+        """Backups existentes, do mais antigo para o mais recente."""
+        return sorted(self.diretorio.glob(f"{self._prefixo}-*.db"))
+
+    def aplicar_retencao(self):
+        """Remove os backups mais antigos além dos `manter` mais recentes."""
+        backups = self.listar()
+        for antigo in backups[:max(len(backups) - self.manter, 0)]:
+            antigo.unlink()
+
+    def iniciar(self):
+        """Executa um backup agora e depois a cada `intervalo` segundos.
+
+        Sem `intervalo`, a thread faz um único backup e termina.
+        """
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._laco, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        """Interrompe o agendamento após o backup em andamento."""
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _laco(self):
+        while True:
+            self.executar()
+            if self.intervalo is None or self._parar.wait(self.intervalo):
+                break
+
+
+def _escrever(db_path, primeiro_indice: int, duracao: float) -> Histograma:
+    """Insere clientes um a um durante `duracao` segundos, medindo cada commit."""
+    from gerador_dados import cpf_por_indice
+
+    latencias = Histograma()
+    conn = sqlite3.connect(db_path, timeout=30)
+    fim = time.perf_counter() + duracao
+    indice = primeiro_indice
+    try:
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO pessoas_fisicas "
+                    "(nome, cpf, data_nascimento, endereco, data_cadastro) "
+                    "VALUES (?, ?, '01/01/1990', 'Rua Teste, 1', '')",
+                    (f"Cliente {indice}", cpf_por_indice(indice, semente=99)),
+                )
+            latencias.registrar(time.perf_counter() - inicio)
+            indice += 1
+    finally:
+        conn.close()
+    return latencias
+
+
+def medir_impacto(clientes: int = 100_000, duracao: float = 3.0,
+                  paginas_por_passo: int = 256, pausa: float = 0.005) -> Dict:
+    """Compara a latência de escrita sem e com backups contínuos em paralelo."""
+    from gerador_dados import escrever_sqlite
+
+    resultado = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        db_path = Path(diretorio) / "medicao.db"
+        escrever_sqlite(db_path, total_pf=clientes)
+        db = DatabaseManager(db_path)
+
+        resultado["sem_backup"] = _escrever(db_path, 0, duracao).resumo()
+
+        backups = GerenciadorBackups(
+            db, Path(diretorio) / "backups", manter=1, intervalo=0,
+            paginas_por_passo=paginas_por_passo, pausa=pausa,
+        )
+        antes = metricas.valor("banco_backups_total", resultado="sucesso")
+        backups.iniciar()
+        resultado["com_backup"] = _escrever(db_path, 10_000_000, duracao).resumo()
+        backups.parar()
+        resultado["backups"] = metricas.valor("banco_backups_total", resultado="sucesso") - antes
+
+    return resultado
+
+
+def main():
+    """Ponto de entrada dos backups."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--banco", help="caminho do banco (padrão: banco_clientes.db)")
+    parser.add_argument("--diretorio", default="backups")
+    parser.add_argument("--manter", type=int, default=7, help="quantidade de cópias mantidas")
+    parser.add_argument("--intervalo", type=float, help="segundos entre backups (agendado)")
+    parser.add_argument("--paginas-por-passo", type=int, default=256)
+    parser.add_argument("--pausa", type=float, default=0.005,
+                        help="segundos de pausa entre os passos")
+    parser.add_argument("--medir", type=int, metavar="CLIENTES",
+                        help="mede o impacto na latência de escrita em um banco sintético")
+    args = parser.parse_args()
+
+    if args.medir:
+        resultado = medir_impacto(args.medir, paginas_por_passo=args.paginas_por_passo,
+                                  pausa=args.pausa)
+        print(f"\n{'Cenário':<12} {'Escritas':>9} {'p50 (µs)':>10} {'p99 (µs)':>10} {'máx (µs)':>10}")
+        for cenario in ("sem_backup", "com_backup"):
+            dados = resultado[cenario]
+            print(f"{cenario:<12} {dados['chamadas']:>9} {dados['p50_us']:>10} "
+                  f"{dados['p99_us']:>10} {dados['max_us']:>10}")
+        print(f"\n💾 {resultado['backups']:.0f} backup(s) concluído(s) durante a medição")
+        return
+
+    backups = GerenciadorBackups(
+        obter_gerenciador(args.banco), args.diretorio, args.manter, args.intervalo,
+        args.paginas_por_passo, args.pausa,
+    )
+
+    if args.intervalo is None:
+        destino = backups.executar()
+        if destino:
+            print(f"✅ Backup gravado em {destino}")
+        return
+
+    print(f"⏱️  Backup a cada {args.intervalo:g} s em {backups.diretorio} (Ctrl+C para sair)")
+    backups.iniciar()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        backups.parar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark do motor de contas particionado (shards)
+Mede a vazão de depósitos e saques variando o número de processos de 1 a N
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from operacoes import operacao
+from shards import MotorShards
+
+
+def montar_carga(num_contas, num_operacoes):
+    """Gera operações de cadastro e a carga de transações."""
+    cadastro = []
+    for i in range(num_contas):
+        cpf = f"{i:011d}"
+        cadastro.append(operacao(
+            "criar_cliente", cpf,
+            nome=f"Cliente {i}",
+            data_nascimento="01/01/1990",
+            endereco="Rua Teste, 1 - Centro - São Paulo/SP",
+        ))
+        cadastro.append(operacao("criar_conta", cpf, numero=i + 1))
+
+    transacoes = []
+    for i in range(num_operacoes):
+        cpf = f"{i % num_contas:011d}"
+        nome = "depositar" if i % 3 else "sacar"
+        transacoes.append(operacao(nome, cpf, valor=10.0))
+
+    return cadastro, transacoes
+
+
+def medir(num_shards, cadastro, transacoes, tamanho_lote):
+    """Executa a carga em um motor com `num_shards` processos."""
+    with MotorShards(num_shards) as motor:
+        motor.executar_lote(cadastro)
+
+        inicio = time.perf_counter()
+        for i in range(0, len(transacoes), tamanho_lote):
+            motor.executar_lote(transacoes[i:i + tamanho_lote])
+        duracao = time.perf_counter() - inicio
+
+        total_contas = len(motor.listar_contas())
+
+    return duracao, total_contas
+
+
+def main():
+    """Executa o benchmark de escalabilidade."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-shards", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--operacoes", type=int, default=100_000)
+    parser.add_argument("--lote", type=int, default=2_000)
+    args = parser.parse_args()
+
+    # Cada conta aceita no máximo 10 transações por dia.
+    num_contas = max(1, args.operacoes // 10)
+    cadastro, transacoes = montar_carga(num_contas, args.operacoes)
+
+    print("🚀 BENCHMARK: Motor de contas particionado")
+    print(f"📋 {args.operacoes} transações em {num_contas} contas, lotes de {args.lote}")
+    print("=" * 60)
+    print(f"{'Shards':>6} {'Tempo (s)':>10} {'Ops/s':>12} {'Speedup':>8}")
+
+    base = None
+    for num_shards in range(1, args.max_shards + 1):
+        duracao, total_contas = medir(num_shards, cadastro, transacoes, args.lote)
+        vazao = args.operacoes / duracao
+        base = base or vazao
+        print(
+            f"{num_shards:>6} {duracao:>10.3f} {vazao:>12.0f} {vazao / base:>7.2f}x"
+        )
+
+        if total_contas != num_contas:
+            print(f"⚠️  Esperadas {num_contas} contas, encontradas {total_contas}")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
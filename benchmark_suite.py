@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks dos caminhos críticos do Sistema Bancário
+Gera resultados em JSON que podem ser comparados entre commits
+
+Exemplos:
+    python benchmark_suite.py --saida base.json
+    python benchmark_suite.py --comparar base.json --limite 0.10
+    python benchmark_suite.py --tamanhos 1000 10000 100000 1000000
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import textwrap
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import desafio
+from database import DatabaseManager, calcular_digitos_cpf, obter_gerenciador
+from idempotencia import cache_idempotencia
+from limites import MotorLimites, Regra, motor_limites
+from operacoes import silenciar_saida
+
+BENCHMARKS = []
+
+
+def benchmark(func):
+    """Registra uma função de benchmark na suíte."""
+    BENCHMARKS.append(func)
+    return func
+
+
+def medir(funcao, operacoes=1, repeticoes=5):
+    """Executa `funcao` várias vezes e retorna as estatísticas de tempo."""
+    funcao()  # Aquecimento.
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    mediana = statistics.median(tempos)
+    return {
+        "operacoes": operacoes,
+        "mediana_s": mediana,
+        "min_s": min(tempos),
+        "max_s": max(tempos),
+        "por_operacao_s": mediana / operacoes,
+        "ops_por_segundo": operacoes / mediana if mediana else 0.0,
+    }
+
+
+def cpf_valido(indice: int) -> str:
+    """Gera o CPF válido de número `indice` (únicos para índices < 10⁹)."""
+    base = f"{(indice * 7919 + 100_000_001) % 1_000_000_000:09d}"
+    return base + calcular_digitos_cpf(base)
+
+
+def banco_temporario(diretorio: Path, nome: str) -> DatabaseManager:
+    """Cria um `DatabaseManager` apontando para um banco vazio."""
+    db = DatabaseManager(diretorio / f"{nome}.db")
+    db.init_database()
+    return db
+
+
+def popular(db: DatabaseManager, quantidade: int):
+    """Insere `quantidade` pessoas físicas diretamente em lote."""
+    agora = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    linhas = (
+        (f"Cliente {i:07d}", cpf_valido(i), "01/01/1990",
+         "Rua Teste, 1 - Centro - São Paulo/SP", "", "", agora)
+        for i in range(quantidade)
+    )
+    with sqlite3.connect(db.db_path) as conn:
+        conn.executemany("""
+            INSERT INTO pessoas_fisicas
+            (nome, cpf, data_nascimento, endereco, telefone, email, data_cadastro)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, linhas)
+
+
+def conta_com_historico(tamanho: int):
+    """Cria uma conta cujo histórico tem `tamanho` transações de dias anteriores."""
+    cliente = desafio.PessoaFisica("Bench", "01/01/1990", "11144477735", "Rua A")
+    conta = desafio.ContaCorrente.nova_conta(cliente=cliente, numero=1)
+    cliente.adicionar_conta(conta)
+
+    ontem = datetime.now() - timedelta(days=1)
+    for i in range(tamanho):
+        conta.historico.transacoes.append({
+            "tipo": "Deposito" if i % 2 else "Saque",
+            "valor": 10.0,
+            "data": (ontem - timedelta(minutes=i)).strftime("%d/%m/%Y %H:%M:%S"),
+            "saldo": -10.0 if i % 2 == 0 else 0.0,
+        })
+    return cliente, conta
+
+
+@benchmark
+def bench_validacao(contexto):
+    """Validação de CPF e CNPJ."""
+    db = contexto["db_vazio"]
+    cpfs = [cpf_valido(i) for i in range(10_000)]
+    cnpjs = ["11222333000181", "11.444.777/0001-61"] * 5_000
+
+    yield "validar_cpf", medir(
+        lambda: [db.validar_cpf(c) for c in cpfs], operacoes=len(cpfs)
+    )
+    yield "validar_cnpj", medir(
+        lambda: [db.validar_cnpj(c) for c in cnpjs], operacoes=len(cnpjs)
+    )
+
+
+@benchmark
+def bench_inicializacao(contexto):
+    """Custo de construir o gerenciador e fazer a primeira consulta."""
+    rodada = [0]
+    existente = banco_temporario(contexto["diretorio"], "inicializacao").db_path
+
+    def fria():
+        # Banco novo: cria o arquivo e aplica todas as migrações.
+        rodada[0] += 1
+        caminho = contexto["diretorio"] / f"inicializacao_fria_{rodada[0]}.db"
+        DatabaseManager(caminho).cpf_existe("11144477735")
+
+    def quente():
+        # Banco já na versão atual: só lê o user_version.
+        DatabaseManager(existente).cpf_existe("11144477735")
+
+    def cache():
+        # Gerenciador reaproveitado por caminho.
+        obter_gerenciador(existente).cpf_existe("11144477735")
+
+    yield "inicializacao[fria]", medir(fria, repeticoes=20)
+    yield "inicializacao[quente]", medir(quente, repeticoes=20)
+    yield "inicializacao[cache]", medir(cache, repeticoes=20)
+
+
+@benchmark
+def bench_insercao(contexto):
+    """Inserção de pessoas físicas: um commit por cliente versus escrita em grupo."""
+    quantidade = 200
+    rodada = [0]
+
+    def inserir():
+        db = banco_temporario(contexto["diretorio"], f"insercao_{rodada[0]}")
+        rodada[0] += 1
+        for i in range(quantidade):
+            db.inserir_pessoa_fisica({
+                "nome": f"Cliente {i}",
+                "cpf": cpf_valido(i),
+                "data_nascimento": "01/01/1990",
+                "endereco": "Rua Teste, 1 - Centro - São Paulo/SP",
+            })
+
+    yield "inserir_pessoa_fisica", medir(inserir, operacoes=quantidade, repeticoes=3)
+
+    def enfileirar():
+        db = banco_temporario(contexto["diretorio"], f"insercao_{rodada[0]}")
+        rodada[0] += 1
+        db.ativar_escrita_em_grupo()
+        for i in range(quantidade):
+            db.enfileirar_pessoa_fisica({
+                "nome": f"Cliente {i}",
+                "cpf": cpf_valido(i),
+                "data_nascimento": "01/01/1990",
+                "endereco": "Rua Teste, 1 - Centro - São Paulo/SP",
+            })
+        db.desativar_escrita_em_grupo()
+
+    yield "inserir_pessoa_fisica[escrita_em_grupo]", medir(
+        enfileirar, operacoes=quantidade, repeticoes=3
+    )
+
+
+@benchmark
+def bench_consultas(contexto):
+    """Listagem e busca por documento em bancos de vários tamanhos."""
+    for tamanho in contexto["tamanhos"]:
+        db = banco_temporario(contexto["diretorio"], f"consultas_{tamanho}")
+        popular(db, tamanho)
+
+        repeticoes = 5 if tamanho <= 100_000 else 2
+        yield f"listar_pessoas_fisicas[{tamanho}]", medir(
+            db.listar_pessoas_fisicas, operacoes=tamanho, repeticoes=repeticoes
+        )
+
+        documentos = [cpf_valido(i * 7 % tamanho) for i in range(500)]
+        yield f"buscar_cliente_por_documento[{tamanho}]", medir(
+            lambda: [db.buscar_cliente_por_documento(d) for d in documentos],
+            operacoes=len(documentos),
+        )
+
+
+@benchmark
+def bench_listagem(contexto):
+    """Listagem de pessoas físicas no console: print por registro versus blocos."""
+    from sistema_clientes import SistemaClientes
+
+    for tamanho in [t for t in contexto["tamanhos"] if t <= 100_000]:
+        db = banco_temporario(contexto["diretorio"], f"listagem_{tamanho}")
+        popular(db, tamanho)
+        sistema = SistemaClientes.__new__(SistemaClientes)
+        sistema.db = db
+
+        def imprimir_por_registro():
+            # Implementação anterior: dedent e dois print por registro.
+            for i, cliente in enumerate(db.listar_pessoas_fisicas(), 1):
+                info = f"""\
+                [{i:2d}] Nome:\t\t{cliente['nome']}
+                     CPF:\t\t{db.formatar_cpf(cliente['cpf'])}
+                     Data Nasc.:\t{cliente['data_nascimento']}
+                     Endereço:\t{cliente['endereco']}
+                     Telefone:\t{cliente['telefone'] or 'Não informado'}
+                     E-mail:\t\t{cliente['email'] or 'Não informado'}
+                     Cadastro:\t{cliente['data_cadastro']}
+                """
+                print(textwrap.dedent(info))
+                print("-" * 80)
+
+        # Saída bufferizada por linha, como a de um terminal.
+        with open(os.devnull, "w", buffering=1, encoding="utf-8") as terminal:
+            for nome, funcao in (
+                ("print_por_registro", imprimir_por_registro),
+                ("modelos_em_blocos", sistema.listar_pessoas_fisicas),
+            ):
+                with contextlib.redirect_stdout(terminal):
+                    resultado = medir(funcao, operacoes=tamanho, repeticoes=3)
+                yield f"listagem[{nome},{tamanho}]", resultado
+
+
+@benchmark
+def bench_replica(contexto):
+    """Consultas no arquivo versus na réplica em memória."""
+    for tamanho in [t for t in contexto["tamanhos"] if t <= 100_000]:
+        db = banco_temporario(contexto["diretorio"], f"replica_{tamanho}")
+        popular(db, tamanho)
+        documentos = [cpf_valido(i * 7 % tamanho) for i in range(500)]
+
+        for modo in ("arquivo", "memoria"):
+            if modo == "memoria":
+                db.ativar_replica()
+
+            yield f"buscar_cliente_por_documento[{modo},{tamanho}]", medir(
+                lambda: [db.buscar_cliente_por_documento(d) for d in documentos],
+                operacoes=len(documentos),
+            )
+            yield f"obter_estatisticas[{modo},{tamanho}]", medir(
+                lambda: [db.obter_estatisticas() for _ in range(100)], operacoes=100
+            )
+            yield f"listar_pessoas_fisicas[{modo},{tamanho}]", medir(
+                db.listar_pessoas_fisicas, operacoes=tamanho
+            )
+
+        db.desativar_replica()
+
+
+@benchmark
+def bench_agencias(contexto):
+    """Consultas entre 8 agências: uma thread versus o pool de threads."""
+    from agencias import GerenciadorAgencias
+
+    tamanho = min(max(contexto["tamanhos"]), 100_000)
+    diretorio = contexto["diretorio"] / "agencias"
+    diretorio.mkdir(exist_ok=True)
+
+    for threads in (1, None):
+        with GerenciadorAgencias(diretorio, max_threads=threads) as agencias:
+            for numero in range(1, 9):
+                db = agencias.banco(f"{numero:04d}")
+                if threads == 1:
+                    db.init_database()
+                    popular(db, tamanho // 8)
+
+            modo = "sequencial" if threads == 1 else "paralelo"
+            yield f"agencias[listar_pessoas_fisicas,{modo},{tamanho}]", medir(
+                agencias.listar_pessoas_fisicas, operacoes=tamanho, repeticoes=3
+            )
+            yield f"agencias[buscar_cliente_por_documento,{modo}]", medir(
+                lambda: agencias.buscar_cliente_por_documento(cpf_valido(7)),
+                repeticoes=50,
+            )
+
+
+@benchmark
+def bench_repositorio(contexto):
+    """Cliente obtido do mapa de identidade versus carregado do banco."""
+    from repositorio import RepositorioClientes
+
+    tamanho = min(max(contexto["tamanhos"]), 100_000)
+    db = banco_temporario(contexto["diretorio"], f"repositorio_{tamanho}")
+    popular(db, tamanho)
+    documentos = [cpf_valido(i * 7 % tamanho) for i in range(500)]
+
+    repositorio = RepositorioClientes(db, capacidade=len(documentos))
+    yield f"repositorio[obter_banco,{tamanho}]", medir(
+        lambda: [RepositorioClientes(db).obter(d) for d in documentos],
+        operacoes=len(documentos),
+    )
+    yield f"repositorio[obter_memoria,{tamanho}]", medir(
+        lambda: [repositorio.obter(d) for d in documentos], operacoes=len(documentos)
+    )
+
+
+@benchmark
+def bench_transacoes(contexto):
+    """Transações e relatórios sobre históricos longos."""
+    for tamanho in contexto["historicos"]:
+        cliente, conta = conta_com_historico(tamanho)
+
+        def transacionar():
+            cliente.realizar_transacao(conta, desafio.Deposito(1.0))
+            # Mantém o histórico do tamanho medido e os limites zerados.
+            conta.historico.transacoes.pop()
+            motor_limites.reiniciar(conta)
+
+        yield f"realizar_transacao[{tamanho}]", medir(transacionar, repeticoes=20)
+        yield f"gerar_relatorio[{tamanho}]", medir(
+            lambda: sum(1 for _ in conta.historico.gerar_relatorio("Deposito")),
+            operacoes=tamanho,
+        )
+
+
+@benchmark
+def bench_extrato(contexto):
+    """Extrato completo versus uma página a partir do cursor."""
+    for tamanho in contexto["historicos"]:
+        _, conta = conta_com_historico(tamanho)
+        historico = conta.historico
+
+        def extrato_completo():
+            # Implementação anterior: formata todas as linhas e varre o dia.
+            linhas = [
+                f"{i:2d}. {'📈' if t['tipo'] == 'Deposito' else '📉'} {t['tipo']}: "
+                f"R$ {t['valor']:>8.2f} - {t['data']}"
+                for i, t in enumerate(historico.transacoes, 1)
+            ]
+            return linhas, sum(1 for _ in historico.transacoes_do_dia())
+
+        yield f"extrato[completo,{tamanho}]", medir(extrato_completo)
+        yield f"extrato[pagina,{tamanho}]", medir(
+            lambda: historico.pagina_extrato(limite=20), repeticoes=20
+        )
+
+
+@benchmark
+def bench_fechamento(contexto):
+    """Fechamento diário: Deposito/Saque por conta versus o lote vetorizado."""
+    from fechamento_diario import (
+        SALDO_ISENCAO, TARIFA_MANUTENCAO, TAXA_JUROS_DIARIA, fechar_dia,
+    )
+
+    for tamanho in [t for t in contexto["tamanhos"] if t <= 100_000]:
+        contas = []
+        for numero in range(tamanho):
+            cliente = desafio.PessoaFisica("Bench", "01/01/1990", cpf_valido(numero), "Rua A")
+            conta = desafio.ContaCorrente.nova_conta(cliente=cliente, numero=numero)
+            conta.aplicar_lancamentos([("Deposito", float(numero % 2000))], "01/01/2025 10:00:00")
+            contas.append(conta)
+
+        def por_conta():
+            # Implementação anterior: uma transação do domínio por ajuste.
+            for conta in contas:
+                juros = round(conta.saldo * TAXA_JUROS_DIARIA, 2)
+                if juros:
+                    desafio.Deposito(juros).registrar(conta)
+                if conta.saldo < SALDO_ISENCAO:
+                    desafio.Saque(min(TARIFA_MANUTENCAO, conta.saldo)).registrar(conta)
+                motor_limites.reiniciar(conta)
+
+        dias = iter(range(1, 10_000))
+
+        def em_lote():
+            # Um dia diferente por repetição: o fechamento de um dia não se repete.
+            fechar_dia(contas, date.fromordinal(730_000 + next(dias)))
+
+        yield f"fechamento[por_conta,{tamanho}]", medir(por_conta, operacoes=tamanho, repeticoes=3)
+        yield f"fechamento[lote,{tamanho}]", medir(em_lote, operacoes=tamanho, repeticoes=3)
+
+
+@benchmark
+def bench_limites(contexto):
+    """Custo da verificação de limites por transação."""
+    verificacoes = 10_000
+    deposito = desafio.Deposito(1.0)
+
+    for tamanho in contexto["historicos"]:
+        _, conta = conta_com_historico(tamanho)
+
+        # Referência: contagem do dia percorrendo o histórico.
+        hoje = datetime.now().strftime("%d/%m/%Y")
+        yield f"limites[varredura_historico,{tamanho}]", medir(
+            lambda: [sum(1 for _ in conta.historico.transacoes_do_dia(hoje))
+                     for _ in range(100)],
+            operacoes=100,
+        )
+
+    _, conta = conta_com_historico(0)
+    for nome, politica in (
+        ("padrao", None),
+        ("quatro_regras", [
+            Regra("limite_diario", "dia", max_quantidade=10_000_000, deslizante=False),
+            Regra("por_hora", "hora", max_quantidade=10_000_000),
+            Regra("saques_24h", "dia", max_valor=1e12, tipos=["Saque"]),
+            Regra("valor_mensal", "mes", max_valor=1e12),
+        ]),
+    ):
+        motor = MotorLimites(politica)
+        if politica:
+            for _ in range(1_000):
+                motor.registrar(conta, deposito)
+
+        yield f"limites[verificar,{nome}]", medir(
+            lambda: [motor.verificar(conta, deposito) for _ in range(verificacoes)],
+            operacoes=verificacoes,
+        )
+        yield f"limites[registrar,{nome}]", medir(
+            lambda: [motor.registrar(conta, deposito) for _ in range(verificacoes)],
+            operacoes=verificacoes,
+        )
+
+
+@benchmark
+def bench_idempotencia(contexto):
+    """Custo da chave de idempotência no caminho do depósito."""
+    cliente, conta = conta_com_historico(0)
+    cache_idempotencia.limpar()
+    chaves = iter(range(10_000_000))
+
+    def transacionar(chave=None):
+        cliente.realizar_transacao(conta, desafio.Deposito(1.0, chave))
+        # Sem limites nem histórico crescendo entre as repetições.
+        if conta.historico.transacoes:
+            conta.historico.transacoes.pop()
+        motor_limites.reiniciar(conta)
+
+    yield "idempotencia[sem_chave]", medir(transacionar, repeticoes=200)
+    yield "idempotencia[chave_nova]", medir(
+        lambda: transacionar(f"nova-{next(chaves)}"), repeticoes=200
+    )
+    transacionar("repetida")
+    yield "idempotencia[chave_repetida]", medir(
+        lambda: transacionar("repetida"), repeticoes=200
+    )
+    cache_idempotencia.limpar()
+
+
+@benchmark
+def bench_log_transacao(contexto):
+    """Custo adicional do decorador `log_transacao`."""
+    chamadas = 2_000
+
+    def operacao(valor):
+        return valor
+
+    decorada = desafio.log_transacao(operacao)
+
+    yield "log_transacao[sem_decorador]", medir(
+        lambda: [operacao(i) for i in range(chamadas)], operacoes=chamadas
+    )
+    yield "log_transacao[com_decorador]", medir(
+        lambda: [decorada(i) for i in range(chamadas)], operacoes=chamadas
+    )
+
+
+def executar_suite(tamanhos, historicos, filtro=None):
+    """Executa todos os benchmarks e retorna o documento de resultados."""
+    resultados = {}
+
+    with tempfile.TemporaryDirectory() as temp:
+        diretorio = Path(temp)
+        raiz_original = desafio.ROOT_PATH
+        desafio.ROOT_PATH = diretorio  # O log de transações vai para o temporário.
+
+        try:
+            with silenciar_saida():
+                contexto = {
+                    "diretorio": diretorio,
+                    "tamanhos": tamanhos,
+                    "historicos": historicos,
+                    "db_vazio": banco_temporario(diretorio, "vazio"),
+                }
+
+            for bench in BENCHMARKS:
+                if filtro and filtro not in bench.__name__:
+                    continue
+                geradora = bench(contexto)
+                while True:
+                    with silenciar_saida():
+                        item = next(geradora, None)
+                    if item is None:
+                        break
+                    nome, estatisticas = item
+                    resultados[nome] = estatisticas
+                    micros = estatisticas["por_operacao_s"] * 1e6
+                    print(f"  {nome:<45} {micros:>12.2f} µs/op")
+        finally:
+            desafio.ROOT_PATH = raiz_original
+
+    return {
+        "metadados": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(atual, base, limite):
+    """Compara dois documentos de resultados e retorna as regressões."""
+    regressoes = []
+    print("\n" + "=" * 20 + " COMPARAÇÃO " + "=" * 20)
+
+    for nome, estatisticas in atual["resultados"].items():
+        anterior = base["resultados"].get(nome)
+        if not anterior:
+            continue
+
+        variacao = estatisticas["por_operacao_s"] / anterior["por_operacao_s"] - 1
+        marcador = "❌" if variacao > limite else "✅"
+        print(f"  {marcador} {nome:<45} {variacao:>+8.1%}")
+        if variacao > limite:
+            regressoes.append((nome, variacao))
+
+    return regressoes
+
+
+def main():
+    """Ponto de entrada da suíte de benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--saida", help="arquivo JSON para gravar os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument("--limite", type=float, default=0.10,
+                        help="variação máxima tolerada (0.10 = 10%%)")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 10_000],
+                        help="quantidade de linhas dos bancos de consulta")
+    parser.add_argument("--historicos", type=int, nargs="+",
+                        default=[1_000, 100_000],
+                        help="tamanhos de histórico das contas")
+    parser.add_argument("--filtro",
+                        help="executa só benchmarks com este trecho no nome")
+    args = parser.parse_args()
+
+    print("⏱️  SUÍTE DE BENCHMARKS DO SISTEMA BANCÁRIO")
+    print("=" * 60)
+    resultado = executar_suite(args.tamanhos, args.historicos, args.filtro)
+
+    if args.saida:
+        Path(args.saida).write_text(
+            json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+        print(f"\n💾 Resultados gravados em {args.saida}")
+
+    if args.comparar:
+        base = json.loads(Path(args.comparar).read_text(encoding="utf-8"))
+        regressoes = comparar(resultado, base, args.limite)
+        if regressoes:
+            print(f"\n⚠️  {len(regressoes)} regressão(ões) acima de {args.limite:.0%}")
+            sys.exit(1)
+        print("\n🎉 Nenhuma regressão acima do limite.")
+
+
+if __name__ == "__main__":
+    main()
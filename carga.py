@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do banco de clientes e do motor de contas
+Atores concorrentes (threads ou processos) executam uma mistura de operações
+
+Cada ator sorteia operações segundo os pesos da mistura até o fim da
+duração. As operações de cadastro usam o mesmo banco SQLite; depósitos e
+saques usam um `ProcessadorOperacoes` com uma conta própria do ator. Uma
+operação que falha por banco bloqueado é repetida (com espera crescente) até
+`tentativas` vezes.
+
+Exemplos:
+    python carga.py --atores 8 --duracao 10
+    python carga.py --atores 4 --modo processos --mix buscar=70,inserir=20,depositar=10
+    python carga.py --clientes 100000 --timeout-bloqueio 0.05 --tentativas 5
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+from database import DatabaseManager, ultimo_erro
+from gerador_dados import cpf_por_indice, escrever_sqlite
+from instrumentacao import Histograma
+from limites import motor_limites
+from operacoes import ProcessadorOperacoes, silenciar_saida
+
+MIX_PADRAO = {"inserir": 10, "buscar": 50, "listar": 2, "depositar": 20, "sacar": 18}
+
+# Semente dos clientes pré-carregados (as buscas sorteiam entre eles).
+SEMENTE = 47
+
+# Espera antes da primeira repetição após um bloqueio (dobra a cada nova).
+ESPERA_INICIAL = 0.001
+
+
+def ler_mix(texto: str) -> Dict[str, int]:
+    """Converte "buscar=70,inserir=30" em pesos por operação."""
+    mix = {}
+    for parte in texto.split(","):
+        nome, _, peso = parte.partition("=")
+        nome = nome.strip()
+        if nome not in MIX_PADRAO:
+            raise ValueError(f"Operação desconhecida na mistura: {nome!r}")
+        mix[nome] = int(peso)
+    return mix
+
+
+class Ator:
+    """Executa operações sorteadas e mede cada uma."""
+
+    def __init__(self, indice: int, db: DatabaseManager, mix: Dict[str, int],
+                 clientes: int, tentativas: int):
+        self.indice = indice
+        self.db = db
+        self.clientes = clientes
+        self.tentativas = tentativas
+        self._rng = random.Random(f"ator-{indice}")
+        self._operacoes = list(mix)
+        self._pesos = list(mix.values())
+        self._inseridos = 0
+
+        self.latencias = {nome: Histograma() for nome in mix}
+        self.falhas = {nome: 0 for nome in mix}
+        self.bloqueios = 0
+        self.repeticoes = 0
+
+        # Conta própria do ator: sem disputa por saldo entre atores.
+        self._processador = ProcessadorOperacoes()
+        self._cpf = cpf_por_indice(900_000_000 + indice, SEMENTE)
+        self._processador.criar_cliente(self._cpf, f"Ator {indice}", "01/01/1990", "Rua A")
+        self._processador.criar_conta(self._cpf, numero=1)
+        self._processador.depositar(self._cpf, 1_000_000)
+
+    def executar(self, fim: float):
+        """Executa operações até o instante `fim` (`time.perf_counter`)."""
+        while time.perf_counter() < fim:
+            nome = self._rng.choices(self._operacoes, self._pesos)[0]
+            inicio = time.perf_counter()
+            ok = self._com_repeticao(getattr(self, f"_{nome}"))
+            self.latencias[nome].registrar(time.perf_counter() - inicio)
+            if not ok:
+                self.falhas[nome] += 1
+
+    def _com_repeticao(self, operacao) -> bool:
+        espera = ESPERA_INICIAL
+        for tentativa in range(self.tentativas + 1):
+            ultimo_erro()
+            ok = operacao()
+            if ok or ultimo_erro() != "bloqueio":
+                return bool(ok)
+            self.bloqueios += 1
+            if tentativa < self.tentativas:
+                self.repeticoes += 1
+                time.sleep(espera)
+                espera *= 2
+        return False
+
+    def _inserir(self):
+        self._inseridos += 1
+        indice = self.clientes + self.indice * 10_000_000 + self._inseridos
+        return self.db.inserir_pessoa_fisica({
+            "nome": f"Carga {self.indice}-{self._inseridos}",
+            "cpf": cpf_por_indice(indice, SEMENTE),
+            "data_nascimento": "01/01/1990",
+            "endereco": "Rua Teste, 1 - Centro - São Paulo/SP",
+        })
+
+    def _buscar(self):
+        indice = self._rng.randrange(max(self.clientes, 1))
+        return self.db.buscar_cliente_por_documento(cpf_por_indice(indice, SEMENTE))
+
+    def _listar(self):
+        if self._rng.random() < 0.5:
+            self.db.listar_pessoas_fisicas()
+        else:
+            self.db.listar_pessoas_juridicas()
+        return ultimo_erro(limpar=False) is None
+
+    def _depositar(self):
+        return self._processador.depositar(self._cpf, 10)["ok"]
+
+    def _sacar(self):
+        return self._processador.sacar(self._cpf, 5)["ok"]
+
+    def resultado(self) -> Dict:
+        return {
+            "latencias": self.latencias,
+            "falhas": self.falhas,
+            "bloqueios": self.bloqueios,
+            "repeticoes": self.repeticoes,
+        }
+
+
+def _preparar_processo(respeitar_limites: bool, timeout_bloqueio: float):
+    """Configuração do processo (ou da thread principal) antes da carga."""
+    DatabaseManager.timeout_bloqueio = timeout_bloqueio
+    if not respeitar_limites:
+        # Sem a política padrão de 10 transações por dia.
+        motor_limites.politica_padrao = []
+        motor_limites.reiniciar()
+
+
+def _executar_atores(indices: List[int], db_path, mix, clientes, tentativas,
+                     duracao, respeitar_limites, timeout_bloqueio) -> List[Dict]:
+    """Executa um grupo de atores em threads e devolve os resultados de cada um."""
+    with silenciar_saida():
+        _preparar_processo(respeitar_limites, timeout_bloqueio)
+        db = DatabaseManager(db_path)
+        atores = [Ator(i, db, mix, clientes, tentativas) for i in indices]
+
+        fim = time.perf_counter() + duracao
+        threads = [threading.Thread(target=ator.executar, args=(fim,)) for ator in atores]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    return [ator.resultado() for ator in atores]
+
+
+def executar_carga(atores: int = 4, duracao: float = 10.0, mix=None, modo: str = "threads",
+                   db_path=None, clientes: int = 10_000, tentativas: int = 3,
+                   timeout_bloqueio: float = 5.0, respeitar_limites: bool = False) -> Dict:
+    """Executa o teste de carga e retorna o relatório consolidado.
+
+    Sem `db_path`, um banco temporário com `clientes` pessoas físicas é criado.
+    """
+    mix = mix or MIX_PADRAO
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        if db_path is None:
+            db_path = Path(diretorio) / "carga.db"
+            with silenciar_saida():
+                escrever_sqlite(db_path, total_pf=clientes, semente=SEMENTE)
+
+        argumentos = (db_path, mix, clientes, tentativas, duracao,
+                      respeitar_limites, timeout_bloqueio)
+        inicio = time.perf_counter()
+
+        if modo == "processos":
+            with ProcessPoolExecutor(atores) as executor:
+                grupos = executor.map(
+                    _executar_atores, [[i] for i in range(atores)],
+                    *[[valor] * atores for valor in argumentos],
+                )
+                resultados = [r for grupo in grupos for r in grupo]
+        else:
+            politica, timeout = motor_limites.politica_padrao, DatabaseManager.timeout_bloqueio
+            try:
+                resultados = _executar_atores(list(range(atores)), *argumentos)
+            finally:
+                motor_limites.politica_padrao = politica
+                motor_limites.reiniciar()
+                DatabaseManager.timeout_bloqueio = timeout
+
+        decorrido = time.perf_counter() - inicio
+
+    return consolidar(resultados, decorrido, atores, modo)
+
+
+def consolidar(resultados: List[Dict], decorrido: float, atores: int, modo: str) -> Dict:
+    """Soma os resultados dos atores em um relatório por operação."""
+    latencias: Dict[str, Histograma] = {}
+    falhas: Dict[str, int] = {}
+    for resultado in resultados:
+        for nome, histograma in resultado["latencias"].items():
+            latencias.setdefault(nome, Histograma()).combinar(histograma)
+            falhas[nome] = falhas.get(nome, 0) + resultado["falhas"][nome]
+
+    total = sum(h.total for h in latencias.values())
+    operacoes = {}
+    for nome, histograma in latencias.items():
+        resumo = histograma.resumo()
+        resumo.pop("buckets")
+        operacoes[nome] = {
+            **resumo,
+            "falhas": falhas[nome],
+            "por_segundo": histograma.total / decorrido if decorrido else 0.0,
+        }
+
+    return {
+        "modo": modo,
+        "atores": atores,
+        "duracao_s": decorrido,
+        "operacoes": total,
+        "por_segundo": total / decorrido if decorrido else 0.0,
+        "bloqueios": sum(r["bloqueios"] for r in resultados),
+        "repeticoes": sum(r["repeticoes"] for r in resultados),
+        "por_operacao": operacoes,
+    }
+
+
+def imprimir_relatorio(relatorio: Dict):
+    """Mostra o relatório em tabela."""
+    print(f"\n🏋️  {relatorio['atores']} ator(es) em {relatorio['modo']} — "
+          f"{relatorio['operacoes']} operações em {relatorio['duracao_s']:.1f} s "
+          f"({relatorio['por_segundo']:.0f} ops/s)")
+    print(f"\n{'Operação':<10} {'Total':>8} {'ops/s':>9} {'Falhas':>7} "
+          f"{'p50 (µs)':>10} {'p90 (µs)':>10} {'p99 (µs)':>10} {'máx (µs)':>10}")
+    for nome, dados in sorted(relatorio["por_operacao"].items()):
+        print(f"{nome:<10} {dados['chamadas']:>8} {dados['por_segundo']:>9.0f} "
+              f"{dados['falhas']:>7} {dados['p50_us']:>10} {dados['p90_us']:>10} "
+              f"{dados['p99_us']:>10} {dados['max_us']:>10}")
+    print(f"\n🔒 Bancos bloqueados: {relatorio['bloqueios']} | "
+          f"Repetições: {relatorio['repeticoes']}")
+
+
+def main():
+    """Ponto de entrada do teste de carga."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--atores", type=int, default=4)
+    parser.add_argument("--duracao", type=float, default=10.0, help="segundos")
+    parser.add_argument("--modo", choices=["threads", "processos"], default="threads")
+    parser.add_argument("--mix", type=ler_mix, help="ex.: buscar=50,inserir=10,listar=2")
+    parser.add_argument("--banco", help="banco existente (padrão: temporário)")
+    parser.add_argument("--clientes", type=int, default=10_000,
+                        help="pessoas físicas do banco temporário")
+    parser.add_argument("--tentativas", type=int, default=3,
+                        help="repetições após um bloqueio")
+    parser.add_argument("--timeout-bloqueio", type=float, default=5.0,
+                        help="segundos de espera do SQLite por um banco bloqueado")
+    parser.add_argument("--respeitar-limites", action="store_true",
+                        help="mantém as políticas de limite das contas")
+    parser.add_argument("--saida", help="arquivo JSON para gravar o relatório")
+    args = parser.parse_args()
+
+    relatorio = executar_carga(
+        args.atores, args.duracao, args.mix, args.modo, args.banco, args.clientes,
+        args.tentativas, args.timeout_bloqueio, args.respeitar_limites,
+    )
+    imprimir_relatorio(relatorio)
+
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(relatorio, indent=2), encoding="utf-8")
+        print(f"📄 Relatório salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
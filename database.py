@@ -1,61 +1,567 @@
+import contextlib
 import sqlite3
 import re
+import threading
+import time
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from escrita_em_grupo import DUPLICADO, INSERIDO, INVALIDO, EscritorEmGrupo
+from metricas import metricas
 
 # Caminho do banco de dados.
 DB_PATH = Path(__file__).parent / "banco_clientes.db"
 
+# Unidades federativas reconhecidas no fim do endereço.
+UFS = (
+    "AC", "AL", "AM", "AP", "BA", "CE", "DF", "ES", "GO", "MA", "MG", "MS", "MT",
+    "PA", "PB", "PE", "PI", "PR", "RJ", "RN", "RO", "RR", "RS", "SC", "SE", "SP",
+    "TO",
+)
+
+# Faixas etárias de `obter_estatisticas` (idade mínima, rótulo).
+FAIXAS_ETARIAS = [(60, "60+"), (45, "45-59"), (30, "30-44"), (18, "18-29"), (0, "0-17")]
+
+
+# Último erro tratado em cada thread (ver `ultimo_erro`).
+_erro_da_thread = threading.local()
+
+# Trechos do endereço separados por hífen com espaços ("Rua A, 1 - Centro").
+# O hífen sem espaços faz parte do nome ("Embu-Guaçu").
+_REGEX_TRECHOS = re.compile(r'\s+-\s+')
+
+# Último trecho no formato "cidade-UF" (sem espaços).
+_REGEX_CIDADE_HIFEN_UF = re.compile(r'(.+)-([A-Za-z]{2})')
+
+
+def separar_cidade_uf(endereco: str) -> Tuple[Optional[str], Optional[str]]:
+    """Extrai cidade e UF do fim do endereço; `(None, None)` se não houver.
+
+    Aceita "... - cidade/UF", "... - cidade - UF" e "..., cidade/UF". Uma
+    cidade sem letras (ex.: o número em "Av. Paulista, 1000 - SP") é
+    descartada e só a UF é devolvida.
+    """
+    trechos = _REGEX_TRECHOS.split((endereco or "").strip())
+    ultimo = trechos[-1]
+    if "/" in ultimo:
+        cidade, _, uf = ultimo.rpartition("/")
+    elif len(trechos) > 1 and len(ultimo) == 2:
+        cidade, uf = trechos[-2], ultimo
+    else:
+        correspondencia = _REGEX_CIDADE_HIFEN_UF.fullmatch(ultimo)
+        if not correspondencia:
+            return None, None
+        cidade, uf = correspondencia.groups()
+
+    uf = uf.strip().upper()
+    if uf not in UFS:
+        return None, None
+    # A cidade é o que vem depois da última vírgula ("Rua B, 2, Recife/PE").
+    cidade = cidade.rpartition(",")[2].strip()
+    if not any(caractere.isalpha() for caractere in cidade):
+        return None, uf
+    return cidade, uf
+
+
+def _preencher_cidade_uf(conn: sqlite3.Connection, tamanho_lote: int = 5000,
+                         somente_vazios: bool = False) -> int:
+    """Preenche `cidade` e `uf` a partir do endereço, em lotes por `id`.
+
+    Sem `somente_vazios`, todas as linhas são regravadas: um endereço que não
+    tem mais cidade ou UF reconhecíveis limpa os valores antigos.
+    """
+    preenchidos = 0
+    filtro = "AND uf IS NULL AND cidade IS NULL" if somente_vazios else ""
+    for tabela in ("pessoas_fisicas", "pessoas_juridicas"):
+        ultimo_id = 0
+        while True:
+            linhas = conn.execute(
+                f"SELECT id, endereco FROM {tabela} WHERE id > ? {filtro} "
+                f"ORDER BY id LIMIT ?", (ultimo_id, tamanho_lote)
+            ).fetchall()
+            if not linhas:
+                break
+            ultimo_id = linhas[-1][0]
+            valores = [(*separar_cidade_uf(endereco), id_) for id_, endereco in linhas]
+            if somente_vazios:
+                valores = [v for v in valores if v[1] is not None]
+            conn.executemany(
+                f"UPDATE {tabela} SET cidade = ?, uf = ? WHERE id = ?", valores
+            )
+            preenchidos += sum(v[1] is not None for v in valores)
+    return preenchidos
+
+
+def _adicionar_coluna(tabela: str, coluna: str, tipo: str):
+    """Passo de migração que adiciona a coluna apenas se ela ainda não existir."""
+    def passo(conn: sqlite3.Connection):
+        colunas = {linha[1] for linha in conn.execute(f"PRAGMA table_info({tabela})")}
+        if coluna not in colunas:
+            conn.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+    return passo
+
+
+def _uf_do_endereco(linha: str) -> str:
+    """Expressão SQL da UF no fim do endereço ("... São Paulo/SP"), ou 'ND'."""
+    endereco = f"trim({linha}.endereco)"
+    ufs = ", ".join(f"'{uf}'" for uf in UFS)
+    return (
+        f"CASE WHEN substr({endereco}, -3, 1) IN ('/', '-', ' ') "
+        f"AND upper(substr({endereco}, -2)) IN ({ufs}) "
+        f"THEN upper(substr({endereco}, -2)) ELSE 'ND' END"
+    )
+
+
+def _chaves_estatisticas(tipo: str, linha: str, uf=_uf_do_endereco) -> List[str]:
+    """Expressões SQL das chaves de `estatisticas` afetadas por uma linha."""
+    chaves = [
+        f"'total:{tipo}'",
+        f"'mes:' || substr({linha}.data_cadastro, 7, 4) || '-' || "
+        f"substr({linha}.data_cadastro, 4, 2)",
+        f"'uf:' || {uf(linha)}",
+    ]
+    if tipo == "PF":
+        chaves.append(f"'nascimento:' || substr({linha}.data_nascimento, 7, 4)")
+    return chaves
+
+
+def _uf_da_coluna(linha: str) -> str:
+    return f"COALESCE({linha}.uf, 'ND')"
+
+
+def _ddl_estatisticas(coluna_uf: bool = False) -> List[str]:
+    """Gatilhos que mantêm `estatisticas` e a recontagem dos valores atuais.
+
+    Apenas clientes ativos são contados. A UF vem da coluna `uf` ou, antes
+    dela existir, do fim do endereço.
+    """
+    uf = _uf_da_coluna if coluna_uf else _uf_do_endereco
+    extras = ", uf" if coluna_uf else ""
+    def ajustar(tipo, linha, delta):
+        return "".join(
+            f"INSERT INTO estatisticas (chave, valor) "
+            f"SELECT {chave}, {delta} WHERE {linha}.ativo = 1 "
+            f"ON CONFLICT (chave) DO UPDATE SET valor = valor + excluded.valor;\n"
+            for chave in _chaves_estatisticas(tipo, linha, uf)
+        )
+
+    comandos = ["DELETE FROM estatisticas"]
+    for tabela, tipo, colunas in (
+        ("pessoas_fisicas", "PF", f"ativo, endereco, data_cadastro, data_nascimento{extras}"),
+        ("pessoas_juridicas", "PJ", f"ativo, endereco, data_cadastro{extras}"),
+    ):
+        for evento in ("insert", "update", "delete"):
+            comandos.append(f"DROP TRIGGER IF EXISTS {tabela}_estatisticas_{evento}")
+        comandos += [
+            f"CREATE TRIGGER {tabela}_estatisticas_insert AFTER INSERT ON {tabela} "
+            f"BEGIN {ajustar(tipo, 'NEW', 1)} END",
+            f"CREATE TRIGGER {tabela}_estatisticas_update "
+            f"AFTER UPDATE OF {colunas} ON {tabela} "
+            f"BEGIN {ajustar(tipo, 'OLD', -1)}{ajustar(tipo, 'NEW', 1)} END",
+            f"CREATE TRIGGER {tabela}_estatisticas_delete AFTER DELETE ON {tabela} "
+            f"BEGIN {ajustar(tipo, 'OLD', -1)} END",
+        ]
+        comandos += [
+            f"INSERT INTO estatisticas (chave, valor) "
+            f"SELECT {chave}, COUNT(*) FROM {tabela} WHERE ativo = 1 GROUP BY 1 "
+            f"ON CONFLICT (chave) DO UPDATE SET valor = valor + excluded.valor"
+            for chave in _chaves_estatisticas(tipo, tabela, uf)
+        ]
+    return comandos
+
+
+# Migrações do esquema, em ordem. O índice + 1 de cada item é a versão que ele
+# produz, registrada em `PRAGMA user_version`. Cada passo é um comando SQL ou
+# uma função que recebe a conexão.
+MIGRACOES = [
+    # Versão 1: tabelas de Pessoas Físicas e Jurídicas.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS pessoas_fisicas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nome TEXT NOT NULL,
+            cpf TEXT UNIQUE NOT NULL,
+            data_nascimento TEXT NOT NULL,
+            endereco TEXT NOT NULL,
+            telefone TEXT,
+            email TEXT,
+            data_cadastro TEXT NOT NULL,
+            ativo BOOLEAN DEFAULT 1
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS pessoas_juridicas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            razao_social TEXT NOT NULL,
+            nome_fantasia TEXT,
+            cnpj TEXT UNIQUE NOT NULL,
+            endereco TEXT NOT NULL,
+            telefone TEXT,
+            email TEXT,
+            representante_legal TEXT NOT NULL,
+            data_cadastro TEXT NOT NULL,
+            ativo BOOLEAN DEFAULT 1
+        )
+        """,
+    ],
+    # Versão 2: índice de texto completo dos nomes, sem acentos e com prefixos.
+    # O rowid é id * 2 para Pessoas Físicas e id * 2 + 1 para Jurídicas.
+    [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS clientes_fts USING fts5(
+            nome, razao_social, nome_fantasia,
+            tipo UNINDEXED, ref_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS pessoas_fisicas_fts_insert
+        AFTER INSERT ON pessoas_fisicas BEGIN
+            INSERT INTO clientes_fts (rowid, nome, razao_social, nome_fantasia, tipo, ref_id)
+            VALUES (NEW.id * 2, NEW.nome, '', '', 'PF', NEW.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS pessoas_fisicas_fts_update
+        AFTER UPDATE OF nome ON pessoas_fisicas BEGIN
+            UPDATE clientes_fts SET nome = NEW.nome WHERE rowid = NEW.id * 2;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS pessoas_fisicas_fts_delete
+        AFTER DELETE ON pessoas_fisicas BEGIN
+            DELETE FROM clientes_fts WHERE rowid = OLD.id * 2;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS pessoas_juridicas_fts_insert
+        AFTER INSERT ON pessoas_juridicas BEGIN
+            INSERT INTO clientes_fts (rowid, nome, razao_social, nome_fantasia, tipo, ref_id)
+            VALUES (NEW.id * 2 + 1, '', NEW.razao_social, NEW.nome_fantasia, 'PJ', NEW.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS pessoas_juridicas_fts_update
+        AFTER UPDATE OF razao_social, nome_fantasia ON pessoas_juridicas BEGIN
+            UPDATE clientes_fts
+            SET razao_social = NEW.razao_social, nome_fantasia = NEW.nome_fantasia
+            WHERE rowid = NEW.id * 2 + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS pessoas_juridicas_fts_delete
+        AFTER DELETE ON pessoas_juridicas BEGIN
+            DELETE FROM clientes_fts WHERE rowid = OLD.id * 2 + 1;
+        END
+        """,
+        """
+        INSERT INTO clientes_fts (rowid, nome, razao_social, nome_fantasia, tipo, ref_id)
+        SELECT id * 2, nome, '', '', 'PF', id FROM pessoas_fisicas
+        """,
+        """
+        INSERT INTO clientes_fts (rowid, nome, razao_social, nome_fantasia, tipo, ref_id)
+        SELECT id * 2 + 1, '', razao_social, nome_fantasia, 'PJ', id FROM pessoas_juridicas
+        """,
+    ],
+    # Versão 3: índices parciais das linhas ativas, usados pelas listagens e
+    # contagens; clientes desativados não aumentam o custo dessas consultas.
+    [
+        """
+        CREATE INDEX IF NOT EXISTS idx_pessoas_fisicas_ativas_nome
+        ON pessoas_fisicas (nome) WHERE ativo = 1
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_pessoas_juridicas_ativas_razao_social
+        ON pessoas_juridicas (razao_social) WHERE ativo = 1
+        """,
+    ],
+    # Versão 4: contadores de clientes ativos (totais, mês de cadastro, UF e
+    # ano de nascimento) mantidos por gatilhos.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS estatisticas (
+            chave TEXT PRIMARY KEY,
+            valor INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        *_ddl_estatisticas(),
+    ],
+    # Versão 5: cidade e UF extraídas do endereço, em colunas indexadas.
+    # Os itens que não são SQL recebem a conexão da migração.
+    [
+        _adicionar_coluna("pessoas_fisicas", "cidade", "TEXT"),
+        _adicionar_coluna("pessoas_fisicas", "uf", "TEXT"),
+        _adicionar_coluna("pessoas_juridicas", "cidade", "TEXT"),
+        _adicionar_coluna("pessoas_juridicas", "uf", "TEXT"),
+        _preencher_cidade_uf,
+        """
+        CREATE INDEX IF NOT EXISTS idx_pessoas_fisicas_ativas_uf_cidade
+        ON pessoas_fisicas (uf, cidade) WHERE ativo = 1
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_pessoas_juridicas_ativas_uf_cidade
+        ON pessoas_juridicas (uf, cidade) WHERE ativo = 1
+        """,
+        *_ddl_estatisticas(coluna_uf=True),
+    ],
+    # Versão 6: cidade e UF recalculadas; a separação anterior cortava
+    # cidades com hífen ("Embu-Guaçu") e aceitava números como cidade.
+    [
+        _preencher_cidade_uf,
+    ],
+]
+
+VERSAO_ESQUEMA = len(MIGRACOES)
+
+# Colunas percorridas por `iterar_clientes`, na ordem das tuplas retornadas.
+COLUNAS_PESSOAS_FISICAS = (
+    "id", "nome", "cpf", "data_nascimento", "endereco", "telefone", "email",
+    "data_cadastro", "cidade", "uf",
+)
+COLUNAS_PESSOAS_JURIDICAS = (
+    "id", "razao_social", "nome_fantasia", "cnpj", "endereco", "telefone",
+    "email", "representante_legal", "data_cadastro", "cidade", "uf",
+)
+
+# Comandos de inserção dos cadastros.
+INSERIR_PESSOA_FISICA = """
+    INSERT INTO pessoas_fisicas
+    (nome, cpf, data_nascimento, endereco, telefone, email, data_cadastro,
+     cidade, uf)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERIR_PESSOA_JURIDICA = """
+    INSERT INTO pessoas_juridicas
+    (razao_social, nome_fantasia, cnpj, endereco, telefone, email,
+     representante_legal, data_cadastro, cidade, uf)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Campos que podem ser alterados após o cadastro.
+CAMPOS_ATUALIZAVEIS_PF = ("nome", "data_nascimento", "endereco", "telefone", "email")
+CAMPOS_ATUALIZAVEIS_PJ = (
+    "razao_social", "nome_fantasia", "endereco", "telefone", "email",
+    "representante_legal",
+)
+
+# Pesos do cálculo dos dígitos verificadores do CNPJ.
+PESOS_CNPJ_1 = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+PESOS_CNPJ_2 = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+
+
+def _digito_verificador(soma: int) -> int:
+    resto = soma % 11
+    return 0 if resto < 2 else 11 - resto
+
+
+def calcular_digitos_cpf(base: str) -> str:
+    """Calcula os dois dígitos verificadores dos 9 primeiros dígitos do CPF."""
+    digito1 = _digito_verificador(sum(int(base[i]) * (10 - i) for i in range(9)))
+    base += str(digito1)
+    digito2 = _digito_verificador(sum(int(base[i]) * (11 - i) for i in range(10)))
+    return f"{digito1}{digito2}"
+
+
+def calcular_digitos_cnpj(base: str) -> str:
+    """Calcula os dois dígitos verificadores dos 12 primeiros dígitos do CNPJ."""
+    digito1 = _digito_verificador(
+        sum(int(base[i]) * PESOS_CNPJ_1[i] for i in range(12))
+    )
+    base += str(digito1)
+    digito2 = _digito_verificador(
+        sum(int(base[i]) * PESOS_CNPJ_2[i] for i in range(13))
+    )
+    return f"{digito1}{digito2}"
+
 
 class DatabaseManager:
-    """Gerenciador de banco de dados para clientes."""
+    """Gerenciador de banco de dados para clientes.
 
-    def __init__(self):
-        self.db_path = DB_PATH
-        self.init_database()
+    A inicialização é preguiçosa: o esquema só é verificado na primeira
+    conexão, e um banco já na versão atual não executa nenhum DDL.
+    """
 
-    def init_database(self):
-        """Inicializa o banco de dados e cria as tabelas."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+    # Classe das conexões abertas; a instrumentação pode substituí-la.
+    fabrica_conexao = sqlite3.Connection
 
-                # Tabela para Pessoas Físicas.
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS pessoas_fisicas (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        nome TEXT NOT NULL,
-                        cpf TEXT UNIQUE NOT NULL,
-                        data_nascimento TEXT NOT NULL,
-                        endereco TEXT NOT NULL,
-                        telefone TEXT,
-                        email TEXT,
-                        data_cadastro TEXT NOT NULL,
-                        ativo BOOLEAN DEFAULT 1
-                    )
-                """)
+    # Segundos que uma conexão espera por um banco bloqueado antes do erro.
+    timeout_bloqueio = 5.0
 
-                # Tabela para Pessoas Jurídicas.
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS pessoas_juridicas (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        razao_social TEXT NOT NULL,
-                        nome_fantasia TEXT,
-                        cnpj TEXT UNIQUE NOT NULL,
-                        endereco TEXT NOT NULL,
-                        telefone TEXT,
-                        email TEXT,
-                        representante_legal TEXT NOT NULL,
-                        data_cadastro TEXT NOT NULL,
-                        ativo BOOLEAN DEFAULT 1
-                    )
-                """)
+    def __init__(self, db_path=None, replica_memoria: bool = False):
+        self.db_path = db_path or DB_PATH
+        self._inicializado_em = None
+        self._replica: Optional[sqlite3.Connection] = None
+        self._trava_replica = threading.RLock()
+        self._escritor: Optional[EscritorEmGrupo] = None
+        if replica_memoria:
+            self.ativar_replica()
+
+    def _abrir(self) -> sqlite3.Connection:
+        """Abre uma conexão sem verificar o esquema."""
+        metricas.incrementar("banco_db_conexoes_total")
+        return sqlite3.connect(
+            self.db_path, timeout=self.timeout_bloqueio, factory=self.fabrica_conexao
+        )
+
+    def _conectar(self) -> sqlite3.Connection:
+        """Abre uma conexão, inicializando o banco no primeiro uso."""
+        if self._inicializado_em != self.db_path:
+            self.init_database()
+        return self._abrir()
+
+    def ativar_replica(self):
+        """Carrega o banco em uma réplica `:memory:` que passa a atender as leituras.
+
+        As escritas feitas por este gerenciador são aplicadas no arquivo e,
+        após o commit, na réplica. Escritas de outros processos não chegam à
+        réplica.
+        """
+        with self._trava_replica:
+            if self._replica is not None:
+                return
+            replica = sqlite3.connect(
+                ":memory:", factory=self.fabrica_conexao, check_same_thread=False
+            )
+            origem = self._conectar()
+            try:
+                origem.backup(replica)
+            finally:
+                origem.close()
+            self._replica = replica
+
+    def desativar_replica(self):
+        """Descarta a réplica; as leituras voltam a usar o arquivo."""
+        with self._trava_replica:
+            if self._replica is not None:
+                self._replica.close()
+                self._replica = None
+
+    @contextlib.contextmanager
+    def _leitura(self) -> Iterator[sqlite3.Connection]:
+        """Conexão das consultas: a réplica em memória, se ativa, ou o arquivo."""
+        with self._trava_replica:
+            if self._replica is not None:
+                with self._replica as replica:
+                    yield replica
+                return
 
+        with self._conectar() as conn:
+            yield conn
+
+    def _aplicar_escrita(self, comandos: List[Tuple[str, List[tuple]]]) -> int:
+        """Executa `(comando, linhas)` no arquivo e, após o commit, na réplica.
+
+        Retorna o total de linhas alteradas. Se a réplica não aceitar a
+        escrita, ela é descartada para não servir dados divergentes.
+        """
+        with self._trava_escrita():
+            with self._conectar() as conn:
+                cursor = conn.cursor()
+                alterados = 0
+                for comando, linhas in comandos:
+                    cursor.executemany(comando, linhas)
+                    alterados += cursor.rowcount
                 conn.commit()
-                print("✅ Banco de dados inicializado com sucesso!")
+
+            self._replicar(comandos)
+        return alterados
+
+    def _trava_escrita(self):
+        """Trava que envolve o commit no arquivo e a reaplicação na réplica.
+
+        Com a réplica ativa, escritas concorrentes chegam a ela na mesma ordem
+        em que foram gravadas no arquivo, e os ids AUTOINCREMENT (e os rowids
+        da busca textual) coincidem. Sem réplica, as escritas não se esperam.
+        """
+        if self._replica is not None:
+            return self._trava_replica
+        return contextlib.nullcontext()
+
+    def _replicar(self, comandos: List[Tuple[str, List[tuple]]]):
+        """Aplica na réplica (se ativa) escritas já gravadas no arquivo."""
+        with self._trava_replica:
+            if self._replica is not None:
+                try:
+                    with self._replica as replica:
+                        for comando, linhas in comandos:
+                            replica.executemany(comando, linhas)
+                except sqlite3.Error as e:
+                    self._registrar_erro("replica", e)
+                    print(f"⚠️  Réplica em memória descartada: {e}")
+                    self.desativar_replica()
+
+    def ativar_escrita_em_grupo(self, max_lote: int = 500, max_espera_ms: float = 5.0,
+                                durabilidade: str = "completa"):
+        """Passa a gravar os cadastros em grupo, por uma thread de escrita.
+
+        `inserir_pessoa_fisica`/`inserir_pessoa_juridica` continuam síncronos
+        (retornam após o COMMIT do grupo), mas chamadas concorrentes dividem
+        a mesma transação; `enfileirar_*` não esperam a gravação. A
+        `durabilidade` ("completa", "normal" ou "desligada") está descrita em
+        `escrita_em_grupo.DURABILIDADES`; o banco passa ao modo WAL.
+        """
+        if self._escritor is None:
+            self._escritor = EscritorEmGrupo(
+                self._conectar, self._replicar, self._registrar_erro,
+                max_lote, max_espera_ms, durabilidade, trava=self._trava_escrita,
+            )
+
+    def desativar_escrita_em_grupo(self):
+        """Grava o que está na fila e volta a um commit por cadastro."""
+        escritor, self._escritor = self._escritor, None
+        if escritor is not None:
+            escritor.encerrar()
+
+    def aguardar_escritas(self):
+        """Bloqueia até que os cadastros enfileirados estejam gravados."""
+        if self._escritor is not None:
+            self._escritor.aguardar()
+
+    def _registrar_erro(self, operacao: str, erro: sqlite3.Error):
+        """Contabiliza um erro do SQLite tratado pela operação."""
+        if isinstance(erro, sqlite3.IntegrityError):
+            tipo = "integridade"
+        elif "locked" in str(erro) or "busy" in str(erro):
+            tipo = "bloqueio"
+        else:
+            tipo = erro.__class__.__name__
+        _erro_da_thread.tipo = tipo
+        metricas.incrementar("banco_db_erros_total", operacao=operacao, tipo=tipo)
+
+    def init_database(self):
+        """Inicializa o banco de dados, aplicando as migrações pendentes."""
+        try:
+            with self._abrir() as conn:
+                versao = conn.execute("PRAGMA user_version").fetchone()[0]
+
+                if versao < VERSAO_ESQUEMA:
+                    # Outros processos podem migrar o mesmo arquivo: a versão é
+                    # relida com a trava de escrita tomada, e os passos e a nova
+                    # versão são confirmados (ou desfeitos) juntos.
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        versao = conn.execute("PRAGMA user_version").fetchone()[0]
+                        cursor = conn.cursor()
+                        for numero in range(versao, VERSAO_ESQUEMA):
+                            for comando in MIGRACOES[numero]:
+                                if callable(comando):
+                                    comando(conn)
+                                else:
+                                    cursor.execute(comando)
+                        cursor.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+                        conn.commit()
+                    except BaseException:
+                        conn.rollback()
+                        raise
+                    if versao < VERSAO_ESQUEMA:
+                        print("✅ Banco de dados inicializado com sucesso!")
+
+                self._inicializado_em = self.db_path
 
         except sqlite3.Error as e:
+            self._registrar_erro("init_database", e)
             print(f"❌ Erro ao inicializar banco de dados: {e}")
 
     def validar_cpf(self, cpf: str) -> bool:
@@ -71,18 +577,8 @@ class DatabaseManager:
         if cpf == cpf[0] * 11:
             return False
 
-        # Calcula primeiro dígito verificador.
-        soma = sum(int(cpf[i]) * (10 - i) for i in range(9))
-        resto = soma % 11
-        digito1 = 0 if resto < 2 else 11 - resto
-
-        # Calcula segundo dígito verificador.
-        soma = sum(int(cpf[i]) * (11 - i) for i in range(10))
-        resto = soma % 11
-        digito2 = 0 if resto < 2 else 11 - resto
-
         # Verifica se os dígitos calculados coincidem.
-        return cpf[-2:] == f"{digito1}{digito2}"
+        return cpf[-2:] == calcular_digitos_cpf(cpf[:9])
 
     def validar_cnpj(self, cnpj: str) -> bool:
         """Valida CNPJ usando algoritmo oficial."""
@@ -97,20 +593,8 @@ class DatabaseManager:
         if cnpj == cnpj[0] * 14:
             return False
 
-        # Calcula primeiro dígito verificador.
-        sequencia1 = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-        soma = sum(int(cnpj[i]) * sequencia1[i] for i in range(12))
-        resto = soma % 11
-        digito1 = 0 if resto < 2 else 11 - resto
-
-        # Calcula segundo dígito verificador.
-        sequencia2 = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-        soma = sum(int(cnpj[i]) * sequencia2[i] for i in range(13))
-        resto = soma % 11
-        digito2 = 0 if resto < 2 else 11 - resto
-
         # Verifica se os dígitos calculados coincidem.
-        return cnpj[-2:] == f"{digito1}{digito2}"
+        return cnpj[-2:] == calcular_digitos_cnpj(cnpj[:12])
 
     def inserir_pessoa_fisica(self, dados: Dict) -> bool:
         """Insere uma pessoa física no banco de dados."""
@@ -121,34 +605,30 @@ class DatabaseManager:
                 print("❌ CPF inválido!")
                 return False
 
+            if self._escritor is not None:
+                resultado = self._escritor.enfileirar(
+                    INSERIR_PESSOA_FISICA, self._linha_pessoa_fisica(dados, cpf_limpo),
+                    "inserir_pessoa_fisica",
+                ).result()
+                return self._informar_cadastro(resultado, "Pessoa física", "CPF")
+
             # Verificar se CPF já existe.
             if self.cpf_existe(cpf_limpo):
                 print("❌ CPF já cadastrado!")
                 return False
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO pessoas_fisicas
-                    (nome, cpf, data_nascimento, endereco, telefone, email, data_cadastro)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    dados['nome'],
-                    cpf_limpo,
-                    dados['data_nascimento'],
-                    dados['endereco'],
-                    dados.get('telefone', ''),
-                    dados.get('email', ''),
-                    datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-                ))
-                conn.commit()
-                print("✅ Pessoa física cadastrada com sucesso!")
-                return True
+            self._aplicar_escrita([
+                (INSERIR_PESSOA_FISICA, [self._linha_pessoa_fisica(dados, cpf_limpo)])
+            ])
+            print("✅ Pessoa física cadastrada com sucesso!")
+            return True
 
-        except sqlite3.IntegrityError:
+        except sqlite3.IntegrityError as e:
+            self._registrar_erro("inserir_pessoa_fisica", e)
             print("❌ Erro: CPF já cadastrado!")
             return False
         except sqlite3.Error as e:
+            self._registrar_erro("inserir_pessoa_fisica", e)
             print(f"❌ Erro ao inserir pessoa física: {e}")
             return False
 
@@ -161,63 +641,133 @@ class DatabaseManager:
                 print("❌ CNPJ inválido!")
                 return False
 
+            if self._escritor is not None:
+                resultado = self._escritor.enfileirar(
+                    INSERIR_PESSOA_JURIDICA, self._linha_pessoa_juridica(dados, cnpj_limpo),
+                    "inserir_pessoa_juridica",
+                ).result()
+                return self._informar_cadastro(resultado, "Pessoa jurídica", "CNPJ")
+
             # Verificar se CNPJ já existe.
             if self.cnpj_existe(cnpj_limpo):
                 print("❌ CNPJ já cadastrado!")
                 return False
 
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO pessoas_juridicas
-                    (razao_social, nome_fantasia, cnpj, endereco, telefone, email,
-                     representante_legal, data_cadastro)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    dados['razao_social'],
-                    dados.get('nome_fantasia', ''),
-                    cnpj_limpo,
-                    dados['endereco'],
-                    dados.get('telefone', ''),
-                    dados.get('email', ''),
-                    dados['representante_legal'],
-                    datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-                ))
-                conn.commit()
-                print("✅ Pessoa jurídica cadastrada com sucesso!")
-                return True
+            self._aplicar_escrita([
+                (INSERIR_PESSOA_JURIDICA, [self._linha_pessoa_juridica(dados, cnpj_limpo)])
+            ])
+            print("✅ Pessoa jurídica cadastrada com sucesso!")
+            return True
 
-        except sqlite3.IntegrityError:
+        except sqlite3.IntegrityError as e:
+            self._registrar_erro("inserir_pessoa_juridica", e)
             print("❌ Erro: CNPJ já cadastrado!")
             return False
         except sqlite3.Error as e:
+            self._registrar_erro("inserir_pessoa_juridica", e)
             print(f"❌ Erro ao inserir pessoa jurídica: {e}")
             return False
 
+    def enfileirar_pessoa_fisica(self, dados: Dict,
+                                 callback: Optional[Callable[[str], None]] = None) -> Future:
+        """Enfileira o cadastro na escrita em grupo, sem aguardar a gravação.
+
+        O futuro (e o `callback`, se houver) recebe o resultado da linha:
+        "inserido", "duplicado", "invalido" ou "erro".
+        """
+        escritor = self._escritor_ativo()
+        cpf_limpo = re.sub(r'[^0-9]', '', dados['cpf'])
+        if not self.validar_cpf(cpf_limpo):
+            return escritor.resolvido(INVALIDO, callback)
+        return escritor.enfileirar(
+            INSERIR_PESSOA_FISICA, self._linha_pessoa_fisica(dados, cpf_limpo),
+            "inserir_pessoa_fisica", callback,
+        )
+
+    def enfileirar_pessoa_juridica(self, dados: Dict,
+                                   callback: Optional[Callable[[str], None]] = None) -> Future:
+        """Enfileira o cadastro na escrita em grupo (ver `enfileirar_pessoa_fisica`)."""
+        escritor = self._escritor_ativo()
+        cnpj_limpo = re.sub(r'[^0-9]', '', dados['cnpj'])
+        if not self.validar_cnpj(cnpj_limpo):
+            return escritor.resolvido(INVALIDO, callback)
+        return escritor.enfileirar(
+            INSERIR_PESSOA_JURIDICA, self._linha_pessoa_juridica(dados, cnpj_limpo),
+            "inserir_pessoa_juridica", callback,
+        )
+
+    def _escritor_ativo(self) -> EscritorEmGrupo:
+        if self._escritor is None:
+            raise RuntimeError("Escrita em grupo inativa: use ativar_escrita_em_grupo()")
+        return self._escritor
+
+    @staticmethod
+    def _linha_pessoa_fisica(dados: Dict, cpf: str) -> tuple:
+        """Valores de `INSERIR_PESSOA_FISICA` para os dados do cadastro."""
+        return (
+            dados['nome'],
+            cpf,
+            dados['data_nascimento'],
+            dados['endereco'],
+            dados.get('telefone', ''),
+            dados.get('email', ''),
+            datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            *separar_cidade_uf(dados['endereco'])
+        )
+
+    @staticmethod
+    def _linha_pessoa_juridica(dados: Dict, cnpj: str) -> tuple:
+        """Valores de `INSERIR_PESSOA_JURIDICA` para os dados do cadastro."""
+        return (
+            dados['razao_social'],
+            dados.get('nome_fantasia', ''),
+            cnpj,
+            dados['endereco'],
+            dados.get('telefone', ''),
+            dados.get('email', ''),
+            dados['representante_legal'],
+            datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+            *separar_cidade_uf(dados['endereco'])
+        )
+
+    @staticmethod
+    def _informar_cadastro(resultado: str, tipo: str, documento: str) -> bool:
+        """Mostra o resultado de um cadastro gravado pela escrita em grupo."""
+        if resultado == INSERIDO:
+            print(f"✅ {tipo} cadastrada com sucesso!")
+            return True
+        if resultado == DUPLICADO:
+            print(f"❌ {documento} já cadastrado!")
+        else:
+            print(f"❌ Erro ao inserir {tipo.lower()}!")
+        return False
+
     def cpf_existe(self, cpf: str) -> bool:
         """Verifica se CPF já existe no banco."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._leitura() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT 1 FROM pessoas_fisicas WHERE cpf = ?", (cpf,))
                 return cursor.fetchone() is not None
-        except sqlite3.Error:
+        except sqlite3.Error as e:
+            self._registrar_erro("cpf_existe", e)
             return False
 
     def cnpj_existe(self, cnpj: str) -> bool:
         """Verifica se CNPJ já existe no banco."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._leitura() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT 1 FROM pessoas_juridicas WHERE cnpj = ?", (cnpj,))
                 return cursor.fetchone() is not None
-        except sqlite3.Error:
+        except sqlite3.Error as e:
+            self._registrar_erro("cnpj_existe", e)
             return False
 
     def listar_pessoas_fisicas(self) -> List[Dict]:
         """Lista todas as pessoas físicas cadastradas."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._leitura() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, nome, cpf, data_nascimento, endereco, telefone, email, data_cadastro
@@ -232,13 +782,14 @@ class DatabaseManager:
                 return [dict(zip(colunas, row)) for row in resultados]
 
         except sqlite3.Error as e:
+            self._registrar_erro("listar_pessoas_fisicas", e)
             print(f"❌ Erro ao listar pessoas físicas: {e}")
             return []
 
     def listar_pessoas_juridicas(self) -> List[Dict]:
         """Lista todas as pessoas jurídicas cadastradas."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._leitura() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, razao_social, nome_fantasia, cnpj, endereco, telefone,
@@ -254,9 +805,77 @@ class DatabaseManager:
                 return [dict(zip(colunas, row)) for row in resultados]
 
         except sqlite3.Error as e:
+            self._registrar_erro("listar_pessoas_juridicas", e)
             print(f"❌ Erro ao listar pessoas jurídicas: {e}")
             return []
 
+    def iterar_clientes(self, tipo: str, tamanho_lote: int = 5000,
+                        ordem: str = "id") -> Iterator[List[tuple]]:
+        """Percorre os clientes ativos ('PF' ou 'PJ') em lotes de tuplas.
+
+        Usa `fetchmany`, então a memória ocupada é limitada ao tamanho do
+        lote. A ordem das colunas é `COLUNAS_PESSOAS_FISICAS` ou
+        `COLUNAS_PESSOAS_JURIDICAS`; `ordem` é uma delas.
+        """
+        if tipo == 'PF':
+            tabela, colunas = "pessoas_fisicas", COLUNAS_PESSOAS_FISICAS
+        else:
+            tabela, colunas = "pessoas_juridicas", COLUNAS_PESSOAS_JURIDICAS
+
+        if ordem not in colunas:
+            raise ValueError(f"Coluna de ordenação inválida: {ordem!r}")
+
+        try:
+            with self._conectar() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"SELECT {', '.join(colunas)} FROM {tabela} "
+                    f"WHERE ativo = 1 ORDER BY {ordem}"
+                )
+                while True:
+                    lote = cursor.fetchmany(tamanho_lote)
+                    if not lote:
+                        break
+                    yield lote
+
+        except sqlite3.Error as e:
+            self._registrar_erro("iterar_clientes", e)
+            print(f"❌ Erro ao percorrer clientes: {e}")
+
+    def fazer_backup(self, destino, paginas_por_passo: int = 256, pausa: float = 0.005) -> bool:
+        """Copia o banco para `destino` com a API de backup do SQLite.
+
+        A cópia é feita em passos de `paginas_por_passo` páginas, com uma
+        pausa entre eles para que as escritas concorrentes não fiquem
+        bloqueadas durante todo o backup.
+        """
+        def progresso(status, restantes, total):
+            if restantes:
+                time.sleep(pausa)
+
+        try:
+            with contextlib.closing(self._conectar()) as origem, \
+                    contextlib.closing(sqlite3.connect(destino)) as copia:
+                origem.backup(copia, pages=paginas_por_passo, progress=progresso)
+            return True
+
+        except sqlite3.Error as e:
+            self._registrar_erro("fazer_backup", e)
+            print(f"❌ Erro ao fazer backup: {e}")
+            return False
+
+    def verificar_integridade(self, caminho=None) -> bool:
+        """Executa `PRAGMA integrity_check` no banco (ou em uma cópia dele)."""
+        try:
+            conn = sqlite3.connect(caminho or self.db_path)
+            try:
+                return conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self._registrar_erro("verificar_integridade", e)
+            return False
+
     def buscar_cliente_por_documento(self, documento: str) -> Optional[Dict]:
         """Busca cliente por CPF ou CNPJ."""
         documento_limpo = re.sub(r'[^0-9]', '', documento)
@@ -264,7 +883,7 @@ class DatabaseManager:
         # Tentar buscar como CPF (11 dígitos).
         if len(documento_limpo) == 11:
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self._leitura() as conn:
                     cursor = conn.cursor()
                     cursor.execute("""
                         SELECT *, 'PF' as tipo FROM pessoas_fisicas
@@ -274,13 +893,14 @@ class DatabaseManager:
                     if resultado:
                         colunas = [desc[0] for desc in cursor.description]
                         return dict(zip(colunas, resultado))
-            except sqlite3.Error:
+            except sqlite3.Error as e:
+                self._registrar_erro("buscar_cliente_por_documento", e)
                 pass
 
         # Tentar buscar como CNPJ (14 dígitos).
         elif len(documento_limpo) == 14:
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with self._leitura() as conn:
                     cursor = conn.cursor()
                     cursor.execute("""
                         SELECT *, 'PJ' as tipo FROM pessoas_juridicas
@@ -290,11 +910,237 @@ class DatabaseManager:
                     if resultado:
                         colunas = [desc[0] for desc in cursor.description]
                         return dict(zip(colunas, resultado))
-            except sqlite3.Error:
+            except sqlite3.Error as e:
+                self._registrar_erro("buscar_cliente_por_documento", e)
                 pass
 
         return None
 
+    def buscar_por_nome(self, termo: str, limite: int = 20) -> List[Dict]:
+        """Busca clientes ativos por nome, razão social ou nome fantasia.
+
+        Ignora acentos e maiúsculas; cada palavra do termo é tratada como
+        prefixo ("jo sil" encontra "João da Silva"). Os resultados vêm
+        ordenados por `relevancia` (bm25; menor é mais relevante).
+        """
+        palavras = re.findall(r'\w+', termo)
+        if not palavras:
+            return []
+        consulta = " ".join(f'"{palavra}"*' for palavra in palavras)
+
+        try:
+            with self._leitura() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT clientes_fts.tipo AS tipo,
+                           clientes_fts.ref_id AS id,
+                           COALESCE(pf.nome, pj.razao_social) AS nome,
+                           pj.nome_fantasia AS nome_fantasia,
+                           COALESCE(pf.cpf, pj.cnpj) AS documento,
+                           bm25(clientes_fts) AS relevancia
+                    FROM clientes_fts
+                    LEFT JOIN pessoas_fisicas pf
+                        ON clientes_fts.tipo = 'PF' AND pf.id = clientes_fts.ref_id
+                    LEFT JOIN pessoas_juridicas pj
+                        ON clientes_fts.tipo = 'PJ' AND pj.id = clientes_fts.ref_id
+                    WHERE clientes_fts MATCH ?
+                      AND COALESCE(pf.ativo, pj.ativo) = 1
+                    ORDER BY bm25(clientes_fts)
+                    LIMIT ?
+                """, (consulta, limite))
+
+                colunas = [desc[0] for desc in cursor.description]
+                return [dict(zip(colunas, row)) for row in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            self._registrar_erro("buscar_por_nome", e)
+            print(f"❌ Erro ao buscar por nome: {e}")
+            return []
+
+    def atualizar_pessoa_fisica(self, cpf: str, campos: Dict) -> bool:
+        """Atualiza os campos informados de uma pessoa física ativa."""
+        alterados = self.atualizar_pessoas_fisicas_em_lote([(cpf, campos)])
+        if alterados:
+            print("✅ Pessoa física atualizada com sucesso!")
+        else:
+            print("❌ Pessoa física não encontrada ou dados inválidos!")
+        return alterados == 1
+
+    def atualizar_pessoa_juridica(self, cnpj: str, campos: Dict) -> bool:
+        """Atualiza os campos informados de uma pessoa jurídica ativa."""
+        alterados = self.atualizar_pessoas_juridicas_em_lote([(cnpj, campos)])
+        if alterados:
+            print("✅ Pessoa jurídica atualizada com sucesso!")
+        else:
+            print("❌ Pessoa jurídica não encontrada ou dados inválidos!")
+        return alterados == 1
+
+    def atualizar_pessoas_fisicas_em_lote(self, atualizacoes: List[Tuple[str, Dict]]) -> int:
+        """Aplica `(cpf, campos)` em uma única transação; retorna as linhas alteradas."""
+        return self._atualizar_em_lote(
+            "pessoas_fisicas", "cpf", CAMPOS_ATUALIZAVEIS_PF, atualizacoes,
+            "atualizar_pessoas_fisicas_em_lote",
+        )
+
+    def atualizar_pessoas_juridicas_em_lote(self, atualizacoes: List[Tuple[str, Dict]]) -> int:
+        """Aplica `(cnpj, campos)` em uma única transação; retorna as linhas alteradas."""
+        return self._atualizar_em_lote(
+            "pessoas_juridicas", "cnpj", CAMPOS_ATUALIZAVEIS_PJ, atualizacoes,
+            "atualizar_pessoas_juridicas_em_lote",
+        )
+
+    def _atualizar_em_lote(self, tabela, coluna_documento, permitidos, atualizacoes, operacao) -> int:
+        """Agrupa as atualizações pelo conjunto de campos e usa `executemany`."""
+        grupos: Dict[Tuple[str, ...], List[Tuple]] = {}
+        for documento, campos in atualizacoes:
+            if not campos or any(campo not in permitidos for campo in campos):
+                continue
+            if 'endereco' in campos:
+                cidade, uf = separar_cidade_uf(campos['endereco'])
+                campos = {**campos, 'cidade': cidade, 'uf': uf}
+            chave = tuple(sorted(campos))
+            grupos.setdefault(chave, []).append(
+                tuple(campos[c] for c in chave) + (re.sub(r'[^0-9]', '', documento),)
+            )
+
+        if not grupos:
+            return 0
+
+        comandos = []
+        for chave, linhas in grupos.items():
+            atribuicoes = ", ".join(f"{campo} = ?" for campo in chave)
+            comandos.append((f"""
+                UPDATE {tabela} SET {atribuicoes}
+                WHERE {coluna_documento} = ? AND ativo = 1
+            """, linhas))
+
+        try:
+            return self._aplicar_escrita(comandos)
+
+        except sqlite3.Error as e:
+            self._registrar_erro(operacao, e)
+            print(f"❌ Erro ao atualizar clientes: {e}")
+            return 0
+
+    def desativar_cliente(self, documento: str) -> bool:
+        """Desativa (soft delete) o cliente do CPF ou CNPJ."""
+        if self.desativar_clientes([documento]):
+            print("✅ Cliente desativado com sucesso!")
+            return True
+        print("❌ Cliente ativo não encontrado!")
+        return False
+
+    def reativar_cliente(self, documento: str) -> bool:
+        """Reativa um cliente desativado."""
+        if self.reativar_clientes([documento]):
+            print("✅ Cliente reativado com sucesso!")
+            return True
+        print("❌ Cliente inativo não encontrado!")
+        return False
+
+    def desativar_clientes(self, documentos: List[str]) -> int:
+        """Desativa vários clientes de uma vez; retorna quantos mudaram."""
+        return self._definir_ativo(documentos, False, "desativar_clientes")
+
+    def reativar_clientes(self, documentos: List[str]) -> int:
+        """Reativa vários clientes de uma vez; retorna quantos mudaram."""
+        return self._definir_ativo(documentos, True, "reativar_clientes")
+
+    def _definir_ativo(self, documentos, ativo: bool, operacao: str) -> int:
+        """Altera `ativo` dos CPFs e CNPJs informados em uma única transação."""
+        cpfs, cnpjs = [], []
+        for documento in documentos:
+            documento = re.sub(r'[^0-9]', '', documento)
+            if len(documento) == 11:
+                cpfs.append((int(ativo), documento, int(not ativo)))
+            elif len(documento) == 14:
+                cnpjs.append((int(ativo), documento, int(not ativo)))
+
+        comandos = [
+            (f"UPDATE {tabela} SET ativo = ? WHERE {coluna} = ? AND ativo = ?", linhas)
+            for tabela, coluna, linhas in (
+                ("pessoas_fisicas", "cpf", cpfs),
+                ("pessoas_juridicas", "cnpj", cnpjs),
+            )
+            if linhas
+        ]
+
+        try:
+            return self._aplicar_escrita(comandos)
+
+        except sqlite3.Error as e:
+            self._registrar_erro(operacao, e)
+            print(f"❌ Erro ao alterar situação dos clientes: {e}")
+            return 0
+
+    def preencher_cidade_uf(self, tamanho_lote: int = 5000) -> int:
+        """Preenche cidade e UF das linhas gravadas sem elas (ex.: cargas diretas)."""
+        try:
+            with self._conectar() as conn:
+                preenchidos = _preencher_cidade_uf(conn, tamanho_lote, somente_vazios=True)
+                conn.commit()
+            if self._replica is not None:
+                self.desativar_replica()
+                self.ativar_replica()
+            return preenchidos
+
+        except sqlite3.Error as e:
+            self._registrar_erro("preencher_cidade_uf", e)
+            print(f"❌ Erro ao preencher cidade e UF: {e}")
+            return 0
+
+    def contar_por_uf(self) -> Dict[str, int]:
+        """Clientes ativos por UF, agrupados no SQLite."""
+        try:
+            with self._leitura() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT COALESCE(uf, 'ND'), SUM(total) FROM (
+                        SELECT uf, COUNT(*) AS total FROM pessoas_fisicas
+                        WHERE ativo = 1 GROUP BY uf
+                        UNION ALL
+                        SELECT uf, COUNT(*) FROM pessoas_juridicas
+                        WHERE ativo = 1 GROUP BY uf
+                    )
+                    GROUP BY 1
+                    ORDER BY 2 DESC, 1
+                """)
+                return dict(cursor.fetchall())
+
+        except sqlite3.Error as e:
+            self._registrar_erro("contar_por_uf", e)
+            print(f"❌ Erro ao contar clientes por UF: {e}")
+            return {}
+
+    def contar_por_cidade(self, uf: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        """Clientes ativos por cidade (opcionalmente de uma UF), agrupados no SQLite."""
+        # Endereços só com a UF (cidade desconhecida) não entram na contagem.
+        filtro = ("AND uf = ?" if uf else "AND uf IS NOT NULL") + " AND cidade IS NOT NULL"
+        parametros = [uf.upper()] * 2 if uf else []
+        try:
+            with self._leitura() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT uf, cidade, SUM(total) AS total FROM (
+                        SELECT uf, cidade, COUNT(*) AS total FROM pessoas_fisicas
+                        WHERE ativo = 1 {filtro} GROUP BY uf, cidade
+                        UNION ALL
+                        SELECT uf, cidade, COUNT(*) FROM pessoas_juridicas
+                        WHERE ativo = 1 {filtro} GROUP BY uf, cidade
+                    )
+                    GROUP BY uf, cidade
+                    ORDER BY total DESC, uf, cidade
+                    LIMIT ?
+                """, (*parametros, -1 if limite is None else limite))
+
+                colunas = [desc[0] for desc in cursor.description]
+                return [dict(zip(colunas, row)) for row in cursor.fetchall()]
+
+        except sqlite3.Error as e:
+            self._registrar_erro("contar_por_cidade", e)
+            print(f"❌ Erro ao contar clientes por cidade: {e}")
+            return []
+
     def formatar_cpf(self, cpf: str) -> str:
         """Formata CPF para exibição."""
         if len(cpf) == 11:
@@ -308,25 +1154,79 @@ class DatabaseManager:
         return cnpj
 
     def obter_estatisticas(self) -> Dict:
-        """Obtém estatísticas do banco de dados."""
+        """Obtém estatísticas do banco de dados.
+
+        Lê os contadores da tabela `estatisticas`, mantidos por gatilhos, sem
+        percorrer as tabelas de clientes.
+        """
+        estatisticas = {
+            'pessoas_fisicas': 0,
+            'pessoas_juridicas': 0,
+            'total': 0,
+            'por_mes': {},
+            'por_uf': {},
+            'por_faixa_etaria': {rotulo: 0 for _, rotulo in reversed(FAIXAS_ETARIAS)},
+        }
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._leitura() as conn:
                 cursor = conn.cursor()
+                cursor.execute("SELECT chave, valor FROM estatisticas WHERE valor > 0")
+                contadores = cursor.fetchall()
+
+        except sqlite3.Error as e:
+            self._registrar_erro("obter_estatisticas", e)
+            print(f"❌ Erro ao obter estatísticas: {e}")
+            return estatisticas
 
-                # Contar pessoas físicas.
-                cursor.execute("SELECT COUNT(*) FROM pessoas_fisicas WHERE ativo = 1")
-                total_pf = cursor.fetchone()[0]
+        ano_atual = datetime.now().year
+        for chave, valor in sorted(contadores):
+            grupo, _, nome = chave.partition(":")
+            if chave == "total:PF":
+                estatisticas['pessoas_fisicas'] = valor
+            elif chave == "total:PJ":
+                estatisticas['pessoas_juridicas'] = valor
+            elif grupo == "mes":
+                estatisticas['por_mes'][nome] = valor
+            elif grupo == "uf":
+                estatisticas['por_uf'][nome] = valor
+            elif grupo == "nascimento" and nome.isdigit():
+                idade = ano_atual - int(nome)
+                rotulo = next(r for minimo, r in FAIXAS_ETARIAS if idade >= minimo or minimo == 0)
+                estatisticas['por_faixa_etaria'][rotulo] += valor
 
-                # Contar pessoas jurídicas.
-                cursor.execute("SELECT COUNT(*) FROM pessoas_juridicas WHERE ativo = 1")
-                total_pj = cursor.fetchone()[0]
+        estatisticas['total'] = estatisticas['pessoas_fisicas'] + estatisticas['pessoas_juridicas']
+        return estatisticas
 
-                return {
-                    'pessoas_fisicas': total_pf,
-                    'pessoas_juridicas': total_pj,
-                    'total': total_pf + total_pj
-                }
 
-        except sqlite3.Error as e:
-            print(f"❌ Erro ao obter estatísticas: {e}")
-            return {'pessoas_fisicas': 0, 'pessoas_juridicas': 0, 'total': 0}
+def ultimo_erro(limpar: bool = True) -> Optional[str]:
+    """Tipo do último erro do SQLite tratado nesta thread ("bloqueio", ...)."""
+    tipo = getattr(_erro_da_thread, "tipo", None)
+    if limpar:
+        _erro_da_thread.tipo = None
+    return tipo
+
+
+# Gerenciadores já criados, por caminho do banco.
+_gerenciadores: Dict[str, DatabaseManager] = {}
+_trava_gerenciadores = threading.Lock()
+
+
+def obter_gerenciador(db_path=None, replica_memoria: bool = False) -> DatabaseManager:
+    """Retorna o `DatabaseManager` do caminho, reaproveitando o já criado.
+
+    Com `replica_memoria`, garante que o gerenciador tenha a réplica ativa.
+    """
+    chave = str(Path(db_path or DB_PATH).resolve())
+    with _trava_gerenciadores:
+        gerenciador = _gerenciadores.get(chave)
+        if gerenciador is None:
+            gerenciador = _gerenciadores[chave] = DatabaseManager(db_path)
+    if replica_memoria:
+        gerenciador.ativar_replica()
+    return gerenciador
+
+
+metricas.registrar_coletor(
+    lambda: [("banco_gerenciadores_em_cache", (), len(_gerenciadores))]
+)
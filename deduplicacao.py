@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Detecção de clientes quase duplicados
+Chaves de bloqueio e pontuação de similaridade dentro dos blocos, em paralelo
+
+A restrição UNIQUE de CPF/CNPJ só impede documentos idênticos; a mesma
+pessoa ou empresa cadastrada duas vezes (com erros de digitação ou outro
+nome fantasia) passa. Comparar todos os pares seria O(n²): aqui cada
+cadastro recebe algumas chaves de bloqueio (tokens normalizados do nome,
+data de nascimento, cidade/UF, raiz do CNPJ) e só são comparados cadastros
+com alguma chave em comum. As chaves são ordenadas em um SQLite temporário
+(fora da memória) e os blocos são pontuados em vários processos.
+
+Blocos maiores que `max_bloco` (nomes muito comuns) são percorridos por
+vizinhança ordenada: cada cadastro é comparado apenas aos `janela`
+seguintes na ordem do nome.
+
+Exemplos:
+    python deduplicacao.py --tipo PF
+    python deduplicacao.py --tipo PJ --processos 4 --limiar 0.8 --saida candidatos.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import combinations, groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from database import COLUNAS_PESSOAS_FISICAS, COLUNAS_PESSOAS_JURIDICAS, obter_gerenciador
+
+# Pontuação mínima (0 a 1) para um par entrar no relatório.
+LIMIAR_PADRAO = 0.85
+
+# Blocos acima deste tamanho são comparados por vizinhança ordenada.
+MAX_BLOCO = 200
+JANELA = 10
+
+# Comparações aproximadas por tarefa enviada aos processos.
+PARES_POR_LOTE = 50_000
+
+# Palavras que não identificam a pessoa ou a empresa.
+PALAVRAS_IGNORADAS = {
+    "a", "da", "das", "de", "do", "dos", "e", "s", "sa", "ltda", "me", "epp",
+    "eireli", "cia",
+}
+
+# Pesos dos campos na pontuação (somam 1); contato ou raiz de CNPJ iguais
+# acrescentam `BONUS`.
+PESOS_PF = {"nome": 0.5, "data": 0.2, "endereco": 0.2, "local": 0.1}
+PESOS_PJ = {
+    "razao_social": 0.4, "representante": 0.2, "endereco": 0.2, "local": 0.1,
+    "nome_fantasia": 0.1,
+}
+BONUS = 0.1
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """Minúsculas, sem acentos nem pontuação, com espaços simples."""
+    if not texto:
+        return ""
+    sem_acentos = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return " ".join("".join(c if c.isalnum() else " " for c in sem_acentos.lower()).split())
+
+
+def tokens(texto: str) -> List[str]:
+    """Tokens significativos de um texto já normalizado."""
+    return [t for t in texto.split() if t not in PALAVRAS_IGNORADAS]
+
+
+def jaro_winkler(a: str, b: str) -> float:
+    """Similaridade de Jaro-Winkler entre dois textos (0 a 1)."""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+
+    alcance = max(len(a), len(b)) // 2 - 1
+    usados = [False] * len(b)
+    casados = []
+    for i, caractere in enumerate(a):
+        for j in range(max(0, i - alcance), min(i + alcance + 1, len(b))):
+            if not usados[j] and b[j] == caractere:
+                usados[j] = True
+                casados.append(caractere)
+                break
+
+    m = len(casados)
+    if not m:
+        return 0.0
+    em_b = [b[j] for j in range(len(b)) if usados[j]]
+    transposicoes = sum(x != y for x, y in zip(casados, em_b)) / 2
+    jaro = (m / len(a) + m / len(b) + (m - transposicoes) / m) / 3
+
+    prefixo = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefixo += 1
+    return jaro + prefixo * 0.1 * (1 - jaro)
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _semelhanca_data(a: str, b: str) -> float:
+    """1 para datas iguais; 0,8 para um dígito trocado ou dia e mês invertidos."""
+    if a == b:
+        return 1.0
+    if len(a) != len(b):
+        return 0.0
+    if sum(x != y for x, y in zip(a, b)) == 1 or (a[:2] == b[2:4] and a[2:4] == b[:2]
+                                                 and a[4:] == b[4:]):
+        return 0.8
+    return 0.0
+
+
+# --- Campos e chaves de bloqueio --------------------------------------------
+
+def _campos_pf(registro: Dict) -> list:
+    return [
+        normalizar(registro["nome"]),
+        "".join(filter(str.isdigit, registro["data_nascimento"] or "")),
+        sorted(set(normalizar(registro["endereco"]).split())),
+        normalizar(registro["cidade"]),
+        registro["uf"] or "",
+        "".join(filter(str.isdigit, registro["telefone"] or "")),
+        (registro["email"] or "").strip().lower(),
+    ]
+
+
+def _chaves_pf(campos: list) -> List[str]:
+    nome, data, _, _, uf = campos[:5]
+    partes = tokens(nome)
+    chaves = []
+    if partes:
+        chaves.append(f"n:{partes[0]}:{partes[-1]}")
+        if data:
+            chaves.append(f"s:{partes[-1]}:{data}")
+    if data:
+        chaves.append(f"d:{data}:{uf}")
+    return chaves
+
+
+def _campos_pj(registro: Dict) -> list:
+    return [
+        normalizar(registro["razao_social"]),
+        normalizar(registro["nome_fantasia"]),
+        normalizar(registro["representante_legal"]),
+        sorted(set(normalizar(registro["endereco"]).split())),
+        normalizar(registro["cidade"]),
+        registro["uf"] or "",
+        "".join(filter(str.isdigit, registro["telefone"] or "")),
+        (registro["email"] or "").strip().lower(),
+        registro["cnpj"][:8],
+    ]
+
+
+def _chaves_pj(campos: list) -> List[str]:
+    razao, _, representante, _, cidade, uf = campos[:6]
+    partes = tokens(razao)
+    chaves = [f"c:{campos[8]}"]
+    if partes:
+        chaves.append(f"r:{' '.join(sorted(partes[:2]))}")
+        chaves.append(f"u:{partes[0]}:{cidade}:{uf}")
+    pessoa = tokens(representante)
+    if pessoa:
+        chaves.append(f"p:{pessoa[0]}:{pessoa[-1]}:{uf}")
+    return chaves
+
+
+# --- Pontuação ----------------------------------------------------------------
+
+def _preparar(campos: str, indice_endereco: int) -> list:
+    """Decodifica os campos, com os tokens do endereço em um conjunto."""
+    campos = json.loads(campos)
+    campos[indice_endereco] = frozenset(campos[indice_endereco])
+    return campos
+
+
+def _pontuar_pf(a: list, b: list, limiar: float) -> float:
+    pontuacao = (
+        PESOS_PF["data"] * _semelhanca_data(a[1], b[1])
+        + PESOS_PF["endereco"] * _jaccard(a[2], b[2])
+        + PESOS_PF["local"] * (bool(a[4]) and a[3:5] == b[3:5])
+    )
+    if (a[5] and a[5] == b[5]) or (a[6] and a[6] == b[6]):
+        pontuacao += BONUS
+    # O nome é o campo mais caro: só é comparado se ainda puder atingir o limiar.
+    if pontuacao + PESOS_PF["nome"] < limiar:
+        return pontuacao
+    return min(1.0, pontuacao + PESOS_PF["nome"] * jaro_winkler(a[0], b[0]))
+
+
+def _pontuar_pj(a: list, b: list, limiar: float) -> float:
+    pontuacao = (
+        PESOS_PJ["endereco"] * _jaccard(a[3], b[3])
+        + PESOS_PJ["local"] * (bool(a[5]) and a[4:6] == b[4:6])
+    )
+    if (a[6] and a[6] == b[6]) or (a[7] and a[7] == b[7]) or a[8] == b[8]:
+        pontuacao += BONUS
+    # Nomes do mais ao menos pesado, parando quando o limiar ficar inalcançável.
+    restante = PESOS_PJ["razao_social"] + PESOS_PJ["representante"] + PESOS_PJ["nome_fantasia"]
+    for campo, indice in (("razao_social", 0), ("representante", 2), ("nome_fantasia", 1)):
+        if pontuacao + restante < limiar:
+            return pontuacao
+        restante -= PESOS_PJ[campo]
+        pontuacao += PESOS_PJ[campo] * jaro_winkler(a[indice], b[indice])
+    return min(1.0, pontuacao)
+
+
+def _pontuar_lote(tipo: str, limiar: float, max_bloco: int, janela: int,
+                  blocos: List[Tuple[str, List[Tuple[int, str]]]]) -> Tuple[List[tuple], int]:
+    """Compara os cadastros de cada bloco; retorna os pares acima do limiar."""
+    pontuar, indice_endereco = (_pontuar_pf, 2) if tipo == "PF" else (_pontuar_pj, 3)
+    candidatos = []
+    comparacoes = 0
+
+    for chave, membros in blocos:
+        registros = [(id_, _preparar(campos, indice_endereco)) for id_, campos in membros]
+        if len(registros) > max_bloco:
+            registros.sort(key=lambda registro: registro[1][0])
+            pares = (
+                (registros[i], registros[j])
+                for i in range(len(registros))
+                for j in range(i + 1, min(i + 1 + janela, len(registros)))
+            )
+        else:
+            pares = combinations(registros, 2)
+
+        for (id_a, a), (id_b, b) in pares:
+            comparacoes += 1
+            pontuacao = pontuar(a, b, limiar)
+            if pontuacao >= limiar:
+                candidatos.append((pontuacao, min(id_a, id_b), max(id_a, id_b), chave))
+
+    return candidatos, comparacoes
+
+
+# --- Execução -----------------------------------------------------------------
+
+def _indexar(db, tipo: str, conn: sqlite3.Connection, tamanho_lote: int) -> int:
+    """Grava os campos normalizados e as chaves de bloqueio no banco temporário."""
+    if tipo == "PF":
+        colunas, documento, nome = COLUNAS_PESSOAS_FISICAS, "cpf", "nome"
+        campos_de, chaves_de = _campos_pf, _chaves_pf
+    else:
+        colunas, documento, nome = COLUNAS_PESSOAS_JURIDICAS, "cnpj", "razao_social"
+        campos_de, chaves_de = _campos_pj, _chaves_pj
+
+    total = 0
+    for lote in db.iterar_clientes(tipo, tamanho_lote):
+        registros, chaves = [], []
+        for linha in lote:
+            registro = dict(zip(colunas, linha))
+            campos = campos_de(registro)
+            registros.append((registro["id"], registro[documento], registro[nome],
+                              json.dumps(campos, ensure_ascii=False)))
+            chaves.extend((chave, registro["id"]) for chave in chaves_de(campos))
+        with conn:
+            conn.executemany("INSERT INTO registros VALUES (?, ?, ?, ?)", registros)
+            conn.executemany("INSERT INTO chaves VALUES (?, ?)", chaves)
+        total += len(lote)
+    return total
+
+
+def _blocos(conn: sqlite3.Connection) -> Iterator[Tuple[str, List[Tuple[int, str]]]]:
+    """Blocos com mais de um cadastro, lidos em ordem de chave."""
+    cursor = conn.execute("""
+        SELECT c.chave, r.id, r.campos
+        FROM chaves c JOIN registros r ON r.id = c.id
+        ORDER BY c.chave
+    """)
+    for chave, linhas in groupby(cursor, key=itemgetter(0)):
+        membros = [(id_, campos) for _, id_, campos in linhas]
+        if len(membros) > 1:
+            yield chave, membros
+
+
+def _lotes(blocos, max_bloco: int, janela: int) -> Iterator[list]:
+    """Agrupa blocos em tarefas de ~`PARES_POR_LOTE` comparações."""
+    lote, pares = [], 0
+    for bloco in blocos:
+        tamanho = len(bloco[1])
+        lote.append(bloco)
+        pares += tamanho * janela if tamanho > max_bloco else tamanho * (tamanho - 1) // 2
+        if pares >= PARES_POR_LOTE:
+            yield lote
+            lote, pares = [], 0
+    if lote:
+        yield lote
+
+
+def _executar(funcao, lotes, processos: int) -> Iterator:
+    """Aplica `funcao` aos lotes, em paralelo, sem enfileirar todos de uma vez."""
+    if processos <= 1:
+        for lote in lotes:
+            yield funcao(lote)
+        return
+
+    with ProcessPoolExecutor(processos) as executor:
+        pendentes = deque()
+        for lote in lotes:
+            pendentes.append(executor.submit(funcao, lote))
+            if len(pendentes) >= 2 * processos:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+def detectar_duplicados(db=None, tipo: str = "PF", limiar: float = LIMIAR_PADRAO,
+                        processos: int = 1, max_bloco: int = MAX_BLOCO, janela: int = JANELA,
+                        limite: Optional[int] = None, tamanho_lote: int = 5000) -> Dict:
+    """Procura cadastros ativos ('PF' ou 'PJ') que parecem ser o mesmo cliente.
+
+    Retorna as estatísticas da execução e os `candidatos`, do par mais
+    parecido para o menos parecido (no máximo `limite`).
+    """
+    db = db or obter_gerenciador()
+    inicio = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        conn = sqlite3.connect(os.path.join(diretorio, "blocos.db"))
+        try:
+            conn.execute("PRAGMA journal_mode = OFF")
+            conn.execute("PRAGMA synchronous = OFF")
+            conn.execute("""CREATE TABLE registros (
+                id INTEGER PRIMARY KEY, documento TEXT, nome TEXT, campos TEXT)""")
+            conn.execute("CREATE TABLE chaves (chave TEXT, id INTEGER)")
+
+            total = _indexar(db, tipo, conn, tamanho_lote)
+            conn.execute("CREATE INDEX idx_chaves ON chaves (chave)")
+
+            # Um par pode aparecer em vários blocos: fica a maior pontuação.
+            pares: Dict[Tuple[int, int], list] = {}
+            comparacoes = 0
+            funcao = partial(_pontuar_lote, tipo, limiar, max_bloco, janela)
+            for candidatos, feitas in _executar(
+                funcao, _lotes(_blocos(conn), max_bloco, janela), processos
+            ):
+                comparacoes += feitas
+                for pontuacao, id_a, id_b, chave in candidatos:
+                    par = pares.setdefault((id_a, id_b), [pontuacao, []])
+                    par[0] = max(par[0], pontuacao)
+                    par[1].append(chave)
+
+            ranking = sorted(pares.items(), key=lambda item: (-item[1][0], item[0]))
+            ranking = ranking[:limite] if limite is not None else ranking
+
+            ids = list({id_ for par, _ in ranking for id_ in par})
+            cadastros = {}
+            for i in range(0, len(ids), 500):
+                parte = ids[i:i + 500]
+                cadastros.update(
+                    (id_, (documento, nome)) for id_, documento, nome in conn.execute(
+                        f"SELECT id, documento, nome FROM registros "
+                        f"WHERE id IN ({', '.join('?' * len(parte))})", parte
+                    )
+                )
+        finally:
+            conn.close()
+
+    candidatos = [
+        {
+            "pontuacao": round(pontuacao, 4),
+            "id_a": id_a, "documento_a": cadastros[id_a][0], "nome_a": cadastros[id_a][1],
+            "id_b": id_b, "documento_b": cadastros[id_b][0], "nome_b": cadastros[id_b][1],
+            "chaves": " ".join(sorted(chaves)),
+        }
+        for (id_a, id_b), (pontuacao, chaves) in ranking
+    ]
+    return {
+        "tipo": tipo,
+        "registros": total,
+        "comparacoes": comparacoes,
+        "duracao_s": time.perf_counter() - inicio,
+        "candidatos": candidatos,
+    }
+
+
+def imprimir_relatorio(relatorio: Dict, linhas: int = 20):
+    """Mostra os pares mais parecidos."""
+    print(f"\n🔎 {relatorio['registros']} cadastro(s) {relatorio['tipo']} — "
+          f"{relatorio['comparacoes']} comparações em {relatorio['duracao_s']:.1f} s — "
+          f"{len(relatorio['candidatos'])} par(es) suspeito(s)")
+    for candidato in relatorio["candidatos"][:linhas]:
+        print(f"  {candidato['pontuacao']:.3f}  {candidato['documento_a']} "
+              f"{candidato['nome_a']:<35.35} ↔ {candidato['documento_b']} "
+              f"{candidato['nome_b']:<35.35}")
+
+
+def main():
+    """Ponto de entrada da detecção de duplicados."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tipo", choices=["PF", "PJ"], default="PF")
+    parser.add_argument("--banco", help="caminho do banco (padrão: banco_clientes.db)")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_PADRAO)
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-bloco", type=int, default=MAX_BLOCO)
+    parser.add_argument("--janela", type=int, default=JANELA)
+    parser.add_argument("--limite", type=int, help="máximo de pares no relatório")
+    parser.add_argument("--saida", help="arquivo CSV com todos os pares")
+    args = parser.parse_args()
+
+    relatorio = detectar_duplicados(
+        obter_gerenciador(args.banco), args.tipo, args.limiar, args.processos,
+        args.max_bloco, args.janela, args.limite,
+    )
+    imprimir_relatorio(relatorio)
+
+    if args.saida:
+        with open(args.saida, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=[
+                "pontuacao", "id_a", "documento_a", "nome_a",
+                "id_b", "documento_b", "nome_b", "chaves",
+            ])
+            escritor.writeheader()
+            escritor.writerows(relatorio["candidatos"])
+        print(f"📄 Relatório salvo em {Path(args.saida)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,46 @@
+import bisect
 import functools
 import textwrap
 from abc import ABC, abstractclassmethod, abstractproperty
 from datetime import UTC, datetime
 from pathlib import Path
 
+from idempotencia import AUSENTE, cache_idempotencia
+from limites import motor_limites
+from metricas import metricas
+from renderizacao import Modelo, exibir
+
 ROOT_PATH = Path(__file__).parent
 
+# Transações por página do extrato.
+EXTRATO_POR_PAGINA = 20
+
+# Tipos de lançamento que aumentam o saldo; os demais são débitos.
+TIPOS_CREDITO = ("Deposito", "Juros")
+
+# Modelos das listagens, preparados uma única vez.
+FICHA_CONTA = Modelo(textwrap.dedent("""\
+    Agência:\t{agencia}
+    Número:\t\t{numero}
+    Titular:\t{titular}
+    Saldo:\t\tR$ {saldo:.2f}
+"""))
+
+FICHA_CLIENTE = Modelo("=" * 100 + "\n" + textwrap.dedent("""\
+    Nome:\t\t{nome}
+    Data Nasc.:\t{data_nascimento}
+    CPF:\t\t{cpf}
+    Endereço:\t{endereco}
+
+"""))
+
+FICHA_EMPRESA = Modelo("=" * 100 + "\n" + textwrap.dedent("""\
+    Razão Social:\t{razao_social}
+    CNPJ:\t\t{cnpj}
+    Endereço:\t{endereco}
+
+"""))
+
 
 class ContaIterador:
     """Iterador personalizado para contas do banco."""
@@ -20,12 +55,12 @@ class ContaIterador:
     def __next__(self):
         try:
             conta = self.contas[self._index]
-            return f"""\
-            Agência:\t{conta.agencia}
-            Número:\t\t{conta.numero}
-            Titular:\t{conta.cliente.nome}
-            Saldo:\t\tR$ {conta.saldo:.2f}
-            """
+            return FICHA_CONTA(
+                agencia=conta.agencia,
+                numero=conta.numero,
+                titular=conta.cliente.nome,
+                saldo=conta.saldo,
+            )
         except IndexError:
             raise StopIteration
         finally:
@@ -40,21 +75,58 @@ class Cliente:
         self.contas = []
 
     def realizar_transacao(self, conta, transacao):
-        """Executa uma transação na conta do cliente com limite diário."""
-        # Verificar limite de 10 transações por dia.
-        data_hoje = datetime.now().strftime("%d/%m/%Y")
-        transacoes_hoje = list(conta.historico.transacoes_do_dia(data_hoje))
+        """Executa uma transação na conta do cliente respeitando os limites.
 
-        if len(transacoes_hoje) >= 10:
-            print(
-                "\nOperação falhou! Você excedeu o número de transações permitidas "
-                f"para hoje ({len(transacoes_hoje)}/10)."
-            )
-            print("Tente novamente amanhã.")
-            return False
+        Os limites (por padrão, 10 transações por dia) vêm da política da
+        conta no `motor_limites`, avaliada em tempo constante. Transações com
+        `chave_idempotencia` já vista na conta não são reaplicadas: recebem em
+        `transacao.resultado` o resultado original (ok, saldo e motivo). Uma
+        chave já usada por outro tipo ou valor de transação é recusada.
+        """
+        tipo = transacao.__class__.__name__
+        chave = getattr(transacao, "chave_idempotencia", None)
+        if chave is not None:
+            escopo = (conta.agencia, conta.numero, chave)
+            original = cache_idempotencia.obter(escopo)
+            if original is not AUSENTE:
+                if (original["tipo"], original["valor"]) != (tipo, transacao.valor):
+                    transacao.conflitante = True
+                    metricas.incrementar("banco_idempotencia_conflitos_total", tipo=tipo)
+                    print("\nOperação falhou! Chave já usada em outra transação.")
+                    return False
+
+                # Repetição de uma transação já processada: devolve o resultado original.
+                transacao.repetida = True
+                transacao.resultado = dict(original)
+                metricas.incrementar("banco_transacoes_repetidas_total", tipo=tipo)
+                print("\n=== Transação já processada; o resultado original foi mantido. ===")
+                return original["ok"]
+
+        violacao, sucesso_transacao = motor_limites.aplicar(
+            conta, transacao, lambda: transacao.registrar(conta)
+        )
 
-        transacao.registrar(conta)
-        return True
+        if violacao:
+            regra, mensagem = violacao
+            metricas.incrementar("banco_limite_diario_rejeicoes_total", regra=regra.nome)
+            print(f"\nOperação falhou! {mensagem}")
+
+        if violacao:
+            motivo = violacao[0].nome
+        else:
+            motivo = None if sucesso_transacao else transacao.motivo_recusa(conta)
+
+        transacao.resultado = {
+            "tipo": tipo,
+            "valor": transacao.valor,
+            "ok": sucesso_transacao,
+            "saldo": conta.saldo,
+            "motivo": motivo,
+        }
+        if chave is not None:
+            # Cópia: alterar a resposta devolvida não altera a guardada.
+            cache_idempotencia.guardar(escopo, dict(transacao.resultado))
+        return sucesso_transacao
 
     def adicionar_conta(self, conta):
         """Adiciona uma conta à lista de contas do cliente."""
@@ -64,30 +136,63 @@ class Cliente:
 class PessoaFisica(Cliente):
     """Classe para clientes pessoa física."""
 
+    tipo = "PF"
+
     def __init__(self, nome, data_nascimento, cpf, endereco):
         super().__init__(endereco)
         self.nome = nome
         self.data_nascimento = data_nascimento
         self.cpf = cpf
 
+    @property
+    def documento(self):
+        return self.cpf
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}: ('{self.nome}', '{self.cpf}')>"
 
 
+class PessoaJuridica(Cliente):
+    """Classe para clientes pessoa jurídica."""
+
+    tipo = "PJ"
+
+    def __init__(self, razao_social, cnpj, endereco, nome_fantasia=None,
+                 representante_legal=None):
+        super().__init__(endereco)
+        self.razao_social = razao_social
+        self.cnpj = cnpj
+        self.nome_fantasia = nome_fantasia
+        self.representante_legal = representante_legal
+
+    @property
+    def nome(self):
+        return self.nome_fantasia or self.razao_social
+
+    @property
+    def documento(self):
+        return self.cnpj
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}: ('{self.razao_social}', '{self.cnpj}')>"
+
+
 class Conta:
     """Classe base para contas bancárias."""
 
-    def __init__(self, numero, cliente):
+    def __init__(self, numero, cliente, agencia="0001"):
         self._saldo = 0
         self._numero = numero
-        self._agencia = "0001"
+        self._agencia = agencia
         self._cliente = cliente
         self._historico = Historico()
+        # Data ("dd/mm/aaaa") do último fechamento diário aplicado.
+        self.ultimo_fechamento = None
 
     @classmethod
-    def nova_conta(cls, cliente, numero):
+    def nova_conta(cls, cliente, numero, agencia="0001"):
         """Método de classe para criar uma nova conta."""
-        return cls(numero, cliente)
+        return cls(numero, cliente, agencia)
 
     @property
     def saldo(self):
@@ -137,18 +242,35 @@ class Conta:
             print("\nOperação falhou! O valor informado é inválido.")
             return False
 
+    def aplicar_lancamentos(self, lancamentos, data, referencia=None):
+        """Aplica lançamentos do banco (juros, tarifas) sem saída no console.
+
+        `lancamentos` são pares `(tipo, valor)`, com valor positivo; tipos
+        fora de `TIPOS_CREDITO` são débitos. Não passam pelos limites.
+        `data` é o momento do lançamento e mantém o histórico em ordem;
+        `referencia` ("dd/mm/aaaa"), se informada, é o dia a que ele se refere.
+        """
+        entradas = []
+        for tipo, valor in lancamentos:
+            self._saldo += valor if tipo in TIPOS_CREDITO else -valor
+            entrada = {"tipo": tipo, "valor": valor, "data": data, "saldo": self._saldo}
+            if referencia is not None:
+                entrada["referencia"] = referencia
+            entradas.append(entrada)
+        self._historico.adicionar_lancamentos(entradas)
+
 
 class ContaCorrente(Conta):
     """Classe para contas correntes com limite de saque."""
 
-    def __init__(self, numero, cliente, limite=500):
-        super().__init__(numero, cliente)
+    def __init__(self, numero, cliente, limite=500, agencia="0001"):
+        super().__init__(numero, cliente, agencia)
         self._limite = limite
 
     @classmethod
-    def nova_conta(cls, cliente, numero, limite=500):
+    def nova_conta(cls, cliente, numero, limite=500, agencia="0001"):
         """Método de classe para criar uma nova conta corrente."""
-        return cls(numero, cliente, limite)
+        return cls(numero, cliente, limite, agencia)
 
     def sacar(self, valor):
         """Realiza saque com verificação de limite de valor."""
@@ -176,21 +298,96 @@ class Historico:
 
     def __init__(self):
         self._transacoes = []
+        # Linhas do extrato já formatadas, por posição no histórico.
+        self._linhas = {}
 
     @property
     def transacoes(self):
         return self._transacoes
 
-    def adicionar_transacao(self, transacao):
-        """Adiciona uma transação ao histórico."""
+    def adicionar_transacao(self, transacao, saldo=None):
+        """Adiciona uma transação ao histórico.
+
+        `saldo` é o saldo da conta após a transação, usado pelo extrato.
+        """
         self._transacoes.append(
             {
                 "tipo": transacao.__class__.__name__,
                 "valor": transacao.valor,
                 "data": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+                "saldo": saldo,
             }
         )
 
+    def adicionar_lancamentos(self, entradas):
+        """Acrescenta entradas já montadas (com `tipo`, `valor`, `data` e `saldo`)."""
+        self._transacoes.extend(entradas)
+
+    def pagina_extrato(self, cursor=None, limite=EXTRATO_POR_PAGINA, desde=None):
+        """Retorna uma página do extrato a partir de um cursor.
+
+        Sem `desde`, as transações vêm da mais recente para a mais antiga; com
+        `desde` ("dd/mm/aaaa"), em ordem cronológica a partir daquela data. O
+        `cursor` é o `proximo` da página anterior (None na última página).
+        `saldo_anterior` é o saldo antes da transação mais antiga da página.
+        O histórico só cresce, então as linhas formatadas ficam em cache.
+        """
+        total = len(self._transacoes)
+
+        if desde is not None:
+            inicio = self._posicao_da_data(desde) if cursor is None else cursor
+            fim = min(inicio + limite, total)
+            posicoes = range(inicio, fim)
+            proximo = fim if fim < total else None
+        else:
+            fim = total if cursor is None else cursor
+            inicio = max(fim - limite, 0)
+            posicoes = range(fim - 1, inicio - 1, -1)
+            proximo = inicio or None
+
+        return {
+            "linhas": [self._linha_extrato(posicao) for posicao in posicoes],
+            "saldo_anterior": self._saldo_antes(inicio),
+            "proximo": proximo,
+            "total": total,
+        }
+
+    def _linha_extrato(self, posicao):
+        linha = self._linhas.get(posicao)
+        if linha is None:
+            transacao = self._transacoes[posicao]
+            tipo_emoji = "📈" if transacao["tipo"] in TIPOS_CREDITO else "📉"
+            linha = (
+                f"{posicao + 1:2d}. {tipo_emoji} {transacao['tipo']}: "
+                f"R$ {transacao['valor']:>8.2f} - {transacao['data']}"
+            )
+            if "referencia" in transacao:
+                linha += f" (ref. {transacao['referencia']})"
+            self._linhas[posicao] = linha
+        return linha
+
+    def _saldo_antes(self, posicao):
+        """Saldo da conta antes da transação na `posicao`."""
+        if posicao == 0:
+            return 0.0
+        saldo = self._transacoes[posicao - 1].get("saldo")
+        if saldo is not None:
+            return saldo
+        # Transações registradas sem saldo: soma desde a abertura da conta.
+        return sum(
+            t["valor"] if t["tipo"] in TIPOS_CREDITO else -t["valor"]
+            for t in self._transacoes[:posicao]
+        )
+
+    def _posicao_da_data(self, data):
+        """Posição da primeira transação em `data` ou depois (busca binária)."""
+        alvo = datetime.strptime(data, "%d/%m/%Y")
+        return bisect.bisect_left(
+            self._transacoes,
+            alvo,
+            key=lambda t: datetime.strptime(t["data"].split()[0], "%d/%m/%Y"),
+        )
+
     def gerar_relatorio(self, tipo_transacao=None):
         """Gerador que permite iterar sobre as transações,
         opcionalmente filtradas por tipo."""
@@ -223,12 +420,22 @@ class Transacao(ABC):
     def registrar(self, conta):
         pass
 
+    def motivo_recusa(self, conta):
+        """Motivo pelo qual a conta recusou a transação."""
+        if self.valor <= 0:
+            return "valor_invalido"
+        return "transacao_recusada"
+
 
 class Saque(Transacao):
     """Classe para transações de saque."""
 
-    def __init__(self, valor):
+    def __init__(self, valor, chave_idempotencia=None):
         self._valor = valor
+        self.chave_idempotencia = chave_idempotencia
+        self.repetida = False
+        self.conflitante = False
+        self.resultado = None
 
     @property
     def valor(self):
@@ -239,14 +446,33 @@ class Saque(Transacao):
         sucesso_transacao = conta.sacar(self.valor)
 
         if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+            conta.historico.adicionar_transacao(self, conta.saldo)
+
+        metricas.incrementar(
+            "banco_transacoes_total",
+            tipo=self.__class__.__name__,
+            resultado="sucesso" if sucesso_transacao else "falha",
+        )
+        return sucesso_transacao
+
+    def motivo_recusa(self, conta):
+        """Motivo pelo qual a conta recusou o saque."""
+        if self.valor <= 0:
+            return "valor_invalido"
+        if self.valor > getattr(conta, "_limite", self.valor):
+            return "limite_saque"
+        return "saldo_insuficiente"
 
 
 class Deposito(Transacao):
     """Classe para transações de depósito."""
 
-    def __init__(self, valor):
+    def __init__(self, valor, chave_idempotencia=None):
         self._valor = valor
+        self.chave_idempotencia = chave_idempotencia
+        self.repetida = False
+        self.conflitante = False
+        self.resultado = None
 
     @property
     def valor(self):
@@ -257,7 +483,14 @@ class Deposito(Transacao):
         sucesso_transacao = conta.depositar(self.valor)
 
         if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+            conta.historico.adicionar_transacao(self, conta.saldo)
+
+        metricas.incrementar(
+            "banco_transacoes_total",
+            tipo=self.__class__.__name__,
+            resultado="sucesso" if sucesso_transacao else "falha",
+        )
+        return sucesso_transacao
 
 
 def log_transacao(func):
@@ -312,8 +545,12 @@ def menu():
 
 
 def filtrar_cliente(cpf, clientes):
-    """Filtra cliente por CPF."""
+    """Filtra cliente por CPF (ou CNPJ, no repositório de clientes)."""
     cpf_numeros = "".join(filter(str.isdigit, cpf))
+    if hasattr(clientes, "obter"):
+        # Repositório: consulta o cadastro pelo documento, sem percorrê-lo.
+        return clientes.obter(cpf_numeros)
+
     clientes_filtrados = [cliente for cliente in clientes if cliente.cpf == cpf_numeros]
     return clientes_filtrados[0] if clientes_filtrados else None
 
@@ -387,21 +624,27 @@ def exibir_extrato(clientes):
     print(f"Data/Hora do extrato: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
     print("-" * 58)
 
-    transacoes = conta.historico.transacoes
+    pagina = conta.historico.pagina_extrato(limite=EXTRATO_POR_PAGINA)
 
-    if not transacoes:
+    if not pagina["linhas"]:
         print("Não foram realizadas movimentações.")
-    else:
-        for i, transacao in enumerate(transacoes, 1):
-            tipo_emoji = "📈" if transacao["tipo"] == "Deposito" else "📉"
-            print(
-                f"{i:2d}. {tipo_emoji} {transacao['tipo']}: "
-                f"R$ {transacao['valor']:>8.2f} - {transacao['data']}"
-            )
+
+    # Da transação mais recente para a mais antiga, uma página por vez.
+    while pagina["linhas"]:
+        print("\n".join(pagina["linhas"]))
+        print(f"Saldo anterior: R$ {pagina['saldo_anterior']:>8.2f}")
+
+        if pagina["proximo"] is None:
+            break
+        if input("[M]ais antigas / [S]air: ").strip().lower() != "m":
+            break
+        pagina = conta.historico.pagina_extrato(pagina["proximo"], EXTRATO_POR_PAGINA)
 
     print("-" * 58)
     print(f"Saldo atual: R$ {conta.saldo:>8.2f}")
-    print(f"Transações hoje: {len(list(conta.historico.transacoes_do_dia()))}/10")
+    uso = motor_limites.uso(conta)
+    if uso:
+        print(uso)
     print("=" * 58)
 
 
@@ -434,7 +677,9 @@ def criar_cliente(clientes):
         nome=nome, data_nascimento=data_nascimento, cpf=cpf_numeros, endereco=endereco
     )
 
-    clientes.append(cliente)
+    # O repositório de clientes recusa (False) documentos inválidos.
+    if clientes.append(cliente) is False:
+        return
 
     print("\n=== Cliente criado com sucesso! ===")
 
@@ -465,9 +710,7 @@ def listar_contas(contas):
     print("\n" + "=" * 60 + " CONTAS CADASTRADAS " + "=" * 60)
 
     # Usando o iterador personalizado.
-    for dados_conta in ContaIterador(contas):
-        print("=" * 100)
-        print(textwrap.dedent(dados_conta))
+    exibir("=" * 100 + "\n" + dados_conta + "\n" for dados_conta in ContaIterador(contas))
 
 
 def relatorio_transacoes(clientes):
@@ -543,7 +786,23 @@ def listar_clientes(clientes):
         print("\nNenhum cliente cadastrado.")
         return
 
+    exibir(_fichas_clientes(clientes))
+
+
+def _fichas_clientes(clientes):
+    """Renderiza as fichas dos clientes para `listar_clientes`."""
     for cliente in clientes:
+        # Pelo tipo, não pela classe: `python desafio.py` tem sua própria
+        # cópia das classes, diferente da usada pelo repositório.
+        if cliente.tipo == "PJ":
+            cnpj = cliente.cnpj
+            yield FICHA_EMPRESA(
+                razao_social=cliente.razao_social,
+                cnpj=f"{cnpj[:2]}.{cnpj[2:5]}.{cnpj[5:8]}/{cnpj[8:12]}-{cnpj[12:]}",
+                endereco=cliente.endereco,
+            )
+            continue
+
         # Formatação do CPF: XXX.XXX.XXX-XX.
         cpf_formatado = (
             f"{cliente.cpf[:3]}.{cliente.cpf[3:6]}.{cliente.cpf[6:9]}-{cliente.cpf[9:]}"
@@ -556,19 +815,20 @@ def listar_clientes(clientes):
                 f"{data_formatada[:2]}/{data_formatada[2:4]}/{data_formatada[4:]}"
             )
 
-        linha = f"""\
-            Nome:\t\t{cliente.nome}
-            Data Nasc.:\t{data_formatada}
-            CPF:\t\t{cpf_formatado}
-            Endereço:\t{cliente.endereco}
-        """
-        print("=" * 100)
-        print(textwrap.dedent(linha))
+        yield FICHA_CLIENTE(
+            nome=cliente.nome,
+            data_nascimento=data_formatada,
+            cpf=cpf_formatado,
+            endereco=cliente.endereco,
+        )
 
 
 def main():
     """Função principal do sistema bancário POO."""
-    clientes = []
+    from repositorio import RepositorioClientes
+
+    # Clientes do cadastro (banco_clientes.db), carregados sob demanda.
+    clientes = RepositorioClientes()
     contas = []
 
     while True:
@@ -622,4 +882,45 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import atexit
+    import os
+    import sys
+
+    # Instrumentação opcional: BANCO_INSTRUMENTACAO=latencias.json.
+    arquivo_latencias = os.environ.get("BANCO_INSTRUMENTACAO")
+    if arquivo_latencias:
+        from instrumentacao import instrumentacao
+
+        instrumentacao.ativar()
+        atexit.register(instrumentacao.salvar, arquivo_latencias)
+
+    # Políticas de limite por conta: BANCO_LIMITES=limites.json.
+    arquivo_limites = os.environ.get("BANCO_LIMITES")
+    if arquivo_limites:
+        motor_limites.carregar(arquivo_limites)
+
+    # Exportação opcional de métricas: BANCO_METRICAS_ARQUIVO=banco.prom
+    # e/ou BANCO_METRICAS_PORTA=9101, a cada BANCO_METRICAS_INTERVALO segundos.
+    arquivo_metricas = os.environ.get("BANCO_METRICAS_ARQUIVO")
+    porta_metricas = os.environ.get("BANCO_METRICAS_PORTA")
+    if arquivo_metricas or porta_metricas:
+        from metricas import ExportadorMetricas
+
+        exportador = ExportadorMetricas(
+            arquivo=arquivo_metricas,
+            porta=int(porta_metricas) if porta_metricas else None,
+            intervalo=float(os.environ.get("BANCO_METRICAS_INTERVALO", "15")),
+        ).iniciar()
+        atexit.register(exportador.parar)
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--lote":
+        # Modo não interativo: python desafio.py --lote operacoes.jsonl [-s].
+        from lote import main as executar_lote
+
+        executar_lote(sys.argv[2:])
+    else:
+        # O menu roda sobre o módulo importado, o mesmo usado pelo repositório
+        # e alterado pela instrumentação, e não sobre esta cópia `__main__`.
+        import desafio
+
+        desafio.main()
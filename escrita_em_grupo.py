@@ -0,0 +1,216 @@
+"""
+Escrita em grupo (group commit) das inserções no banco.
+As linhas são enfileiradas e uma única thread as grava em transações agrupadas.
+
+Cada commit do SQLite custa uma sincronização com o disco (fsync). Aqui as
+inserções validadas entram em uma fila, e a thread de escrita grava em uma
+só transação tudo o que chegou até `max_lote` linhas ou `max_espera_ms`
+milissegundos após a primeira. Cada linha roda em um SAVEPOINT próprio:
+uma violação de UNIQUE recusa apenas aquela linha, não o grupo.
+
+Durabilidade: o futuro de uma linha só é resolvido depois do COMMIT do seu
+grupo. Linhas ainda na fila se perdem se o processo terminar antes disso;
+quem precisa da garantia deve aguardar o futuro. Após o COMMIT, o que
+sobrevive a uma falha depende de `durabilidade` (ver `DURABILIDADES`).
+Um erro inesperado em um grupo resolve suas linhas pendentes com `ERRO`, e
+a thread segue para o grupo seguinte.
+"""
+
+import contextlib
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, ContextManager, List, Optional, Tuple
+
+from metricas import metricas
+
+# Resultado de cada linha enfileirada.
+INSERIDO = "inserido"
+DUPLICADO = "duplicado"
+INVALIDO = "invalido"
+ERRO = "erro"
+
+# Valor de `PRAGMA synchronous` (em modo WAL) para cada durabilidade:
+#   completa  — o grupo é sincronizado com o disco antes de confirmado;
+#               sobrevive a queda de energia.
+#   normal    — sobrevive ao fim do processo; uma queda de energia pode
+#               desfazer os últimos grupos confirmados.
+#   desligada — sem sincronização; o sistema operacional decide quando
+#               gravar (apenas para cargas que podem ser refeitas).
+DURABILIDADES = {"completa": "FULL", "normal": "NORMAL", "desligada": "OFF"}
+
+# Marca de fim da fila.
+_FIM = object()
+
+Linha = Tuple[str, tuple, Future, str]
+
+
+class EscritorEmGrupo:
+    """Thread de escrita que grava as linhas enfileiradas em grupos.
+
+    `conectar` abre a conexão usada pela thread; `apos_commit` recebe os
+    `(comando, linhas)` efetivamente gravados em cada grupo;
+    `registrar_erro(operacao, erro)` contabiliza os erros tratados; e
+    `trava()`, se informada, devolve o gerenciador de contexto mantido do
+    BEGIN até o fim de `apos_commit` (a ordem dos commits se preserva nele).
+    """
+
+    def __init__(self, conectar: Callable[[], sqlite3.Connection],
+                 apos_commit: Optional[Callable[[List[Tuple[str, List[tuple]]]], None]] = None,
+                 registrar_erro: Optional[Callable[[str, sqlite3.Error], None]] = None,
+                 max_lote: int = 500, max_espera_ms: float = 5.0,
+                 durabilidade: str = "completa", capacidade_fila: int = 10_000,
+                 trava: Optional[Callable[[], ContextManager]] = None):
+        if durabilidade not in DURABILIDADES:
+            raise ValueError(f"Durabilidade inválida: {durabilidade!r}")
+
+        self.max_lote = max_lote
+        self.max_espera = max_espera_ms / 1000
+        self.durabilidade = durabilidade
+        self._conectar = conectar
+        self._apos_commit = apos_commit
+        self._registrar_erro = registrar_erro or (lambda operacao, erro: None)
+        self._trava = trava or contextlib.nullcontext
+        # Fila limitada: produtores mais rápidos que o disco aguardam vaga.
+        self._fila: "queue.Queue" = queue.Queue(capacidade_fila)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._thread = threading.Thread(target=self._laco, name="escrita-em-grupo", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def resolvido(resultado: str, callback: Optional[Callable[[str], None]] = None) -> Future:
+        """Futuro já resolvido (linhas recusadas antes de entrar na fila)."""
+        futuro = Future()
+        futuro.set_result(resultado)
+        if callback:
+            callback(resultado)
+        return futuro
+
+    def enfileirar(self, comando: str, linha: tuple, operacao: str,
+                   callback: Optional[Callable[[str], None]] = None) -> Future:
+        """Enfileira uma linha; o futuro recebe `INSERIDO`, `DUPLICADO` ou `ERRO`.
+
+        O `callback`, se informado, é chamado com o resultado na thread de escrita.
+        """
+        if not self._thread.is_alive():
+            raise RuntimeError("A escrita em grupo já foi encerrada")
+        futuro = Future()
+        if callback:
+            futuro.add_done_callback(lambda f: callback(f.result()))
+        self._fila.put((comando, linha, futuro, operacao))
+        return futuro
+
+    def aguardar(self):
+        """Bloqueia até que todas as linhas enfileiradas estejam gravadas."""
+        self._fila.join()
+
+    def encerrar(self):
+        """Grava o que está na fila e finaliza a thread de escrita."""
+        if self._thread.is_alive():
+            self._fila.put(_FIM)
+            self._thread.join()
+
+    def _laco(self):
+        try:
+            while True:
+                grupo, fim = self._proximo_grupo()
+                try:
+                    if grupo:
+                        self._gravar(grupo)
+                except Exception:
+                    self._descartar(grupo)
+                finally:
+                    for _ in range(len(grupo) + fim):
+                        self._fila.task_done()
+                if fim:
+                    break
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+
+    def _proximo_grupo(self) -> Tuple[List[Linha], bool]:
+        """Aguarda a primeira linha e junta as que chegarem até o prazo."""
+        item = self._fila.get()
+        if item is _FIM:
+            return [], True
+
+        grupo = [item]
+        prazo = time.monotonic() + self.max_espera
+        while len(grupo) < self.max_lote:
+            restante = prazo - time.monotonic()
+            try:
+                # Vencido o prazo, ainda leva o que já está na fila.
+                item = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is _FIM:
+                return grupo, True
+            grupo.append(item)
+        return grupo, False
+
+    def _abrir(self) -> sqlite3.Connection:
+        conn = self._conectar()
+        conn.isolation_level = None  # BEGIN/COMMIT/SAVEPOINT explícitos.
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA synchronous = {DURABILIDADES[self.durabilidade]}")
+        return conn
+
+    def _gravar(self, grupo: List[Linha]):
+        """Grava o grupo em uma transação, com um SAVEPOINT por linha."""
+        resultados = []
+        gravados: List[Tuple[str, List[tuple]]] = []
+        with self._trava():
+            try:
+                if self._conn is None:
+                    self._conn = self._abrir()
+                conn = self._conn
+                conn.execute("BEGIN IMMEDIATE")
+                for comando, linha, _, operacao in grupo:
+                    conn.execute("SAVEPOINT linha")
+                    try:
+                        conn.execute(comando, linha)
+                        resultados.append(INSERIDO)
+                        if gravados and gravados[-1][0] == comando:
+                            gravados[-1][1].append(linha)
+                        else:
+                            gravados.append((comando, [linha]))
+                    except sqlite3.Error as e:
+                        conn.execute("ROLLBACK TO linha")
+                        self._registrar_erro(operacao, e)
+                        duplicado = isinstance(e, sqlite3.IntegrityError) and "UNIQUE" in str(e)
+                        resultados.append(DUPLICADO if duplicado else ERRO)
+                    conn.execute("RELEASE linha")
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                # Falha da transação (banco bloqueado, disco...): nada do grupo ficou gravado.
+                if self._conn is not None and self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                self._registrar_erro("escrita_em_grupo", e)
+                resultados = [ERRO] * len(grupo)
+                gravados = []
+
+            if gravados and self._apos_commit:
+                self._apos_commit(gravados)
+
+        metricas.incrementar("banco_escrita_grupos_total")
+        for resultado in resultados:
+            metricas.incrementar("banco_escrita_linhas_total", resultado=resultado)
+
+        for (_, _, futuro, _), resultado in zip(grupo, resultados):
+            futuro.set_result(resultado)
+
+    def _descartar(self, grupo: List[Linha]):
+        """Desfaz a transação aberta e resolve com `ERRO` as linhas pendentes."""
+        if self._conn is not None and self._conn.in_transaction:
+            try:
+                self._conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                # Conexão inutilizada: o próximo grupo abre outra.
+                self._conn.close()
+                self._conn = None
+        for _, _, futuro, _ in grupo:
+            if not futuro.done():
+                metricas.incrementar("banco_escrita_linhas_total", resultado=ERRO)
+                futuro.set_result(ERRO)
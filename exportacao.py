@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Exportação do cadastro de clientes para análise
+Lê o SQLite em lotes (`fetchmany`) e grava CSV ou um formato colunar binário
+
+Formato colunar (`.bcol`):
+    b"BCOL0001" | tamanho do cabeçalho (uint64 LE) | cabeçalho JSON | seções
+
+Cada coluna tem duas seções alinhadas em 8 bytes: a tabela de offsets
+(linhas + 1 inteiros uint64 little-endian) e os dados (UTF-8 concatenado).
+O valor da linha i ocupa os bytes `dados[offsets[i]:offsets[i + 1]]`; valores
+nulos são gravados vazios. As posições das seções no cabeçalho são relativas
+ao fim do cabeçalho (alinhado em 8 bytes), então o arquivo pode ser mapeado
+em memória e lido sem cópia.
+
+Exemplos:
+    python exportacao.py --tipo PF --saida clientes.csv
+    python exportacao.py --tipo PJ --saida empresas.bcol --tamanho-lote 10000
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from database import COLUNAS_PESSOAS_FISICAS, COLUNAS_PESSOAS_JURIDICAS, obter_gerenciador
+
+try:
+    import resource
+except ImportError:  # Windows.
+    resource = None
+
+MAGICO = b"BCOL0001"
+ALINHAMENTO = 8
+
+
+def pico_memoria_mb() -> Optional[float]:
+    """Pico de memória residente (RSS) do processo, em MB."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes.
+    return pico / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _colunas(tipo: str):
+    return COLUNAS_PESSOAS_FISICAS if tipo == "PF" else COLUNAS_PESSOAS_JURIDICAS
+
+
+def exportar_csv(db, tipo: str, caminho, tamanho_lote: int = 5000) -> int:
+    """Grava os clientes ativos em CSV, um lote por vez."""
+    linhas = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(_colunas(tipo))
+        for lote in db.iterar_clientes(tipo, tamanho_lote):
+            escritor.writerows(lote)
+            linhas += len(lote)
+    return linhas
+
+
+def _offsets_le(offsets: array) -> array:
+    if sys.byteorder != "little":
+        offsets = array("Q", offsets)
+        offsets.byteswap()
+    return offsets
+
+
+def exportar_colunar(db, tipo: str, caminho, tamanho_lote: int = 5000) -> int:
+    """Grava os clientes ativos no formato colunar.
+
+    Cada coluna é acumulada em arquivos temporários próprios (offsets e
+    dados), de modo que a memória não cresce com o número de linhas; ao
+    final, as seções são concatenadas após o cabeçalho.
+    """
+    colunas = _colunas(tipo)
+    linhas = 0
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivos_dados = [open(Path(diretorio) / f"{i}.dados", "w+b") for i in range(len(colunas))]
+        arquivos_offsets = [open(Path(diretorio) / f"{i}.offsets", "w+b") for i in range(len(colunas))]
+        posicoes = [0] * len(colunas)
+
+        try:
+            for offsets in arquivos_offsets:
+                _offsets_le(array("Q", [0])).tofile(offsets)
+
+            for lote in db.iterar_clientes(tipo, tamanho_lote):
+                for indice, valores in enumerate(zip(*lote)):
+                    codificados = [
+                        b"" if valor is None else str(valor).encode("utf-8")
+                        for valor in valores
+                    ]
+                    offsets = array("Q")
+                    posicao = posicoes[indice]
+                    for dado in codificados:
+                        posicao += len(dado)
+                        offsets.append(posicao)
+                    posicoes[indice] = posicao
+                    arquivos_dados[indice].write(b"".join(codificados))
+                    _offsets_le(offsets).tofile(arquivos_offsets[indice])
+                linhas += len(lote)
+
+            # Posições relativas ao início da área de dados, que começa logo
+            # após o cabeçalho (completado com espaços até múltiplo de 8).
+            secoes = []
+            posicao = 0
+            cabecalho = {"linhas": linhas, "colunas": []}
+            for indice, nome in enumerate(colunas):
+                descricao = {"nome": nome}
+                for tipo_secao, tamanho in (
+                    ("offsets", (linhas + 1) * 8), ("dados", posicoes[indice])
+                ):
+                    posicao += -posicao % ALINHAMENTO
+                    descricao[tipo_secao] = posicao
+                    secoes.append((tipo_secao, indice))
+                    posicao += tamanho
+                cabecalho["colunas"].append(descricao)
+
+            cabecalho_bytes = json.dumps(cabecalho).encode("utf-8")
+            cabecalho_bytes += b" " * (-len(cabecalho_bytes) % ALINHAMENTO)
+
+            with open(caminho, "wb") as saida:
+                saida.write(MAGICO)
+                saida.write(struct.pack("<Q", len(cabecalho_bytes)))
+                saida.write(cabecalho_bytes)
+                inicio_dados = saida.tell()
+                for tipo_secao, indice in secoes:
+                    saida.write(b"\0" * (-(saida.tell() - inicio_dados) % ALINHAMENTO))
+                    origem = (arquivos_offsets if tipo_secao == "offsets" else arquivos_dados)[indice]
+                    origem.seek(0)
+                    shutil.copyfileobj(origem, saida, 1024 * 1024)
+
+        finally:
+            for arquivo in arquivos_dados + arquivos_offsets:
+                arquivo.close()
+
+    return linhas
+
+
+class ColunaMapeada:
+    """Sequência somente leitura dos valores de uma coluna mapeada."""
+
+    def __init__(self, mapa, offsets: memoryview, inicio_dados: int, linhas: int):
+        self._mapa = mapa
+        self._offsets = offsets
+        self._inicio = inicio_dados
+        self._linhas = linhas
+
+    def __len__(self):
+        return self._linhas
+
+    def __getitem__(self, indice: int) -> str:
+        if indice < 0:
+            indice += self._linhas
+        if not 0 <= indice < self._linhas:
+            raise IndexError(indice)
+        inicio = self._inicio + self._offsets[indice]
+        fim = self._inicio + self._offsets[indice + 1]
+        return self._mapa[inicio:fim].decode("utf-8")
+
+    def __iter__(self):
+        for indice in range(self._linhas):
+            yield self[indice]
+
+
+class LeitorColunar:
+    """Lê um arquivo `.bcol` via `mmap`, coluna a coluna."""
+
+    def __init__(self, caminho):
+        self._visoes: List[memoryview] = []
+        self._arquivo = open(caminho, "rb")
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mapa[:len(MAGICO)] != MAGICO:
+            self.fechar()
+            raise ValueError(f"{caminho} não é um arquivo colunar")
+
+        tamanho, = struct.unpack_from("<Q", self._mapa, len(MAGICO))
+        inicio_cabecalho = len(MAGICO) + 8
+        cabecalho = json.loads(self._mapa[inicio_cabecalho:inicio_cabecalho + tamanho])
+        self.linhas: int = cabecalho["linhas"]
+        self._secoes: Dict[str, Dict] = {c["nome"]: c for c in cabecalho["colunas"]}
+        self._inicio_dados = inicio_cabecalho + tamanho
+
+    @property
+    def colunas(self) -> List[str]:
+        return list(self._secoes)
+
+    def coluna(self, nome: str) -> ColunaMapeada:
+        """Valores da coluna, decodificados sob demanda."""
+        secao = self._secoes[nome]
+        inicio = self._inicio_dados + secao["offsets"]
+        visao = memoryview(self._mapa)[inicio:inicio + (self.linhas + 1) * 8]
+        if sys.byteorder == "little":
+            offsets = visao.cast("Q")
+            self._visoes.extend((visao, offsets))
+        else:
+            offsets = array("Q", visao)
+            offsets.byteswap()
+            visao.release()
+        return ColunaMapeada(
+            self._mapa, offsets, self._inicio_dados + secao["dados"], self.linhas
+        )
+
+    def fechar(self):
+        for visao in reversed(self._visoes):
+            visao.release()
+        self._visoes.clear()
+        self._mapa.close()
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def exportar(tipo: str, caminho, formato: Optional[str] = None,
+             tamanho_lote: int = 5000, db_path=None) -> Dict:
+    """Exporta os clientes e retorna linhas, duração, linhas/s e pico de RSS."""
+    db = obter_gerenciador(db_path)
+    formato = formato or ("csv" if str(caminho).lower().endswith(".csv") else "colunar")
+    funcao = exportar_csv if formato == "csv" else exportar_colunar
+
+    inicio = time.perf_counter()
+    linhas = funcao(db, tipo, caminho, tamanho_lote)
+    duracao = time.perf_counter() - inicio
+
+    return {
+        "linhas": linhas,
+        "formato": formato,
+        "duracao": duracao,
+        "linhas_por_segundo": linhas / duracao if duracao else 0.0,
+        "pico_rss_mb": pico_memoria_mb(),
+    }
+
+
+def main():
+    """Ponto de entrada da exportação."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tipo", choices=["PF", "PJ"], default="PF")
+    parser.add_argument("--saida", required=True, help=".csv ou .bcol")
+    parser.add_argument("--formato", choices=["csv", "colunar"])
+    parser.add_argument("--tamanho-lote", type=int, default=5000)
+    parser.add_argument("--banco", help="caminho do banco (padrão: banco_clientes.db)")
+    args = parser.parse_args()
+
+    resumo = exportar(args.tipo, args.saida, args.formato, args.tamanho_lote, args.banco)
+    pico = resumo["pico_rss_mb"]
+    print(f"✅ {resumo['linhas']} linha(s) exportada(s) ({resumo['formato']}) em "
+          f"{resumo['duracao']:.2f} s — {resumo['linhas_por_segundo']:.0f} linhas/s, "
+          f"pico de RSS {'n/d' if pico is None else f'{pico:.1f} MB'}")
+
+
+if __name__ == "__main__":
+    main()
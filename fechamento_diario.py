@@ -0,0 +1,142 @@
+"""
+Fechamento diário das contas
+Juros, tarifa de manutenção e reinício dos contadores diários de limite, em lote
+
+Registrar juros e tarifas conta a conta com `Deposito`/`Saque` imprime uma
+mensagem por conta e passa pelo motor de limites. Aqui as contas são
+processadas em blocos: os saldos de cada bloco vão para um `array` e os
+ajustes são calculados por operações sobre os vetores inteiros (`map` com
+funções de `operator`, sem laço em Python por conta). Em seguida os
+lançamentos são aplicados às contas e aos históricos de uma vez, sem saída
+no console.
+
+O progresso é gravado em um arquivo de checkpoint após cada bloco. Uma
+execução interrompida continua do último bloco concluído, e cada conta
+guarda a data do seu último fechamento (`ultimo_fechamento`), então
+repetir o fechamento de um dia não aplica os ajustes duas vezes.
+
+Os lançamentos entram no histórico com o momento em que o fechamento roda,
+para manter a ordem cronológica (o extrato busca datas por bisseção); o dia
+fechado fica no campo `referencia` de cada lançamento.
+"""
+
+import json
+import operator
+import os
+import time
+from array import array
+from datetime import date, datetime
+from itertools import repeat
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from limites import motor_limites
+from metricas import metricas
+
+# Tarifa diária de manutenção, cobrada de contas com saldo abaixo da isenção.
+TARIFA_MANUTENCAO = 0.50
+SALDO_ISENCAO = 1000.0
+
+# Juros diários sobre o saldo (0,03% ao dia).
+TAXA_JUROS_DIARIA = 0.0003
+
+# Contas por bloco (cada bloco termina com um checkpoint).
+TAMANHO_BLOCO = 10_000
+
+
+def calcular_ajustes(saldos: array, tarifa: float = TARIFA_MANUTENCAO,
+                     isencao: float = SALDO_ISENCAO, taxa_juros: float = TAXA_JUROS_DIARIA):
+    """Juros e tarifas (vetores alinhados a `saldos`), em centavos arredondados.
+
+    Os juros incidem sobre o saldo positivo; a tarifa é cobrada se o saldo
+    com os juros ficar abaixo da isenção, limitada a esse saldo.
+    """
+    positivos = map(max, saldos, repeat(0.0))
+    juros = array("d", map(round, map(operator.mul, positivos, repeat(taxa_juros)), repeat(2)))
+    com_juros = array("d", map(operator.add, saldos, juros))
+    cobrar = map(operator.lt, com_juros, repeat(isencao))
+    limitadas = map(min, map(max, com_juros, repeat(0.0)), repeat(tarifa))
+    tarifas = array("d", map(operator.mul, map(round, limitadas, repeat(2)), cobrar))
+    return juros, tarifas
+
+
+def _ler_checkpoint(caminho: Optional[Path], dia: str) -> Dict:
+    if caminho is None or not caminho.exists():
+        return {}
+    estado = json.loads(caminho.read_text(encoding="utf-8"))
+    # Checkpoint de outro dia: o fechamento de hoje começa do início.
+    return estado if estado.get("data") == dia else {}
+
+
+def _gravar_checkpoint(caminho: Optional[Path], estado: Dict):
+    if caminho is None:
+        return
+    temporario = caminho.with_name(caminho.name + ".tmp")
+    temporario.write_text(json.dumps(estado), encoding="utf-8")
+    os.replace(temporario, caminho)  # Troca atômica: nunca fica um arquivo pela metade.
+
+
+def fechar_dia(contas: Iterable, dia: Optional[date] = None, checkpoint=None,
+               tarifa: float = TARIFA_MANUTENCAO, isencao: float = SALDO_ISENCAO,
+               taxa_juros: float = TAXA_JUROS_DIARIA, tamanho_bloco: int = TAMANHO_BLOCO,
+               max_blocos: Optional[int] = None) -> Dict:
+    """Aplica o fechamento do dia a todas as contas.
+
+    As contas são ordenadas por agência e número, para que uma execução
+    retomada pelo `checkpoint` (caminho do arquivo JSON) percorra a mesma
+    sequência. `max_blocos` limita os blocos processados nesta chamada.
+    Retorna o resumo acumulado do dia.
+    """
+    inicio = time.perf_counter()
+    dia = (dia or date.today()).strftime("%d/%m/%Y")
+    checkpoint = Path(checkpoint) if checkpoint else None
+
+    ordenadas = sorted(contas, key=lambda conta: (conta.agencia, conta.numero))
+    estado = _ler_checkpoint(checkpoint, dia) or {
+        "data": dia, "processadas": 0, "juros": 0.0, "tarifas": 0.0, "ajustadas": 0,
+    }
+    retomado = estado["processadas"] > 0
+    posicao = estado["processadas"]
+    blocos = 0
+
+    while posicao < len(ordenadas) and (max_blocos is None or blocos < max_blocos):
+        bloco = [
+            conta for conta in ordenadas[posicao:posicao + tamanho_bloco]
+            if conta.ultimo_fechamento != dia
+        ]
+        saldos = array("d", [conta.saldo for conta in bloco])
+        momento = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        juros, tarifas = calcular_ajustes(saldos, tarifa, isencao, taxa_juros)
+
+        for conta, credito, debito in zip(bloco, juros, tarifas):
+            lancamentos = []
+            if credito:
+                lancamentos.append(("Juros", credito))
+            if debito:
+                lancamentos.append(("Tarifa", debito))
+            if lancamentos:
+                conta.aplicar_lancamentos(lancamentos, momento, referencia=dia)
+            conta.ultimo_fechamento = dia
+        motor_limites.reiniciar_contas(bloco)
+
+        posicao = min(posicao + tamanho_bloco, len(ordenadas))
+        blocos += 1
+        estado.update(
+            processadas=posicao,
+            juros=round(estado["juros"] + sum(juros), 2),
+            tarifas=round(estado["tarifas"] + sum(tarifas), 2),
+            ajustadas=estado["ajustadas"] + len(bloco),
+        )
+        _gravar_checkpoint(checkpoint, estado)
+
+        metricas.incrementar("banco_fechamento_contas_total", len(bloco))
+        metricas.incrementar("banco_fechamento_valores_total", sum(juros), tipo="juros")
+        metricas.incrementar("banco_fechamento_valores_total", sum(tarifas), tipo="tarifa")
+
+    return {
+        **estado,
+        "contas": len(ordenadas),
+        "concluido": posicao >= len(ordenadas),
+        "retomado": retomado,
+        "duracao_s": time.perf_counter() - inicio,
+    }
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Gerador de dados sintéticos para testes de carga do cadastro de clientes
+Produz CPFs e CNPJs válidos e únicos, nomes, endereços e históricos de transações
+
+Exemplos:
+    python gerador_dados.py --pf 1000000 --pj 100000 --saida carga.db --processos 4
+    python gerador_dados.py --pf 10000 --saida clientes.jsonl --transacoes 20
+"""
+
+import argparse
+import csv
+import functools
+import json
+import random
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from database import (
+    DatabaseManager, calcular_digitos_cnpj, calcular_digitos_cpf, separar_cidade_uf,
+)
+
+# Registros gerados por bloco; cada bloco tem gerador aleatório próprio, então
+# o resultado não depende do número de processos.
+TAMANHO_BLOCO = 10_000
+
+NOMES = [
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Heitor",
+    "Isabela", "João", "Larissa", "Lucas", "Mariana", "Miguel", "Natália",
+    "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Valentina", "Vinícius",
+]
+SOBRENOMES = [
+    "Almeida", "Alves", "Barbosa", "Carvalho", "Costa", "Ferreira", "Gomes",
+    "Lima", "Martins", "Melo", "Oliveira", "Pereira", "Ribeiro", "Rocha",
+    "Santos", "Silva", "Souza", "Teixeira",
+]
+LOGRADOUROS = ["Rua", "Avenida", "Travessa", "Alameda", "Praça"]
+NOMES_VIAS = [
+    "das Flores", "Brasil", "Sete de Setembro", "XV de Novembro", "São João",
+    "Paulista", "Santos Dumont", "Tiradentes", "Getúlio Vargas", "da Paz",
+]
+BAIRROS = ["Centro", "Jardim América", "Boa Vista", "Vila Nova", "Santa Cruz"]
+CIDADES = [
+    ("São Paulo", "SP"), ("Campinas", "SP"), ("Rio de Janeiro", "RJ"),
+    ("Belo Horizonte", "MG"), ("Curitiba", "PR"), ("Porto Alegre", "RS"),
+    ("Salvador", "BA"), ("Recife", "PE"), ("Fortaleza", "CE"),
+    ("Goiânia", "GO"), ("Manaus", "AM"), ("Belém", "PA"),
+]
+SUFIXOS_EMPRESA = ["Ltda", "S.A.", "ME", "EIRELI"]
+RAMOS = ["Comércio", "Tecnologia", "Serviços", "Alimentos", "Transportes"]
+
+ESPACO_CPF = 10 ** 9
+ESPACO_CNPJ = 10 ** 8
+
+# Data de referência das datas geradas (nascimento, cadastro, transações).
+# Fixa, para que a mesma semente gere os mesmos dados em qualquer execução.
+DATA_REFERENCIA = datetime(2025, 1, 1)
+
+
+@functools.lru_cache(maxsize=32)
+def _permutacao(semente: int, espaco: int):
+    """Bijeção afim sobre [0, espaco): mapeia índices em números únicos."""
+    rng = random.Random(semente)
+    while True:
+        multiplicador = rng.randrange(1, espaco)
+        if multiplicador % 2 and multiplicador % 5:
+            break
+    deslocamento = rng.randrange(espaco)
+    return lambda indice: (multiplicador * indice + deslocamento) % espaco
+
+
+def cpf_por_indice(indice: int, semente: int = 0) -> str:
+    """CPF válido de número `indice`; índices distintos geram CPFs distintos."""
+    base = f"{_permutacao(semente, ESPACO_CPF)(indice):09d}"
+    return base + calcular_digitos_cpf(base)
+
+
+def cnpj_por_indice(indice: int, semente: int = 0) -> str:
+    """CNPJ válido (matriz 0001) de número `indice`, único por índice."""
+    base = f"{_permutacao(semente + 1, ESPACO_CNPJ)(indice):08d}0001"
+    return base + calcular_digitos_cnpj(base)
+
+
+def _repetido(documento: str) -> bool:
+    return documento == documento[0] * len(documento)
+
+
+def _endereco(rng: random.Random) -> str:
+    """Endereço no formato `logradouro, nº - bairro - cidade/UF`."""
+    cidade, uf = rng.choice(CIDADES)
+    return (
+        f"{rng.choice(LOGRADOUROS)} {rng.choice(NOMES_VIAS)}, "
+        f"{rng.randint(1, 9999)} - {rng.choice(BAIRROS)} - {cidade}/{uf}"
+    )
+
+
+def _data(rng: random.Random, inicio: datetime, dias: int) -> datetime:
+    return inicio + timedelta(days=rng.randrange(dias), seconds=rng.randrange(86400))
+
+
+def gerar_bloco_pf(bloco: int, quantidade: int, semente: int,
+                   referencia: datetime = DATA_REFERENCIA) -> List[Dict]:
+    """Gera as pessoas físicas do bloco `bloco`, com datas até `referencia`."""
+    rng = random.Random(f"pf-{semente}-{bloco}")
+    registros = []
+
+    for indice in range(bloco * TAMANHO_BLOCO, bloco * TAMANHO_BLOCO + quantidade):
+        cpf = cpf_por_indice(indice, semente)
+        if _repetido(cpf):
+            continue
+
+        nome = f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+        nascimento = _data(rng, referencia - timedelta(days=365 * 90), 365 * 72)
+        cadastro = _data(rng, referencia - timedelta(days=365 * 5), 365 * 5)
+        registros.append({
+            "nome": nome,
+            "cpf": cpf,
+            "data_nascimento": nascimento.strftime("%d/%m/%Y"),
+            "endereco": _endereco(rng),
+            "telefone": f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-"
+                        f"{rng.randint(1000, 9999)}",
+            "email": f"{nome.split()[0].lower()}.{indice}@exemplo.com.br",
+            "data_cadastro": cadastro.strftime("%d/%m/%Y %H:%M:%S"),
+        })
+
+    return registros
+
+
+def gerar_bloco_pj(bloco: int, quantidade: int, semente: int,
+                   referencia: datetime = DATA_REFERENCIA) -> List[Dict]:
+    """Gera as pessoas jurídicas do bloco `bloco`, com datas até `referencia`."""
+    rng = random.Random(f"pj-{semente}-{bloco}")
+    registros = []
+
+    for indice in range(bloco * TAMANHO_BLOCO, bloco * TAMANHO_BLOCO + quantidade):
+        cnpj = cnpj_por_indice(indice, semente)
+        if _repetido(cnpj):
+            continue
+
+        fantasia = f"{rng.choice(SOBRENOMES)} {rng.choice(RAMOS)}"
+        cadastro = _data(rng, referencia - timedelta(days=365 * 5), 365 * 5)
+        registros.append({
+            "razao_social": f"{fantasia} {rng.choice(SUFIXOS_EMPRESA)}",
+            "nome_fantasia": fantasia,
+            "cnpj": cnpj,
+            "endereco": _endereco(rng),
+            "telefone": f"({rng.randint(11, 99)}) 3{rng.randint(100, 999)}-"
+                        f"{rng.randint(1000, 9999)}",
+            "email": f"contato{indice}@exemplo.com.br",
+            "representante_legal": f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}",
+            "data_cadastro": cadastro.strftime("%d/%m/%Y %H:%M:%S"),
+        })
+
+    return registros
+
+
+def gerar_historico(
+    quantidade: int, rng: Optional[random.Random] = None, dias: int = 365,
+    referencia: datetime = DATA_REFERENCIA,
+) -> List[Dict]:
+    """Histórico de transações no formato de `Historico.transacoes`."""
+    rng = rng or random.Random()
+    inicio = referencia - timedelta(days=dias)
+    instantes = sorted(_data(rng, inicio, dias) for _ in range(quantidade))
+    return [
+        {
+            "tipo": "Deposito" if rng.random() < 0.6 else "Saque",
+            "valor": round(rng.uniform(10, 500), 2),
+            "data": instante.strftime("%d/%m/%Y %H:%M:%S"),
+        }
+        for instante in instantes
+    ]
+
+
+def _blocos(total: int):
+    """Divide `total` registros em (bloco, quantidade)."""
+    return [
+        (bloco, min(TAMANHO_BLOCO, total - bloco * TAMANHO_BLOCO))
+        for bloco in range((total + TAMANHO_BLOCO - 1) // TAMANHO_BLOCO)
+    ]
+
+
+def _gerar(funcao, bloco_quantidade, semente, referencia):
+    bloco, quantidade = bloco_quantidade
+    return funcao(bloco, quantidade, semente, referencia)
+
+
+def gerar_registros(
+    tipo: str, total: int, semente: int = 0, processos: int = 1,
+    referencia: datetime = DATA_REFERENCIA,
+) -> Iterator[List[Dict]]:
+    """Gera os registros em blocos, opcionalmente em vários processos."""
+    funcao = gerar_bloco_pf if tipo == "pf" else gerar_bloco_pj
+    blocos = _blocos(total)
+
+    if processos <= 1:
+        for bloco in blocos:
+            yield _gerar(funcao, bloco, semente, referencia)
+        return
+
+    with ProcessPoolExecutor(processos) as executor:
+        yield from executor.map(
+            _gerar, [funcao] * len(blocos), blocos, [semente] * len(blocos),
+            [referencia] * len(blocos),
+        )
+
+
+COLUNAS_PF = [
+    "nome", "cpf", "data_nascimento", "endereco", "telefone", "email",
+    "data_cadastro",
+]
+COLUNAS_PJ = [
+    "razao_social", "nome_fantasia", "cnpj", "endereco", "telefone", "email",
+    "representante_legal", "data_cadastro",
+]
+
+
+def escrever_sqlite(caminho, total_pf=0, total_pj=0, semente=0, processos=1,
+                    referencia=DATA_REFERENCIA) -> int:
+    """Carrega os registros no banco com inserções em lote."""
+    db = DatabaseManager(caminho)
+    db.init_database()
+    escritos = 0
+
+    conn = sqlite3.connect(caminho)
+    try:
+        # Carga inicial: durabilidade é dispensável até o fim da operação.
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+
+        for tabela, tipo, colunas, total in (
+            ("pessoas_fisicas", "pf", COLUNAS_PF, total_pf),
+            ("pessoas_juridicas", "pj", COLUNAS_PJ, total_pj),
+        ):
+            comando = (
+                f"INSERT OR IGNORE INTO {tabela} ({', '.join(colunas)}, cidade, uf) "
+                f"VALUES ({', '.join('?' * (len(colunas) + 2))})"
+            )
+            for registros in gerar_registros(tipo, total, semente, processos, referencia):
+                with conn:
+                    conn.executemany(comando, (
+                        [r[c] for c in colunas] + list(separar_cidade_uf(r["endereco"]))
+                        for r in registros
+                    ))
+                escritos += len(registros)
+    finally:
+        conn.close()
+
+    return escritos
+
+
+def escrever_arquivo(caminho, tipo, total, semente=0, processos=1,
+                     referencia=DATA_REFERENCIA) -> int:
+    """Grava os registros em CSV ou JSONL, conforme a extensão."""
+    caminho = Path(caminho)
+    colunas = COLUNAS_PF if tipo == "pf" else COLUNAS_PJ
+    escritos = 0
+
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor_csv = None
+        if caminho.suffix.lower() == ".csv":
+            escritor_csv = csv.DictWriter(arquivo, fieldnames=colunas)
+            escritor_csv.writeheader()
+
+        for registros in gerar_registros(tipo, total, semente, processos, referencia):
+            if escritor_csv:
+                escritor_csv.writerows(registros)
+            else:
+                arquivo.writelines(
+                    json.dumps(r, ensure_ascii=False) + "\n" for r in registros
+                )
+            escritos += len(registros)
+
+    return escritos
+
+
+def escrever_historicos(caminho, total_pf, transacoes, semente=0,
+                        referencia=DATA_REFERENCIA) -> int:
+    """Grava um histórico de transações por CPF em JSONL."""
+    rng = random.Random(f"historico-{semente}")
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        for indice in range(total_pf):
+            linha = {
+                "cpf": cpf_por_indice(indice, semente),
+                "transacoes": gerar_historico(transacoes, rng, referencia=referencia),
+            }
+            arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+    return total_pf
+
+
+def main():
+    """Ponto de entrada do gerador."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pf", type=int, default=0, help="pessoas físicas")
+    parser.add_argument("--pj", type=int, default=0, help="pessoas jurídicas")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--processos", type=int, default=1)
+    parser.add_argument("--data-referencia", default=DATA_REFERENCIA.strftime("%d/%m/%Y"),
+                        help="data mais recente das datas geradas (dd/mm/aaaa)")
+    parser.add_argument("--saida", required=True,
+                        help=".db (SQLite), .csv ou .jsonl")
+    parser.add_argument("--transacoes", type=int, default=0,
+                        help="transações por PF (grava <saida>.transacoes.jsonl)")
+    args = parser.parse_args()
+
+    saida = Path(args.saida)
+    referencia = datetime.strptime(args.data_referencia, "%d/%m/%Y")
+    inicio = time.perf_counter()
+
+    if saida.suffix.lower() == ".db":
+        total = escrever_sqlite(
+            saida, args.pf, args.pj, args.semente, args.processos, referencia
+        )
+    else:
+        total = 0
+        if args.pf:
+            total += escrever_arquivo(
+                saida, "pf", args.pf, args.semente, args.processos, referencia
+            )
+        if args.pj:
+            destino = saida.with_name(f"{saida.stem}_pj{saida.suffix}") if args.pf else saida
+            total += escrever_arquivo(
+                destino, "pj", args.pj, args.semente, args.processos, referencia
+            )
+
+    if args.transacoes and args.pf:
+        escrever_historicos(
+            saida.with_suffix(".transacoes.jsonl"), args.pf, args.transacoes, args.semente,
+            referencia,
+        )
+
+    duracao = time.perf_counter() - inicio
+    print(f"✅ {total} registro(s) gerado(s) em {duracao:.2f} s "
+          f"({total / duracao:.0f} registros/s) → {saida}")
+
+
+if __name__ == "__main__":
+    main()
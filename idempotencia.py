@@ -0,0 +1,76 @@
+"""Supressão de transações repetidas por chave de idempotência.
+
+Quando um cliente reenvia uma transação (por exemplo, após um timeout), a
+chave de idempotência identifica a repetição e o resultado original é
+devolvido sem aplicar a transação de novo. As chaves ficam em um cache LRU
+com prazo de validade contado a partir do último uso: a memória é limitada
+por `capacidade`, mesmo com milhões de chaves por dia.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from metricas import metricas
+
+# Marca de ausência (o resultado guardado pode ser False ou None).
+AUSENTE = object()
+
+
+class CacheIdempotencia:
+    """Cache LRU de resultados com expiração (TTL), de tamanho limitado."""
+
+    def __init__(self, capacidade: int = 1_000_000, ttl: float = 24 * 3600):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._itens: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave: Hashable, agora: Optional[float] = None) -> Any:
+        """Resultado guardado para a chave, ou `AUSENTE`."""
+        agora = time.monotonic() if agora is None else agora
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is None:
+                return AUSENTE
+            expira_em, resultado = item
+            if expira_em <= agora:
+                del self._itens[chave]
+                return AUSENTE
+            # Renova o prazo: a ordem LRU continua sendo a ordem de expiração.
+            self._itens[chave] = (agora + self.ttl, resultado)
+            self._itens.move_to_end(chave)
+            return resultado
+
+    def guardar(self, chave: Hashable, resultado: Any, agora: Optional[float] = None):
+        """Guarda o resultado, descartando expirados e os menos usados."""
+        agora = time.monotonic() if agora is None else agora
+        with self._trava:
+            self._itens[chave] = (agora + self.ttl, resultado)
+            self._itens.move_to_end(chave)
+
+            # Os mais antigos ficam no início; remove os já expirados.
+            while self._itens:
+                expira_em, _ = next(iter(self._itens.values()))
+                if expira_em > agora:
+                    break
+                self._itens.popitem(last=False)
+
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+
+
+# Cache global usado por `Cliente.realizar_transacao`.
+cache_idempotencia = CacheIdempotencia()
+
+metricas.registrar_coletor(
+    lambda: [("banco_idempotencia_chaves", (), len(cache_idempotencia))]
+)
@@ -0,0 +1,279 @@
+"""Instrumentação opcional de latência das operações do sistema bancário.
+
+Enquanto desativada, nenhum código é interposto: os métodos originais de
+`DatabaseManager` e as funções de `desafio` permanecem intactos. Ao ativar,
+cada operação passa a registrar contagem e histograma de latência, e o tempo
+gasto em SQL é separado do tempo gasto em Python.
+"""
+
+import functools
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+
+import desafio
+from database import DatabaseManager
+
+# Sub-buckets por potência de 2 (erro relativo máximo de ~6%).
+SUB_BUCKETS = 16
+_BITS_SUB = SUB_BUCKETS.bit_length() - 1
+
+# Funções de `desafio` instrumentadas (chamadas pelo menu principal).
+FUNCOES_DESAFIO = ["depositar", "sacar", "exibir_extrato"]
+
+_local = threading.local()
+
+
+class Histograma:
+    """Histograma log-linear no estilo HDR, em microssegundos.
+
+    Valores até `SUB_BUCKETS` µs têm bucket próprio; acima disso, cada
+    potência de 2 é dividida em `SUB_BUCKETS` faixas de mesma largura.
+    """
+
+    def __init__(self):
+        self.contagens: Dict[int, int] = {}
+        self.total = 0
+        self.soma = 0
+        self.minimo = None
+        self.maximo = 0
+
+    @staticmethod
+    def indice(valor: int) -> int:
+        """Bucket do valor (µs)."""
+        if valor < SUB_BUCKETS:
+            return valor
+        expoente = valor.bit_length() - 1 - _BITS_SUB
+        return (expoente + 1) * SUB_BUCKETS + (valor >> expoente) - SUB_BUCKETS
+
+    @staticmethod
+    def limite_superior(indice: int) -> int:
+        """Maior valor (µs) representado pelo bucket."""
+        if indice < SUB_BUCKETS:
+            return indice
+        expoente, deslocamento = divmod(indice, SUB_BUCKETS)
+        expoente -= 1
+        return ((SUB_BUCKETS + deslocamento + 1) << expoente) - 1
+
+    def registrar(self, segundos: float):
+        """Registra uma medição."""
+        valor = int(segundos * 1_000_000)
+        indice = self.indice(valor)
+        self.contagens[indice] = self.contagens.get(indice, 0) + 1
+        self.total += 1
+        self.soma += valor
+        self.maximo = max(self.maximo, valor)
+        self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+
+    def combinar(self, outro: "Histograma"):
+        """Acrescenta as medições de outro histograma."""
+        for indice, contagem in outro.contagens.items():
+            self.contagens[indice] = self.contagens.get(indice, 0) + contagem
+        self.total += outro.total
+        self.soma += outro.soma
+        self.maximo = max(self.maximo, outro.maximo)
+        if outro.minimo is not None:
+            self.minimo = outro.minimo if self.minimo is None else min(self.minimo, outro.minimo)
+
+    def percentil(self, p: float) -> int:
+        """Percentil aproximado (µs)."""
+        if not self.total:
+            return 0
+
+        alvo = self.total * p / 100
+        acumulado = 0
+        for indice in sorted(self.contagens):
+            acumulado += self.contagens[indice]
+            if acumulado >= alvo:
+                return min(self.limite_superior(indice), self.maximo)
+        return self.maximo
+
+    def resumo(self) -> Dict:
+        """Estatísticas do histograma (µs)."""
+        return {
+            "chamadas": self.total,
+            "media_us": self.soma / self.total if self.total else 0.0,
+            "min_us": self.minimo or 0,
+            "p50_us": self.percentil(50),
+            "p90_us": self.percentil(90),
+            "p99_us": self.percentil(99),
+            "max_us": self.maximo,
+            "buckets": {
+                str(self.limite_superior(i)): contagem
+                for i, contagem in sorted(self.contagens.items())
+            },
+        }
+
+
+class _Medicoes:
+    """Histogramas de uma operação: total, SQL e Python."""
+
+    def __init__(self):
+        self.total = Histograma()
+        self.sql = Histograma()
+        self.python = Histograma()
+
+
+def _medir_sql(metodo, objeto, *args):
+    """Executa `metodo` somando sua duração ao tempo de SQL da thread."""
+    inicio = time.perf_counter()
+    try:
+        return metodo(objeto, *args)
+    finally:
+        _local.sql = getattr(_local, "sql", 0.0) + time.perf_counter() - inicio
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """Cursor que acumula o tempo gasto dentro do SQLite."""
+
+    def _medir(self, metodo, *args):
+        return _medir_sql(metodo, self, *args)
+
+    def execute(self, *args):
+        return self._medir(sqlite3.Cursor.execute, *args)
+
+    def executemany(self, *args):
+        return self._medir(sqlite3.Cursor.executemany, *args)
+
+    def fetchone(self):
+        return self._medir(sqlite3.Cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._medir(sqlite3.Cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._medir(sqlite3.Cursor.fetchall)
+
+
+class ConexaoInstrumentada(sqlite3.Connection):
+    """Conexão cujos cursores medem o tempo de SQL."""
+
+    def cursor(self, factory=CursorInstrumentado):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def executemany(self, *args):
+        return self.cursor().executemany(*args)
+
+    def commit(self):
+        return _medir_sql(sqlite3.Connection.commit, self)
+
+
+class Instrumentacao:
+    """Registro das medições e controle de ativação."""
+
+    def __init__(self):
+        self.medicoes: Dict[str, _Medicoes] = {}
+        self._originais = {}
+        self._trava = threading.Lock()
+
+    @property
+    def ativa(self) -> bool:
+        return bool(self._originais)
+
+    def ativar(self):
+        """Passa a medir `DatabaseManager`, `desafio` e `realizar_transacao`."""
+        if self.ativa:
+            return
+
+        for nome, atributo in list(vars(DatabaseManager).items()):
+            if inspect.isfunction(atributo) and not nome.startswith("_"):
+                self._envolver(DatabaseManager, nome, f"DatabaseManager.{nome}")
+
+        for nome in FUNCOES_DESAFIO:
+            self._envolver(desafio, nome, f"desafio.{nome}")
+
+        self._envolver(
+            desafio.Cliente, "realizar_transacao", "Cliente.realizar_transacao"
+        )
+
+        self._originais[(DatabaseManager, "fabrica_conexao")] = (
+            DatabaseManager.fabrica_conexao
+        )
+        DatabaseManager.fabrica_conexao = ConexaoInstrumentada
+
+    def desativar(self):
+        """Restaura os métodos originais, eliminando todo o custo adicional."""
+        for (alvo, nome), original in self._originais.items():
+            setattr(alvo, nome, original)
+        self._originais.clear()
+
+    def limpar(self):
+        """Descarta as medições acumuladas."""
+        with self._trava:
+            self.medicoes.clear()
+
+    def resumo(self) -> Dict:
+        """Retorna as estatísticas por operação."""
+        with self._trava:
+            return {
+                nome: {
+                    "total": m.total.resumo(),
+                    "sql": m.sql.resumo(),
+                    "python": m.python.resumo(),
+                }
+                for nome, m in sorted(self.medicoes.items())
+            }
+
+    def salvar(self, caminho):
+        """Grava o resumo em um arquivo JSON."""
+        Path(caminho).write_text(
+            json.dumps(self.resumo(), indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+
+    def __enter__(self):
+        self.ativar()
+        return self
+
+    def __exit__(self, *exc):
+        self.desativar()
+
+    def _envolver(self, alvo, nome, rotulo):
+        """Substitui `alvo.nome` por uma versão que registra a latência."""
+        original = getattr(alvo, nome)
+        self._originais[(alvo, nome)] = original
+
+        @functools.wraps(original)
+        def medido(*args, **kwargs):
+            sql_antes = getattr(_local, "sql", 0.0)
+            inicio = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                duracao = time.perf_counter() - inicio
+                sql = getattr(_local, "sql", 0.0) - sql_antes
+                self._registrar(rotulo, duracao, sql)
+
+        setattr(alvo, nome, medido)
+
+    def _registrar(self, rotulo, duracao, sql):
+        with self._trava:
+            medicoes = self.medicoes.get(rotulo)
+            if medicoes is None:
+                medicoes = self.medicoes[rotulo] = _Medicoes()
+            medicoes.total.registrar(duracao)
+            medicoes.sql.registrar(sql)
+            medicoes.python.registrar(max(duracao - sql, 0.0))
+
+
+# Instância global usada pelo sistema.
+instrumentacao = Instrumentacao()
+
+
+def exibir_resumo(resumo: Dict):
+    """Exibe uma tabela com as latências por operação."""
+    print("\n" + "=" * 30 + " LATÊNCIAS (µs) " + "=" * 30)
+    print(f"{'Operação':<42} {'Chamadas':>8} {'p50':>8} {'p99':>8} {'SQL p50':>8}")
+    for nome, dados in resumo.items():
+        total = dados["total"]
+        print(
+            f"{nome:<42} {total['chamadas']:>8} {total['p50_us']:>8} "
+            f"{total['p99_us']:>8} {dados['sql']['p50_us']:>8}"
+        )
+    print("=" * 76)
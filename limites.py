@@ -0,0 +1,307 @@
+"""Motor de limites de transações por conta.
+
+Cada regra limita a quantidade e/ou o valor das transações em uma janela
+(hora, dia ou mês), deslizante ou alinhada ao calendário. As janelas são
+contadores em anel com buckets de largura fixa: a verificação de uma
+transação custa O(número de regras), independente do tamanho do histórico.
+
+Exemplo de arquivo de políticas (JSON):
+
+    {
+        "padrao": [
+            {"nome": "limite_diario", "janela": "dia", "deslizante": false,
+             "max_quantidade": 10},
+            {"nome": "saques_diarios", "janela": "dia", "tipos": ["Saque"],
+             "max_valor": 1500}
+        ],
+        "contas": {
+            "2": [{"nome": "limite_horario", "janela": "hora", "max_quantidade": 3}],
+            "0002/5": [{"nome": "limite_horario", "janela": "hora", "max_quantidade": 1}]
+        }
+    }
+
+As chaves de "contas" são "agência/número"; só o número vale para a agência
+padrão ("0001").
+"""
+
+import json
+import threading
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_EPOCA = datetime(1970, 1, 1)
+
+# Agência das contas cuja política é informada só pelo número.
+AGENCIA_PADRAO = "0001"
+
+
+def _segundos(agora: datetime) -> int:
+    """Segundos desde 1970 no horário local (buckets alinhados à meia-noite)."""
+    return int((agora - _EPOCA).total_seconds())
+
+
+# Janela: (buckets da versão deslizante, largura de cada bucket em segundos,
+# índice do período de calendário).
+JANELAS = {
+    "hora": (60, 60, lambda agora: _segundos(agora) // 3600),
+    "dia": (24, 3600, lambda agora: agora.toordinal()),
+    "mes": (30, 86400, lambda agora: agora.year * 12 + agora.month),
+}
+
+# Como cada janela é descrita nas mensagens.
+DESCRICOES_JANELA = {
+    ("hora", False): "nesta hora",
+    ("hora", True): "na última hora",
+    ("dia", False): "para hoje",
+    ("dia", True): "nas últimas 24 horas",
+    ("mes", False): "neste mês",
+    ("mes", True): "nos últimos 30 dias",
+}
+
+
+class ContadorJanela:
+    """Contador em anel de quantidade e soma dos últimos `buckets` períodos."""
+
+    __slots__ = ("buckets", "quantidades", "somas", "ultimo", "quantidade", "soma")
+
+    def __init__(self, buckets: int):
+        self.buckets = buckets
+        self.quantidades = [0] * buckets
+        self.somas = [0.0] * buckets
+        self.ultimo = None
+        self.quantidade = 0
+        self.soma = 0.0
+
+    def avancar(self, indice: int):
+        """Descarta os buckets que saíram da janela até o período `indice`."""
+        if self.ultimo is None or indice - self.ultimo >= self.buckets:
+            self.quantidades = [0] * self.buckets
+            self.somas = [0.0] * self.buckets
+            self.quantidade = 0
+            self.soma = 0.0
+        elif indice > self.ultimo:
+            for periodo in range(self.ultimo + 1, indice + 1):
+                posicao = periodo % self.buckets
+                self.quantidade -= self.quantidades[posicao]
+                self.soma -= self.somas[posicao]
+                self.quantidades[posicao] = 0
+                self.somas[posicao] = 0.0
+        else:
+            return
+        self.ultimo = indice
+
+    def registrar(self, indice: int, valor: float):
+        self.avancar(indice)
+        posicao = indice % self.buckets
+        self.quantidades[posicao] += 1
+        self.somas[posicao] += valor
+        self.quantidade += 1
+        self.soma += valor
+
+
+class Regra:
+    """Limite de quantidade e/ou valor das transações em uma janela."""
+
+    def __init__(
+        self,
+        nome: str,
+        janela: str = "dia",
+        max_quantidade: Optional[int] = None,
+        max_valor: Optional[float] = None,
+        tipos: Optional[Iterable[str]] = None,
+        deslizante: bool = True,
+    ):
+        if janela not in JANELAS:
+            raise ValueError(f"Janela desconhecida: {janela!r}")
+        self.nome = nome
+        self.janela = janela
+        self.max_quantidade = max_quantidade
+        self.max_valor = max_valor
+        self.tipos = frozenset(tipos) if tipos else None
+        self.deslizante = deslizante
+
+        buckets, largura, periodo = JANELAS[janela]
+        self.buckets = buckets if deslizante else 1
+        self._largura = largura
+        self._periodo = periodo
+
+    @classmethod
+    def de_dict(cls, dados: Dict) -> "Regra":
+        return cls(**dados)
+
+    def indice(self, agora: datetime) -> int:
+        """Bucket do instante `agora`."""
+        if self.deslizante:
+            return _segundos(agora) // self._largura
+        return self._periodo(agora)
+
+    def aplica_se(self, tipo: str) -> bool:
+        return self.tipos is None or tipo in self.tipos
+
+    def mensagem(self, contador: ContadorJanela) -> str:
+        periodo = DESCRICOES_JANELA[(self.janela, self.deslizante)]
+        if self.max_quantidade is not None and contador.quantidade >= self.max_quantidade:
+            mensagem = (
+                "Você excedeu o número de transações permitidas "
+                f"{periodo} ({contador.quantidade}/{self.max_quantidade})."
+            )
+        else:
+            mensagem = (
+                f"O valor excede o limite de R$ {self.max_valor:.2f} {periodo} "
+                f"(já utilizado: R$ {contador.soma:.2f})."
+            )
+        if self.janela == "dia" and not self.deslizante:
+            mensagem += "\nTente novamente amanhã."
+        return mensagem
+
+
+# Política usada quando a conta não tem uma própria: as 10 transações por dia.
+POLITICA_PADRAO = [Regra("limite_diario", "dia", max_quantidade=10, deslizante=False)]
+
+
+class MotorLimites:
+    """Avalia e contabiliza as transações de cada conta segundo sua política."""
+
+    def __init__(self, politica_padrao: Optional[List[Regra]] = None):
+        self.politica_padrao = list(politica_padrao or POLITICA_PADRAO)
+        # Políticas próprias por (agência, número): números se repetem entre agências.
+        self.politicas: Dict[Tuple[str, int], List[Regra]] = {}
+        # Estado por conta: (política, contadores); some junto com a conta.
+        self._estados = weakref.WeakKeyDictionary()
+        self._travas_conta = weakref.WeakKeyDictionary()
+        self._trava = threading.Lock()
+
+    def carregar(self, caminho):
+        """Carrega as políticas de um arquivo JSON (ver o docstring do módulo)."""
+        dados = json.loads(Path(caminho).read_text(encoding="utf-8"))
+        if "padrao" in dados:
+            self.politica_padrao = [Regra.de_dict(r) for r in dados["padrao"]]
+        for chave, regras in dados.get("contas", {}).items():
+            agencia, _, numero = chave.rpartition("/")
+            self.politicas[(agencia or AGENCIA_PADRAO, int(numero))] = [
+                Regra.de_dict(r) for r in regras
+            ]
+        self.reiniciar()
+
+    def definir_politica(self, numero: int, regras: List[Regra],
+                         agencia: str = AGENCIA_PADRAO):
+        """Define a política de uma conta."""
+        self.politicas[(agencia, numero)] = list(regras)
+        self.reiniciar()
+
+    def remover_politica(self, numero: int, agencia: str = AGENCIA_PADRAO):
+        """Volta a conta à política padrão."""
+        self.politicas.pop((agencia, numero), None)
+        self.reiniciar()
+
+    def politica(self, conta) -> List[Regra]:
+        return self.politicas.get((conta.agencia, conta.numero), self.politica_padrao)
+
+    def reiniciar(self, conta=None):
+        """Zera os contadores de uma conta (ou de todas)."""
+        with self._trava:
+            if conta is None:
+                self._estados.clear()
+            else:
+                self._estados.pop(conta, None)
+
+    def reiniciar_contas(self, contas: Iterable):
+        """Zera os contadores diários de várias contas (fechamento diário).
+
+        Só as regras de janela "dia" alinhada ao calendário são reiniciadas;
+        janelas deslizantes, horárias e mensais seguem contando.
+        """
+        with self._trava:
+            for conta in contas:
+                estado = self._estados.get(conta)
+                if estado is None:
+                    continue
+                contadores = estado[1]
+                for posicao, (regra, _) in enumerate(contadores):
+                    if regra.janela == "dia" and not regra.deslizante:
+                        contadores[posicao] = (regra, ContadorJanela(regra.buckets))
+
+    def verificar(self, conta, transacao, agora: Optional[datetime] = None
+                  ) -> Optional[Tuple[Regra, str]]:
+        """Retorna `(regra, mensagem)` da primeira regra violada, ou None."""
+        agora = agora or datetime.now()
+        tipo = transacao.__class__.__name__
+        valor = transacao.valor
+
+        with self._trava:
+            for regra, contador in self._contadores(conta):
+                if not regra.aplica_se(tipo):
+                    continue
+                contador.avancar(regra.indice(agora))
+                if (
+                    regra.max_quantidade is not None
+                    and contador.quantidade + 1 > regra.max_quantidade
+                ) or (
+                    regra.max_valor is not None
+                    and contador.soma + valor > regra.max_valor
+                ):
+                    return regra, regra.mensagem(contador)
+        return None
+
+    def registrar(self, conta, transacao, agora: Optional[datetime] = None):
+        """Contabiliza uma transação concluída."""
+        agora = agora or datetime.now()
+        tipo = transacao.__class__.__name__
+
+        with self._trava:
+            for regra, contador in self._contadores(conta):
+                if regra.aplica_se(tipo):
+                    contador.registrar(regra.indice(agora), transacao.valor)
+
+    def aplicar(self, conta, transacao, operacao: Callable[[], bool],
+                agora: Optional[datetime] = None) -> Tuple[Optional[Tuple[Regra, str]], bool]:
+        """Verifica os limites, executa `operacao()` e contabiliza a transação.
+
+        As três etapas rodam sob a trava da conta: transações concorrentes na
+        mesma conta não passam juntas pela verificação antes de contadas.
+        Retorna `(violacao, sucesso)`; com violação, a operação não é executada.
+        """
+        agora = agora or datetime.now()
+        with self._trava:
+            trava_conta = self._travas_conta.setdefault(conta, threading.Lock())
+
+        with trava_conta:
+            violacao = self.verificar(conta, transacao, agora)
+            if violacao:
+                return violacao, False
+            sucesso = operacao()
+            if sucesso:
+                self.registrar(conta, transacao, agora)
+            return None, sucesso
+
+    def uso(self, conta, agora: Optional[datetime] = None) -> Optional[str]:
+        """Resumo da primeira regra de quantidade que vale para todos os tipos.
+
+        Ex.: "Transações hoje: 3/10". None se a política não tiver tal regra.
+        """
+        agora = agora or datetime.now()
+        with self._trava:
+            for regra, contador in self._contadores(conta):
+                if regra.max_quantidade is None or regra.tipos is not None:
+                    continue
+                contador.avancar(regra.indice(agora))
+                periodo = DESCRICOES_JANELA[(regra.janela, regra.deslizante)]
+                return (
+                    f"Transações {periodo.removeprefix('para ')}: "
+                    f"{contador.quantidade}/{regra.max_quantidade}"
+                )
+        return None
+
+    def _contadores(self, conta) -> List[Tuple[Regra, ContadorJanela]]:
+        politica = self.politica(conta)
+        estado = self._estados.get(conta)
+        if estado is None or estado[0] is not politica:
+            estado = (politica, [(r, ContadorJanela(r.buckets)) for r in politica])
+            self._estados[conta] = estado
+        return estado[1]
+
+
+# Motor global usado por `Cliente.realizar_transacao`.
+motor_limites = MotorLimites()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Modo em lote do Sistema Bancário
+Executa um arquivo CSV ou JSONL de operações sem interação com o usuário
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from operacoes import ProcessadorOperacoes, silenciar_saida
+
+# Nomes aceitos no arquivo para cada operação do processador.
+SINONIMOS = {
+    "cliente": "criar_cliente",
+    "novo_cliente": "criar_cliente",
+    "conta": "criar_conta",
+    "nova_conta": "criar_conta",
+    "deposito": "depositar",
+    "saque": "sacar",
+}
+
+# Linhas inválidas listadas no resumo (as demais são apenas contadas).
+MAX_LINHAS_INVALIDAS = 20
+
+
+def ler_operacoes(caminho) -> Iterator[Tuple[int, Optional[Dict]]]:
+    """Lê as operações do arquivo sob demanda, uma linha por vez.
+
+    Produz `(número da linha, operação)`; a operação é None em linhas que
+    não são um objeto JSON válido.
+    """
+    caminho = Path(caminho)
+
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        if caminho.suffix.lower() == ".csv":
+            leitor = csv.DictReader(arquivo)
+            for linha in leitor:
+                # Colunas vazias não são argumentos da operação.
+                yield leitor.line_num, {
+                    k: v for k, v in linha.items() if k and v not in ("", None)
+                }
+        else:
+            for numero, linha in enumerate(arquivo, 1):
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    operacao = json.loads(linha)
+                except json.JSONDecodeError:
+                    operacao = None
+                yield numero, operacao if isinstance(operacao, dict) else None
+
+
+def executar_lote(caminho, silencioso: bool = False) -> Dict:
+    """Executa todas as operações do arquivo e retorna o resumo."""
+    processador = ProcessadorOperacoes()
+    falhas = Counter()
+    linhas_invalidas = []
+    total = 0
+
+    saida = silenciar_saida() if silencioso else contextlib.nullcontext()
+    inicio = time.perf_counter()
+
+    with saida:
+        for numero, operacao in ler_operacoes(caminho):
+            if operacao is None:
+                # Linha malformada: contada como falha, o lote continua.
+                total += 1
+                falhas["linha_invalida"] += 1
+                if len(linhas_invalidas) < MAX_LINHAS_INVALIDAS:
+                    linhas_invalidas.append(numero)
+                continue
+
+            nome = str(operacao.get("operacao", "")).strip().lower()
+            operacao["operacao"] = SINONIMOS.get(nome, nome)
+
+            resultado = processador.executar(operacao)
+            total += 1
+
+            if not resultado["ok"]:
+                falhas[resultado["motivo"]] += 1
+            elif operacao["operacao"] == "extrato":
+                print(
+                    f"\nExtrato conta {resultado['numero']}: "
+                    f"{len(resultado['transacoes'])} transação(ões), "
+                    f"saldo R$ {resultado['saldo']:.2f}"
+                )
+
+    duracao = time.perf_counter() - inicio
+    return {
+        "operacoes": total,
+        "sucessos": total - sum(falhas.values()),
+        "falhas": dict(falhas),
+        "linhas_invalidas": linhas_invalidas,
+        "duracao": duracao,
+        "operacoes_por_segundo": total / duracao if duracao else 0.0,
+    }
+
+
+def exibir_resumo(resumo: Dict):
+    """Exibe o resumo da execução em lote."""
+    print("\n" + "=" * 20 + " RESUMO DO LOTE " + "=" * 20)
+    print(f"Operações:\t\t{resumo['operacoes']}")
+    print(f"Sucessos:\t\t{resumo['sucessos']}")
+    print(f"Falhas:\t\t\t{sum(resumo['falhas'].values())}")
+    for motivo, quantidade in sorted(
+        resumo["falhas"].items(), key=lambda item: -item[1]
+    ):
+        print(f"  • {motivo}: {quantidade}")
+    if resumo["linhas_invalidas"]:
+        linhas = ", ".join(map(str, resumo["linhas_invalidas"]))
+        print(f"  Linhas inválidas: {linhas}")
+    print(f"Duração:\t\t{resumo['duracao']:.3f} s")
+    print(f"Operações/segundo:\t{resumo['operacoes_por_segundo']:.0f}")
+    print("=" * 56)
+
+
+def main(argumentos=None):
+    """Ponto de entrada do modo em lote."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("arquivo", help="arquivo .csv ou .jsonl de operações")
+    parser.add_argument(
+        "-s", "--silencioso", action="store_true",
+        help="suprime as mensagens de cada operação",
+    )
+    args = parser.parse_args(argumentos)
+
+    exibir_resumo(executar_lote(args.arquivo, silencioso=args.silencioso))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Métricas do sistema bancário no formato de exposição do Prometheus.
+
+Os contadores são incrementados pelo domínio (`desafio`) e pelo
+`DatabaseManager`. O `ExportadorMetricas` grava periodicamente um arquivo
+de texto (coletor *textfile* do node_exporter) de forma atômica e/ou atende
+`GET /metrics` em uma porta local.
+"""
+
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Descrição e tipo das métricas conhecidas.
+DESCRICOES = {
+    "banco_transacoes_total": (
+        "counter", "Transações registradas por tipo e resultado."
+    ),
+    "banco_limite_diario_rejeicoes_total": (
+        "counter", "Transações recusadas pelas regras de limite da conta."
+    ),
+    "banco_db_erros_total": (
+        "counter", "Erros do SQLite tratados pelo DatabaseManager."
+    ),
+    "banco_db_conexoes_total": (
+        "counter", "Conexões abertas com o banco de dados."
+    ),
+    "banco_backups_total": (
+        "counter", "Backups executados, por resultado."
+    ),
+    "banco_repositorio_clientes_total": (
+        "counter", "Clientes obtidos do repositório, por origem (memoria, banco, ausente)."
+    ),
+    "banco_transacoes_repetidas_total": (
+        "counter", "Transações repetidas (mesma chave de idempotência) não reaplicadas."
+    ),
+    "banco_idempotencia_conflitos_total": (
+        "counter", "Chaves de idempotência reutilizadas com outro tipo ou valor (recusadas)."
+    ),
+    "banco_escrita_grupos_total": (
+        "counter", "Transações gravadas pela escrita em grupo."
+    ),
+    "banco_escrita_linhas_total": (
+        "counter", "Linhas da escrita em grupo, por resultado (inserido, duplicado, erro)."
+    ),
+    "banco_fechamento_contas_total": (
+        "counter", "Contas processadas pelo fechamento diário."
+    ),
+    "banco_fechamento_valores_total": (
+        "counter", "Valores lançados pelo fechamento diário, por tipo (juros, tarifa)."
+    ),
+    "banco_idempotencia_chaves": (
+        "gauge", "Chaves de idempotência guardadas no cache."
+    ),
+    "banco_gerenciadores_em_cache": (
+        "gauge", "Instâncias de DatabaseManager reaproveitadas por caminho."
+    ),
+}
+
+Rotulos = Tuple[Tuple[str, str], ...]
+Amostra = Tuple[str, Rotulos, float]
+
+
+def _escapar(valor) -> str:
+    """Escapa um valor de rótulo conforme o formato de exposição."""
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatar_rotulos(rotulos: Rotulos) -> str:
+    if not rotulos:
+        return ""
+    pares = ",".join(f'{chave}="{_escapar(valor)}"' for chave, valor in rotulos)
+    return "{" + pares + "}"
+
+
+def _formatar_valor(valor) -> str:
+    """Valor sem perda de precisão: inteiros exatos e floats com `repr`."""
+    if isinstance(valor, int):
+        return str(int(valor))
+    if math.isnan(valor):
+        return "NaN"
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor))
+
+
+class RegistroMetricas:
+    """Contadores e medidores (gauges) em memória."""
+
+    def __init__(self):
+        self._contadores: Dict[Tuple[str, Rotulos], float] = {}
+        self._medidores: Dict[Tuple[str, Rotulos], float] = {}
+        self._coletores: List[Callable[[], Iterable[Amostra]]] = []
+        self._trava = threading.Lock()
+
+    def incrementar(self, nome: str, valor: float = 1, **rotulos):
+        """Soma `valor` ao contador."""
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._trava:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def definir(self, nome: str, valor: float, **rotulos):
+        """Define o valor atual de um medidor."""
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._trava:
+            self._medidores[chave] = valor
+
+    def registrar_coletor(self, coletor: Callable[[], Iterable[Amostra]]):
+        """Registra uma função que fornece medidores no momento da exportação.
+
+        O coletor retorna tuplas `(nome, rotulos, valor)`, em que `rotulos` é
+        uma tupla de pares `(chave, valor)`.
+        """
+        with self._trava:
+            self._coletores.append(coletor)
+
+    def valor(self, nome: str, **rotulos) -> float:
+        """Valor atual de um contador ou medidor (0 se inexistente)."""
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._trava:
+            return self._contadores.get(chave, self._medidores.get(chave, 0))
+
+    def limpar(self):
+        """Zera todas as métricas."""
+        with self._trava:
+            self._contadores.clear()
+            self._medidores.clear()
+
+    def exposicao(self) -> str:
+        """Gera o texto no formato de exposição do Prometheus."""
+        with self._trava:
+            contadores = list(self._contadores.items())
+            medidores = list(self._medidores.items())
+            coletores = list(self._coletores)
+
+        for coletor in coletores:
+            for nome, rotulos, valor in coletor():
+                medidores.append(((nome, tuple(rotulos)), valor))
+
+        familias: Dict[str, Tuple[str, List[str]]] = {}
+        for tipo, amostras in (("counter", contadores), ("gauge", medidores)):
+            for (nome, rotulos), valor in sorted(amostras):
+                tipo_familia = DESCRICOES.get(nome, (tipo, ""))[0]
+                _, linhas = familias.setdefault(nome, (tipo_familia, []))
+                linhas.append(f"{nome}{_formatar_rotulos(rotulos)} {_formatar_valor(valor)}")
+
+        saida = []
+        for nome, (tipo, linhas) in sorted(familias.items()):
+            ajuda = DESCRICOES.get(nome, (tipo, nome))[1] or nome
+            saida.append(f"# HELP {nome} {ajuda}")
+            saida.append(f"# TYPE {nome} {tipo}")
+            saida.extend(linhas)
+
+        return "\n".join(saida) + "\n"
+
+    def escrever_arquivo(self, caminho):
+        """Grava a exposição de forma atômica (arquivo temporário + rename)."""
+        caminho = Path(caminho)
+        temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}.tmp")
+        temporario.write_text(self.exposicao(), encoding="utf-8")
+        os.replace(temporario, caminho)
+
+
+# Registro global usado pelo sistema.
+metricas = RegistroMetricas()
+
+
+class ExportadorMetricas:
+    """Publica as métricas em arquivo e/ou HTTP em intervalos regulares."""
+
+    def __init__(
+        self,
+        registro: RegistroMetricas = metricas,
+        arquivo: Optional[str] = None,
+        porta: Optional[int] = None,
+        intervalo: float = 15.0,
+        host: str = "127.0.0.1",
+    ):
+        self.registro = registro
+        self.arquivo = arquivo
+        self.porta = porta
+        self.intervalo = intervalo
+        self.host = host
+        self._parar = threading.Event()
+        self._thread = None
+        self._http = None
+        self._ultima_exposicao = ""
+
+    def iniciar(self):
+        """Inicia a atualização periódica e o servidor HTTP, se configurado."""
+        self.atualizar()
+        self._thread = threading.Thread(target=self._laco, daemon=True)
+        self._thread.start()
+
+        if self.porta is not None:
+            exportador = self
+
+            class _Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    corpo = exportador._ultima_exposicao.encode("utf-8")
+                    self.send_response(200)
+                    self.send_header(
+                        "Content-Type", "text/plain; version=0.0.4; charset=utf-8"
+                    )
+                    self.send_header("Content-Length", str(len(corpo)))
+                    self.end_headers()
+                    self.wfile.write(corpo)
+
+                def log_message(self, *args):
+                    pass
+
+            self._http = ThreadingHTTPServer((self.host, self.porta), _Handler)
+            self.porta = self._http.server_address[1]
+            threading.Thread(target=self._http.serve_forever, daemon=True).start()
+
+        return self
+
+    def atualizar(self):
+        """Recalcula a exposição e regrava o arquivo."""
+        self._ultima_exposicao = self.registro.exposicao()
+        if self.arquivo:
+            self.registro.escrever_arquivo(self.arquivo)
+
+    def parar(self):
+        """Interrompe o exportador após uma última atualização."""
+        self._parar.set()
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+        self.atualizar()
+
+    def _laco(self):
+        while not self._parar.wait(self.intervalo):
+            self.atualizar()
@@ -0,0 +1,219 @@
+import contextlib
+import io
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import fechamento_diario
+from agencias import AGENCIA_PADRAO
+from desafio import ContaCorrente, Deposito, PessoaFisica, Saque
+from repositorio import RepositorioClientes
+
+
+class _SaidaNula(io.TextIOBase):
+    """Fluxo de saída que descarta tudo o que recebe."""
+
+    def write(self, texto):
+        return len(texto)
+
+
+def silenciar_saida():
+    """Gerenciador de contexto que suprime os `print` do domínio."""
+    return contextlib.redirect_stdout(_SaidaNula())
+
+
+def somente_digitos(documento) -> str:
+    """Remove caracteres não numéricos de um documento."""
+    return "".join(filter(str.isdigit, str(documento)))
+
+
+class ProcessadorOperacoes:
+    """Executa operações do domínio bancário sem interação com o usuário.
+
+    Mantém clientes e contas em memória, indexados por CPF e número da conta,
+    e devolve para cada operação um dicionário com o resultado. Com um
+    `RepositorioClientes`, os clientes vêm do cadastro no banco de dados e
+    são carregados sob demanda. Com um `GerenciadorAgencias`, cada agência
+    tem o seu repositório, sobre o banco da agência.
+    """
+
+    def __init__(self, repositorio=None, agencias=None):
+        self.clientes: Dict[str, PessoaFisica] = {}
+        self.contas: Dict[int, ContaCorrente] = {}
+        self.repositorio = repositorio
+        self.agencias = agencias
+        self._repositorios: Dict[str, RepositorioClientes] = {}
+
+    def executar(self, operacao: Dict) -> Dict:
+        """Executa uma operação descrita por um dicionário."""
+        nome = operacao.get("operacao")
+        metodo = self._OPERACOES.get(nome)
+
+        if metodo is None:
+            return {"ok": False, "motivo": "operacao_desconhecida"}
+
+        argumentos = {k: v for k, v in operacao.items() if k != "operacao"}
+        try:
+            return metodo(self, **argumentos)
+        except (TypeError, ValueError):
+            return {"ok": False, "motivo": "argumentos_invalidos"}
+
+    def criar_cliente(self, cpf, nome, data_nascimento, endereco,
+                      agencia=AGENCIA_PADRAO) -> Dict:
+        """Cadastra um cliente pessoa física."""
+        cpf = somente_digitos(cpf)
+        if not cpf:
+            return {"ok": False, "motivo": "cpf_invalido"}
+
+        if self._cliente(cpf, agencia) is not None:
+            return {"ok": False, "motivo": "cliente_existente"}
+
+        cliente = PessoaFisica(
+            nome=nome, data_nascimento=data_nascimento, cpf=cpf, endereco=endereco
+        )
+        repositorio = self._repositorio(agencia)
+        if repositorio is None:
+            self.clientes[cpf] = cliente
+        elif not repositorio.append(cliente):
+            return {"ok": False, "motivo": "cpf_invalido"}
+        return {"ok": True, "cpf": cpf}
+
+    def criar_conta(self, cpf, numero=None, limite=500, agencia=AGENCIA_PADRAO) -> Dict:
+        """Abre uma conta corrente para um cliente existente da agência."""
+        cliente = self._cliente(cpf, agencia)
+        if cliente is None:
+            return {"ok": False, "motivo": "cliente_nao_encontrado"}
+
+        numero = len(self.contas) + 1 if numero is None else int(numero)
+        if numero in self.contas:
+            return {"ok": False, "motivo": "conta_existente"}
+
+        conta = ContaCorrente.nova_conta(
+            cliente=cliente, numero=numero, limite=float(limite), agencia=str(agencia)
+        )
+        cliente.adicionar_conta(conta)
+        self.contas[numero] = conta
+        return {"ok": True, "numero": numero}
+
+    def depositar(self, cpf, valor, numero=None, chave_idempotencia=None,
+                  agencia=AGENCIA_PADRAO) -> Dict:
+        """Realiza um depósito na conta do cliente."""
+        return self._transacionar(
+            cpf, Deposito(float(valor), chave_idempotencia), numero, agencia
+        )
+
+    def sacar(self, cpf, valor, numero=None, chave_idempotencia=None,
+              agencia=AGENCIA_PADRAO) -> Dict:
+        """Realiza um saque na conta do cliente."""
+        return self._transacionar(
+            cpf, Saque(float(valor), chave_idempotencia), numero, agencia
+        )
+
+    def extrato(self, cpf, numero=None, agencia=AGENCIA_PADRAO) -> Dict:
+        """Retorna o saldo e as transações da conta do cliente."""
+        cliente, conta, falha = self._resolver(cpf, numero, agencia)
+        if falha:
+            return falha
+
+        return {
+            "ok": True,
+            "numero": conta.numero,
+            "saldo": conta.saldo,
+            "transacoes": list(conta.historico.transacoes),
+        }
+
+    def listar_contas(self) -> Dict:
+        """Lista todas as contas mantidas por este processador."""
+        contas = [
+            {
+                "agencia": conta.agencia,
+                "numero": conta.numero,
+                "titular": conta.cliente.nome,
+                "saldo": conta.saldo,
+            }
+            for conta in self.contas.values()
+        ]
+        return {"ok": True, "contas": contas}
+
+    def fechar_dia(self, data=None, checkpoint=None) -> Dict:
+        """Aplica o fechamento diário (juros, tarifas, limites) a todas as contas."""
+        dia = datetime.strptime(data, "%d/%m/%Y").date() if data else None
+        return {"ok": True, **fechamento_diario.fechar_dia(self.contas.values(), dia, checkpoint)}
+
+    def _repositorio(self, agencia):
+        """Repositório de clientes da agência (ou o único, sem agências)."""
+        if self.agencias is None:
+            return self.repositorio
+        repositorio = self._repositorios.get(agencia)
+        if repositorio is None:
+            repositorio = RepositorioClientes(self.agencias.banco(agencia))
+            self._repositorios[agencia] = repositorio
+        return repositorio
+
+    def _cliente(self, cpf, agencia=AGENCIA_PADRAO):
+        """Cliente do CPF, no repositório da agência (se houver) ou em memória."""
+        repositorio = self._repositorio(agencia)
+        if repositorio is not None:
+            return repositorio.obter(cpf)
+        return self.clientes.get(somente_digitos(cpf))
+
+    def _resolver(self, cpf, numero, agencia=AGENCIA_PADRAO):
+        """Localiza cliente e conta, retornando o motivo em caso de falha."""
+        conta = None if numero is None else self.contas.get(int(numero))
+        # Com o número informado, o cliente é buscado na agência da conta.
+        cliente = self._cliente(cpf, conta.agencia if conta is not None else agencia)
+        if cliente is None:
+            return None, None, {"ok": False, "motivo": "cliente_nao_encontrado"}
+
+        if numero is None:
+            conta = cliente.contas[0] if cliente.contas else None
+        elif conta is not None and conta.cliente is not cliente:
+            conta = None
+
+        if conta is None:
+            return cliente, None, {"ok": False, "motivo": "conta_nao_encontrada"}
+
+        return cliente, conta, None
+
+    def _transacionar(self, cpf, transacao, numero, agencia=AGENCIA_PADRAO) -> Dict:
+        """Aplica uma transação pelo fluxo de `Cliente.realizar_transacao`."""
+        cliente, conta, falha = self._resolver(cpf, numero, agencia)
+        if falha:
+            return falha
+
+        cliente.realizar_transacao(conta, transacao)
+        if transacao.conflitante:
+            return {"ok": False, "motivo": "chave_idempotencia_conflitante", "numero": conta.numero}
+
+        # Na repetição, `resultado` é o da primeira execução (saldo e motivo de então).
+        resultado = transacao.resultado
+        resposta = {"ok": resultado["ok"], "numero": conta.numero, "saldo": resultado["saldo"]}
+        if not resultado["ok"]:
+            resposta["motivo"] = resultado["motivo"]
+        if transacao.repetida:
+            resposta["repetida"] = True
+        return resposta
+
+    _OPERACOES = {
+        "criar_cliente": criar_cliente,
+        "criar_conta": criar_conta,
+        "depositar": depositar,
+        "sacar": sacar,
+        "extrato": extrato,
+        "listar_contas": listar_contas,
+        "fechar_dia": fechar_dia,
+    }
+
+
+def executar_silencioso(
+    processador: ProcessadorOperacoes, operacoes: List[Dict]
+) -> List[Dict]:
+    """Executa uma sequência de operações sem saída no console."""
+    with silenciar_saida():
+        return [processador.executar(operacao) for operacao in operacoes]
+
+
+def operacao(nome: str, cpf: Optional[str] = None, **argumentos) -> Dict:
+    """Monta o dicionário de uma operação."""
+    if cpf is not None:
+        argumentos["cpf"] = cpf
+    return {"operacao": nome, **argumentos}
@@ -0,0 +1,127 @@
+"""
+Renderização de listagens no console
+Modelos pré-compilados, escrita em blocos grandes e paginação sob demanda
+
+Imprimir registro a registro força uma escrita no terminal por linha (a
+saída de um terminal é bufferizada por linha). Aqui os registros viram texto
+com modelos preparados uma única vez e são gravados em blocos; em um terminal,
+a listagem é paginada e a fonte de dados só é lida até a página exibida.
+"""
+
+import sys
+from itertools import islice
+from typing import Callable, Iterable, List, Optional
+
+# Caracteres acumulados antes de cada escrita na saída.
+TAMANHO_BLOCO = 64 * 1024
+
+# Registros por página quando a saída é um terminal.
+REGISTROS_POR_PAGINA = 20
+
+
+class Modelo:
+    """Modelo de texto com campos `{nome}`, preparado uma única vez.
+
+    O `separador` é acrescentado ao fim de cada registro renderizado.
+    """
+
+    def __init__(self, texto: str, separador: str = ""):
+        self.texto = texto + separador
+        self._formatar = self.texto.format
+
+    def __call__(self, **campos) -> str:
+        return self._formatar(**campos)
+
+
+def escrever_em_blocos(textos: Iterable[str], saida=None,
+                       tamanho_bloco: int = TAMANHO_BLOCO) -> int:
+    """Grava os textos agrupados em blocos de ~`tamanho_bloco` caracteres.
+
+    Retorna quantos textos foram gravados.
+    """
+    saida = saida or sys.stdout
+    bloco: List[str] = []
+    tamanho = quantidade = 0
+
+    for texto in textos:
+        bloco.append(texto)
+        tamanho += len(texto)
+        quantidade += 1
+        if tamanho >= tamanho_bloco:
+            saida.write("".join(bloco))
+            bloco.clear()
+            tamanho = 0
+
+    if bloco:
+        saida.write("".join(bloco))
+    saida.flush()
+    return quantidade
+
+
+class Paginador:
+    """Exibe os textos de `fonte` em páginas, lendo-a apenas quando necessário.
+
+    As páginas já lidas ficam guardadas para a navegação com [A]nterior; a
+    fonte é consumida no máximo uma página além da exibida.
+    """
+
+    def __init__(self, fonte: Iterable[str], por_pagina: int = REGISTROS_POR_PAGINA,
+                 saida=None, entrada: Callable[[str], str] = input):
+        self._fonte = iter(fonte)
+        self.por_pagina = por_pagina
+        self._saida = saida or sys.stdout
+        self._entrada = entrada
+        self._paginas: List[str] = []
+        self._esgotada = False
+
+    def pagina(self, indice: int) -> Optional[str]:
+        """Texto da página `indice` (a partir de 0), ou None se não existir."""
+        while len(self._paginas) <= indice and not self._esgotada:
+            itens = list(islice(self._fonte, self.por_pagina))
+            if itens:
+                self._paginas.append("".join(itens))
+            if len(itens) < self.por_pagina:
+                self._esgotada = True
+        return self._paginas[indice] if indice < len(self._paginas) else None
+
+    def exibir(self) -> int:
+        """Navega pelas páginas até o usuário sair. Retorna as páginas lidas."""
+        atual = 0
+        texto = self.pagina(atual)
+
+        while texto is not None:
+            self._saida.write(texto)
+            self._saida.flush()
+
+            ultima = self.pagina(atual + 1) is None
+            if ultima and atual == 0:
+                break
+
+            opcoes = [] if ultima else ["[P]róxima"]
+            if atual > 0:
+                opcoes.append("[A]nterior")
+            opcoes.append("[S]air")
+            escolha = self._entrada(
+                f"\n📄 Página {atual + 1}{' (última)' if ultima else ''} — "
+                f"{'  '.join(opcoes)}: "
+            ).strip().lower()
+
+            if escolha in ("", "p") and not ultima:
+                atual += 1
+            elif escolha == "a" and atual > 0:
+                atual -= 1
+            elif escolha in ("s", "") or ultima:
+                break
+            texto = self.pagina(atual)
+
+        return len(self._paginas)
+
+
+def exibir(textos: Iterable[str], por_pagina: Optional[int] = REGISTROS_POR_PAGINA,
+           saida=None, entrada: Callable[[str], str] = input):
+    """Pagina os textos se a saída for um terminal; senão, grava tudo em blocos."""
+    saida = saida or sys.stdout
+    if por_pagina and saida.isatty():
+        Paginador(textos, por_pagina, saida, entrada).exibir()
+    else:
+        escrever_em_blocos(textos, saida)
@@ -0,0 +1,137 @@
+"""
+Repositório de clientes do domínio bancário sobre o banco de dados
+Os objetos `PessoaFisica`/`PessoaJuridica` são carregados sob demanda
+
+O cadastro fica no SQLite (`DatabaseManager`); em memória ficam apenas os
+clientes em uso. O mapa de identidade garante um único objeto por documento
+enquanto houver referências a ele (por exemplo, de uma conta aberta), e os
+`capacidade` clientes usados mais recentemente são mantidos mesmo sem
+referências, para que sessões ativas não recarreguem o cliente a cada
+operação.
+"""
+
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Iterator, Optional
+
+from database import (
+    COLUNAS_PESSOAS_FISICAS, COLUNAS_PESSOAS_JURIDICAS, DatabaseManager, obter_gerenciador,
+)
+from desafio import Cliente, PessoaFisica, PessoaJuridica
+from metricas import metricas
+
+
+def cliente_do_registro(registro: Dict) -> Cliente:
+    """Cria o objeto do domínio a partir de uma linha do cadastro."""
+    if registro.get("cnpj"):
+        return PessoaJuridica(
+            razao_social=registro["razao_social"],
+            cnpj=registro["cnpj"],
+            endereco=registro["endereco"],
+            nome_fantasia=registro.get("nome_fantasia"),
+            representante_legal=registro.get("representante_legal"),
+        )
+    return PessoaFisica(
+        nome=registro["nome"],
+        data_nascimento=registro["data_nascimento"],
+        cpf=registro["cpf"],
+        endereco=registro["endereco"],
+    )
+
+
+class RepositorioClientes:
+    """Mapa de identidade dos clientes, com carga preguiçosa do banco."""
+
+    def __init__(self, db: Optional[DatabaseManager] = None, capacidade: int = 1000):
+        self.db = db or obter_gerenciador()
+        self.capacidade = capacidade
+        self._vivos = weakref.WeakValueDictionary()
+        self._recentes: "OrderedDict[str, Cliente]" = OrderedDict()
+        self._trava = threading.RLock()
+
+    def __len__(self):
+        """Clientes ativos no cadastro (contadores mantidos pelo banco)."""
+        return self.db.obter_estatisticas()["total"]
+
+    def __iter__(self) -> Iterator[Cliente]:
+        """Percorre o cadastro em lotes, sem fixar os clientes na memória."""
+        for tipo, colunas, documento in (
+            ("PF", COLUNAS_PESSOAS_FISICAS, "cpf"),
+            ("PJ", COLUNAS_PESSOAS_JURIDICAS, "cnpj"),
+        ):
+            for lote in self.db.iterar_clientes(tipo, 1000):
+                for linha in lote:
+                    registro = dict(zip(colunas, linha))
+                    with self._trava:
+                        cliente = self._vivos.get(registro[documento])
+                        if cliente is None:
+                            cliente = cliente_do_registro(registro)
+                            self._vivos[registro[documento]] = cliente
+                    yield cliente
+
+    @property
+    def em_memoria(self) -> int:
+        return len(self._vivos)
+
+    def obter(self, documento) -> Optional[Cliente]:
+        """Cliente pelo CPF ou CNPJ, carregado do banco se não estiver em memória."""
+        documento = re.sub(r"[^0-9]", "", str(documento))
+
+        with self._trava:
+            cliente = self._vivos.get(documento)
+            if cliente is not None:
+                metricas.incrementar("banco_repositorio_clientes_total", resultado="memoria")
+                self._usar(documento, cliente)
+                return cliente
+
+        registro = self.db.buscar_cliente_por_documento(documento)
+        if registro is None:
+            metricas.incrementar("banco_repositorio_clientes_total", resultado="ausente")
+            return None
+
+        with self._trava:
+            # Outra thread pode ter carregado o mesmo cliente nesse meio tempo.
+            cliente = self._vivos.get(documento)
+            if cliente is None:
+                cliente = cliente_do_registro(registro)
+                self._vivos[documento] = cliente
+            metricas.incrementar("banco_repositorio_clientes_total", resultado="banco")
+            self._usar(documento, cliente)
+            return cliente
+
+    def append(self, cliente: Cliente) -> bool:
+        """Cadastra o cliente no banco (mesma interface da lista de clientes)."""
+        if cliente.tipo == "PJ":
+            # Sem representante, o INSERT falharia como se o CNPJ já existisse.
+            if not cliente.representante_legal:
+                print("❌ Representante Legal é obrigatório!")
+                return False
+            ok = self.db.inserir_pessoa_juridica({
+                "razao_social": cliente.razao_social,
+                "nome_fantasia": cliente.nome_fantasia,
+                "cnpj": cliente.cnpj,
+                "endereco": cliente.endereco,
+                "representante_legal": cliente.representante_legal,
+            })
+        else:
+            ok = self.db.inserir_pessoa_fisica({
+                "nome": cliente.nome,
+                "cpf": cliente.cpf,
+                "data_nascimento": cliente.data_nascimento,
+                "endereco": cliente.endereco,
+            })
+
+        if ok:
+            with self._trava:
+                self._vivos[cliente.documento] = cliente
+                self._usar(cliente.documento, cliente)
+        return ok
+
+    def _usar(self, documento: str, cliente: Cliente):
+        """Marca o cliente como recente, descartando o menos usado se preciso."""
+        self._recentes[documento] = cliente
+        self._recentes.move_to_end(documento)
+        while len(self._recentes) > self.capacidade:
+            self._recentes.popitem(last=False)
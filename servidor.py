@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Serviço de rede do Sistema Bancário (asyncio, somente biblioteca padrão)
+Protocolo: uma requisição JSON por linha; as respostas voltam na mesma ordem
+
+Exemplos:
+    python servidor.py servir --porta 8765
+    python servidor.py carga --porta 8765 --conexoes 8 --profundidade 32
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, Optional
+
+from database import DatabaseManager, obter_gerenciador
+from operacoes import ProcessadorOperacoes, silenciar_saida, somente_digitos
+
+# Operações atendidas diretamente pelo domínio em memória.
+OPERACOES_DOMINIO = {
+    "criar_cliente", "criar_conta", "depositar", "sacar", "extrato", "listar_contas",
+}
+
+# Quantidade de respostas acumuladas antes de forçar o envio.
+LIMITE_BUFFER_RESPOSTAS = 64
+
+# Marca na fila de uma linha maior que o limite do leitor (64 KiB).
+_LINHA_EXCEDIDA = object()
+
+
+class ServidorBancario:
+    """Servidor TCP assíncrono sobre `ProcessadorOperacoes` e `DatabaseManager`.
+
+    Cada conexão processa suas requisições em ordem, mas lê à frente e envia
+    as respostas em blocos (pipelining). Consultas ao banco rodam em threads,
+    limitadas por um semáforo para não esgotar o pool.
+    """
+
+    def __init__(
+        self,
+        db: Optional[DatabaseManager] = None,
+        max_concorrencia: int = 16,
+        max_conexoes: int = 256,
+    ):
+        self.db = db or obter_gerenciador()
+        self.processador = ProcessadorOperacoes()
+        self._semaforo_db = asyncio.Semaphore(max_concorrencia)
+        self._max_conexoes = max_conexoes
+        self._conexoes = 0
+
+    async def iniciar(self, host: str = "127.0.0.1", porta: int = 8765):
+        """Abre o socket e retorna o `asyncio.Server`."""
+        return await asyncio.start_server(self._atender, host, porta)
+
+    async def processar(self, requisicao: Dict) -> Dict:
+        """Executa uma requisição e retorna a resposta."""
+        nome = requisicao.get("operacao")
+
+        if nome == "buscar_cliente":
+            cliente = await self._consultar_db(requisicao.get("documento", ""))
+            if cliente is None:
+                return {"ok": False, "motivo": "cliente_nao_encontrado"}
+            return {"ok": True, "cliente": cliente}
+
+        if nome not in OPERACOES_DOMINIO:
+            return {"ok": False, "motivo": "operacao_desconhecida"}
+
+        if nome == "criar_conta":
+            await self._hidratar_cliente(requisicao.get("cpf", ""))
+
+        return self.processador.executar(requisicao)
+
+    async def _consultar_db(self, documento) -> Optional[Dict]:
+        """Busca um cliente no banco sem bloquear o laço de eventos."""
+        async with self._semaforo_db:
+            return await asyncio.to_thread(
+                self.db.buscar_cliente_por_documento, str(documento)
+            )
+
+    async def _hidratar_cliente(self, cpf):
+        """Carrega do banco o cliente PF ainda desconhecido pelo domínio."""
+        cpf = somente_digitos(cpf)
+        if not cpf or cpf in self.processador.clientes:
+            return
+
+        cliente = await self._consultar_db(cpf)
+        if cliente and cliente["tipo"] == "PF":
+            self.processador.criar_cliente(
+                cpf, cliente["nome"], cliente["data_nascimento"], cliente["endereco"]
+            )
+
+    async def _atender(self, leitor, escritor):
+        """Atende uma conexão até o cliente encerrá-la."""
+        if self._conexoes >= self._max_conexoes:
+            escritor.write(b'{"ok": false, "motivo": "servidor_ocupado"}\n')
+            await escritor.drain()
+            escritor.close()
+            return
+
+        self._conexoes += 1
+        fila = asyncio.Queue(maxsize=LIMITE_BUFFER_RESPOSTAS * 4)
+        leitura = asyncio.create_task(self._ler_requisicoes(leitor, fila))
+        pendentes = []
+        try:
+            while True:
+                linha = await fila.get()
+                if linha is None:
+                    break
+
+                if linha is _LINHA_EXCEDIDA:
+                    resposta = {"ok": False, "motivo": "requisicao_muito_grande"}
+                else:
+                    try:
+                        requisicao = json.loads(linha)
+                        identificador = requisicao.pop("id", None)
+                        resposta = await self.processar(requisicao)
+                        if identificador is not None:
+                            resposta["id"] = identificador
+                    except (json.JSONDecodeError, AttributeError, TypeError):
+                        resposta = {"ok": False, "motivo": "requisicao_invalida"}
+
+                pendentes.append(json.dumps(resposta, ensure_ascii=False))
+
+                # Só envia quando não há mais requisições já recebidas.
+                if len(pendentes) >= LIMITE_BUFFER_RESPOSTAS or fila.empty():
+                    escritor.write(("\n".join(pendentes) + "\n").encode())
+                    pendentes.clear()
+                    await escritor.drain()
+
+            # Respostas que aguardavam o fim da leitura já recebida.
+            if pendentes:
+                escritor.write(("\n".join(pendentes) + "\n").encode())
+                await escritor.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            leitura.cancel()
+            self._conexoes -= 1
+            escritor.close()
+
+    @staticmethod
+    async def _ler_requisicoes(leitor, fila):
+        """Lê as linhas recebidas à frente do processamento."""
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                await fila.put(linha)
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        except (ValueError, asyncio.LimitOverrunError):
+            # Linha acima do limite do leitor: o restante dela não pode ser
+            # separado das próximas, então a leitura termina com um erro.
+            await fila.put(_LINHA_EXCEDIDA)
+        finally:
+            # Sempre marca o fim, exceto se o atendimento já encerrou a leitura.
+            if not asyncio.current_task().cancelling():
+                await fila.put(None)
+
+
+async def servir(host: str, porta: int, max_concorrencia: int):
+    """Executa o servidor até ser interrompido."""
+    servidor = ServidorBancario(max_concorrencia=max_concorrencia)
+    socket_servidor = await servidor.iniciar(host, porta)
+    print(f"🌐 Servidor bancário ouvindo em {host}:{porta}")
+
+    # As mensagens do domínio não devem poluir o console do serviço.
+    with silenciar_saida():
+        async with socket_servidor:
+            await socket_servidor.serve_forever()
+
+
+async def _conexao_carga(host, porta, indice, total, profundidade, latencias):
+    """Conexão do gerador de carga: mantém `profundidade` requisições em voo."""
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    cpf = f"{indice:011d}"
+
+    preparo = [
+        {
+            "operacao": "criar_cliente", "cpf": cpf, "nome": f"Carga {indice}",
+            "data_nascimento": "01/01/1990",
+            "endereco": "Rua Carga, 1 - Centro - Recife/PE",
+        },
+        {"operacao": "criar_conta", "cpf": cpf},
+        {"operacao": "depositar", "cpf": cpf, "valor": 1000},
+    ]
+    for requisicao in preparo:
+        escritor.write((json.dumps(requisicao) + "\n").encode())
+    for _ in preparo:
+        await leitor.readline()
+
+    # Extratos e buscas não contam no limite diário de transações da conta.
+    mistura = [
+        {"operacao": "extrato", "cpf": cpf},
+        {"operacao": "buscar_cliente", "documento": cpf},
+        {"operacao": "sacar", "cpf": cpf, "valor": 1},
+    ]
+    envios = []
+    enviados = recebidos = 0
+
+    while recebidos < total:
+        while enviados < total and enviados - recebidos < profundidade:
+            requisicao = mistura[enviados % len(mistura)]
+            envios.append(time.perf_counter())
+            escritor.write((json.dumps(requisicao) + "\n").encode())
+            enviados += 1
+        await escritor.drain()
+
+        await leitor.readline()
+        latencias.append(time.perf_counter() - envios[recebidos])
+        recebidos += 1
+
+    escritor.close()
+
+
+def percentil(valores, p):
+    """Percentil por posição sobre a lista ordenada."""
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+async def gerar_carga(host, porta, conexoes, requisicoes, profundidade):
+    """Dispara a carga e exibe vazão e latências p50/p99."""
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _conexao_carga(host, porta, i, requisicoes, profundidade, latencias)
+        for i in range(conexoes)
+    ))
+    duracao = time.perf_counter() - inicio
+
+    print("\n" + "=" * 20 + " GERADOR DE CARGA " + "=" * 20)
+    print(f"Conexões: {conexoes} | Profundidade de pipeline: {profundidade}")
+    print(f"Requisições: {len(latencias)} em {duracao:.2f} s "
+          f"({len(latencias) / duracao:.0f} req/s)")
+    print(f"Latência média: {statistics.mean(latencias) * 1000:.2f} ms")
+    print(f"Latência p50:   {percentil(latencias, 50) * 1000:.2f} ms")
+    print(f"Latência p99:   {percentil(latencias, 99) * 1000:.2f} ms")
+    print("=" * 58)
+
+
+def main():
+    """Ponto de entrada do servidor e do gerador de carga."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modo", choices=["servir", "carga"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--concorrencia", type=int, default=16,
+                        help="consultas simultâneas ao banco (servir)")
+    parser.add_argument("--conexoes", type=int, default=8)
+    parser.add_argument("--requisicoes", type=int, default=5_000,
+                        help="requisições por conexão (carga)")
+    parser.add_argument("--profundidade", type=int, default=32)
+    args = parser.parse_args()
+
+    try:
+        if args.modo == "servir":
+            asyncio.run(servir(args.host, args.porta, args.concorrencia))
+        else:
+            asyncio.run(gerar_carga(
+                args.host, args.porta, args.conexoes,
+                args.requisicoes, args.profundidade,
+            ))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado.")
+
+
+if __name__ == "__main__":
+    main()
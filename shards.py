@@ -0,0 +1,130 @@
+import multiprocessing
+import zlib
+from typing import Dict, List, Optional
+
+from operacoes import ProcessadorOperacoes, executar_silencioso, somente_digitos
+
+
+def _trabalhador(conexao):
+    """Laço de um shard: recebe lotes de operações e devolve os resultados."""
+    processador = ProcessadorOperacoes()
+
+    while True:
+        lote = conexao.recv()
+        if lote is None:
+            break
+        conexao.send(executar_silencioso(processador, lote))
+
+    conexao.close()
+
+
+class MotorShards:
+    """Motor de contas particionado entre vários processos.
+
+    Cada shard é um processo com seu próprio `ProcessadorOperacoes`. As contas
+    ficam no shard dono do CPF do titular (hash CRC32 do CPF), de modo que
+    depósitos e saques são roteados para um único processo, enquanto
+    relatórios globais como `listar_contas` usam scatter/gather.
+    """
+
+    def __init__(self, num_shards: Optional[int] = None):
+        self.num_shards = num_shards or multiprocessing.cpu_count()
+        self._conexoes = []
+        self._processos = []
+        self._proximo_numero = 1
+
+        for _ in range(self.num_shards):
+            local, remota = multiprocessing.Pipe()
+            processo = multiprocessing.Process(
+                target=_trabalhador, args=(remota,), daemon=True
+            )
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._processos.append(processo)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.encerrar()
+
+    def shard_de(self, cpf) -> int:
+        """Retorna o índice do shard dono do CPF."""
+        return zlib.crc32(somente_digitos(cpf).encode()) % self.num_shards
+
+    def executar(self, operacao: Dict) -> Dict:
+        """Executa uma única operação no shard dono."""
+        return self.executar_lote([operacao])[0]
+
+    def executar_lote(self, operacoes: List[Dict]) -> List[Dict]:
+        """Distribui um lote entre os shards e devolve os resultados em ordem.
+
+        Todos os sub-lotes são enviados antes de qualquer resposta ser lida,
+        para que os shards trabalhem em paralelo. Operações sem CPF não têm
+        shard dono e são recusadas com `operacao_sem_cpf`; as globais usam
+        `difundir` (ex.: `listar_contas`).
+        """
+        por_shard = [[] for _ in range(self.num_shards)]
+        posicoes = [[] for _ in range(self.num_shards)]
+        resultados = [None] * len(operacoes)
+
+        for posicao, operacao in enumerate(operacoes):
+            if not somente_digitos(operacao.get("cpf") or ""):
+                resultados[posicao] = {"ok": False, "motivo": "operacao_sem_cpf"}
+                continue
+            operacao = self._numerar(operacao)
+            indice = self.shard_de(operacao["cpf"])
+            por_shard[indice].append(operacao)
+            posicoes[indice].append(posicao)
+
+        ativos = [i for i, lote in enumerate(por_shard) if lote]
+        for indice in ativos:
+            self._conexoes[indice].send(por_shard[indice])
+
+        for indice in ativos:
+            for posicao, resultado in zip(
+                posicoes[indice], self._conexoes[indice].recv()
+            ):
+                resultados[posicao] = resultado
+
+        return resultados
+
+    def difundir(self, operacao: Dict) -> List[Dict]:
+        """Envia a mesma operação a todos os shards (scatter/gather)."""
+        for conexao in self._conexoes:
+            conexao.send([operacao])
+        return [conexao.recv()[0] for conexao in self._conexoes]
+
+    def listar_contas(self) -> List[Dict]:
+        """Lista as contas de todos os shards, ordenadas por número."""
+        contas = []
+        for resultado in self.difundir({"operacao": "listar_contas"}):
+            contas.extend(resultado["contas"])
+        return sorted(contas, key=lambda conta: conta["numero"])
+
+    def encerrar(self):
+        """Finaliza os processos dos shards."""
+        for conexao in self._conexoes:
+            try:
+                conexao.send(None)
+                conexao.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+        for processo in self._processos:
+            processo.join(timeout=5)
+
+        self._conexoes = []
+        self._processos = []
+
+    def _numerar(self, operacao: Dict) -> Dict:
+        """Atribui número global às contas novas sem número informado."""
+        if operacao.get("operacao") == "criar_conta" and "numero" not in operacao:
+            operacao = {**operacao, "numero": self._proximo_numero}
+            self._proximo_numero += 1
+        elif operacao.get("operacao") == "criar_conta":
+            self._proximo_numero = max(
+                self._proximo_numero, int(operacao["numero"]) + 1
+            )
+        return operacao
@@ -1,12 +1,39 @@
 import textwrap
-from database import DatabaseManager
+from database import COLUNAS_PESSOAS_FISICAS, COLUNAS_PESSOAS_JURIDICAS, obter_gerenciador
+from renderizacao import Modelo, exibir
+
+FICHA_PESSOA_FISICA = Modelo(textwrap.dedent("""\
+    [{indice:2d}] Nome:\t\t{nome}
+         CPF:\t\t{cpf}
+         Data Nasc.:\t{data_nascimento}
+         Endereço:\t{endereco}
+         Telefone:\t{telefone}
+         E-mail:\t\t{email}
+         Cadastro:\t{data_cadastro}
+
+    """), separador="-" * 80 + "\n")
+
+FICHA_PESSOA_JURIDICA = Modelo(textwrap.dedent("""\
+    [{indice:2d}] Razão Social:\t{razao_social}
+         Nome Fantasia:\t{nome_fantasia}
+         CNPJ:\t\t{cnpj}
+         Endereço:\t{endereco}
+         Repr. Legal:\t{representante_legal}
+         Telefone:\t{telefone}
+         E-mail:\t\t{email}
+         Cadastro:\t{data_cadastro}
+
+    """), separador="-" * 80 + "\n")
+
+LINHA_PESSOA_FISICA = Modelo("  • {nome} - CPF: {cpf}\n")
+LINHA_PESSOA_JURIDICA = Modelo("  • {nome_exibicao} - CNPJ: {cnpj}\n")
 
 
 class SistemaClientes:
     """Sistema principal de gerenciamento de clientes."""
 
     def __init__(self):
-        self.db = DatabaseManager()
+        self.db = obter_gerenciador()
 
     def exibir_menu(self):
         """Exibe o menu principal do sistema."""
@@ -20,6 +47,7 @@ class SistemaClientes:
 [6]\tBuscar Cliente por Documento
 [7]\tEstatísticas do Sistema
 [8]\tVoltar ao Menu Principal
+[9]\tBuscar Cliente por Nome
 [0]\tSair
 => """
         return input(textwrap.dedent(menu_texto))
@@ -119,34 +147,38 @@ class SistemaClientes:
         except Exception as e:
             print(f"❌ Erro inesperado: {e}")
 
+    def _fichas(self, tipo: str, ordem: str, modelo: Modelo):
+        """Renderiza os clientes ativos de um tipo, lidos do banco em lotes."""
+        colunas = COLUNAS_PESSOAS_FISICAS if tipo == 'PF' else COLUNAS_PESSOAS_JURIDICAS
+        formatar = self.db.formatar_cpf if tipo == 'PF' else self.db.formatar_cnpj
+        documento = 'cpf' if tipo == 'PF' else 'cnpj'
+        indice = 0
+
+        for lote in self.db.iterar_clientes(tipo, 1000, ordem=ordem):
+            for linha in lote:
+                indice += 1
+                cliente = dict(zip(colunas, linha))
+                cliente[documento] = formatar(cliente[documento])
+                if tipo == 'PJ':
+                    cliente['nome_exibicao'] = cliente['nome_fantasia'] or cliente['razao_social']
+                for campo in ('telefone', 'email', 'nome_fantasia'):
+                    if campo in cliente:
+                        cliente[campo] = cliente[campo] or 'Não informado'
+                yield modelo(indice=indice, **cliente)
+
     def listar_pessoas_fisicas(self):
         """Lista todas as pessoas físicas cadastradas."""
         print("\n" + "="*80)
         print("                        PESSOAS FÍSICAS CADASTRADAS")
         print("="*80)
 
-        clientes = self.db.listar_pessoas_fisicas()
-
-        if not clientes:
+        total = self.db.obter_estatisticas()['pessoas_fisicas']
+        if not total:
             print("📋 Nenhuma pessoa física cadastrada.")
             return
 
-        for i, cliente in enumerate(clientes, 1):
-            cpf_formatado = self.db.formatar_cpf(cliente['cpf'])
-
-            info = f"""\
-            [{i:2d}] Nome:\t\t{cliente['nome']}
-                 CPF:\t\t{cpf_formatado}
-                 Data Nasc.:\t{cliente['data_nascimento']}
-                 Endereço:\t{cliente['endereco']}
-                 Telefone:\t{cliente['telefone'] or 'Não informado'}
-                 E-mail:\t\t{cliente['email'] or 'Não informado'}
-                 Cadastro:\t{cliente['data_cadastro']}
-            """
-            print(textwrap.dedent(info))
-            print("-" * 80)
-
-        print(f"📊 Total: {len(clientes)} pessoa(s) física(s) cadastrada(s)")
+        exibir(self._fichas('PF', 'nome', FICHA_PESSOA_FISICA))
+        print(f"📊 Total: {total} pessoa(s) física(s) cadastrada(s)")
 
     def listar_pessoas_juridicas(self):
         """Lista todas as pessoas jurídicas cadastradas."""
@@ -154,29 +186,13 @@ class SistemaClientes:
         print("                       PESSOAS JURÍDICAS CADASTRADAS")
         print("="*80)
 
-        clientes = self.db.listar_pessoas_juridicas()
-
-        if not clientes:
+        total = self.db.obter_estatisticas()['pessoas_juridicas']
+        if not total:
             print("📋 Nenhuma pessoa jurídica cadastrada.")
             return
 
-        for i, cliente in enumerate(clientes, 1):
-            cnpj_formatado = self.db.formatar_cnpj(cliente['cnpj'])
-
-            info = f"""\
-            [{i:2d}] Razão Social:\t{cliente['razao_social']}
-                 Nome Fantasia:\t{cliente['nome_fantasia'] or 'Não informado'}
-                 CNPJ:\t\t{cnpj_formatado}
-                 Endereço:\t{cliente['endereco']}
-                 Repr. Legal:\t{cliente['representante_legal']}
-                 Telefone:\t{cliente['telefone'] or 'Não informado'}
-                 E-mail:\t\t{cliente['email'] or 'Não informado'}
-                 Cadastro:\t{cliente['data_cadastro']}
-            """
-            print(textwrap.dedent(info))
-            print("-" * 80)
-
-        print(f"📊 Total: {len(clientes)} pessoa(s) jurídica(s) cadastrada(s)")
+        exibir(self._fichas('PJ', 'razao_social', FICHA_PESSOA_JURIDICA))
+        print(f"📊 Total: {total} pessoa(s) jurídica(s) cadastrada(s)")
 
     def listar_todos_clientes(self):
         """Lista todos os clientes (PF e PJ) organizadamente."""
@@ -184,34 +200,26 @@ class SistemaClientes:
         print("                          TODOS OS CLIENTES")
         print("="*80)
 
-        # Listar pessoas físicas.
-        pf_clientes = self.db.listar_pessoas_fisicas()
-        pj_clientes = self.db.listar_pessoas_juridicas()
+        estatisticas = self.db.obter_estatisticas()
+        total_pf = estatisticas['pessoas_fisicas']
+        total_pj = estatisticas['pessoas_juridicas']
 
-        if not pf_clientes and not pj_clientes:
+        if not total_pf and not total_pj:
             print("📋 Nenhum cliente cadastrado.")
             return
 
-        # Exibir pessoas físicas.
-        if pf_clientes:
-            print("\n👤 PESSOAS FÍSICAS:")
-            print("─" * 80)
-            for cliente in pf_clientes:
-                cpf_formatado = self.db.formatar_cpf(cliente['cpf'])
-                print(f"  • {cliente['nome']} - CPF: {cpf_formatado}")
-
-        # Exibir pessoas jurídicas.
-        if pj_clientes:
-            print("\n🏢 PESSOAS JURÍDICAS:")
-            print("─" * 80)
-            for cliente in pj_clientes:
-                cnpj_formatado = self.db.formatar_cnpj(cliente['cnpj'])
-                nome_exibicao = cliente['nome_fantasia'] or cliente['razao_social']
-                print(f"  • {nome_exibicao} - CNPJ: {cnpj_formatado}")
+        def linhas():
+            if total_pf:
+                yield "\n👤 PESSOAS FÍSICAS:\n" + "─" * 80 + "\n"
+                yield from self._fichas('PF', 'nome', LINHA_PESSOA_FISICA)
+            if total_pj:
+                yield "\n🏢 PESSOAS JURÍDICAS:\n" + "─" * 80 + "\n"
+                yield from self._fichas('PJ', 'razao_social', LINHA_PESSOA_JURIDICA)
 
+        exibir(linhas())
         print("\n" + "─" * 80)
-        print(f"📊 Total: {len(pf_clientes)} PF + {len(pj_clientes)} PJ = "
-              f"{len(pf_clientes) + len(pj_clientes)} cliente(s)")
+        print(f"📊 Total: {total_pf} PF + {total_pj} PJ = "
+              f"{total_pf + total_pj} cliente(s)")
 
     def buscar_cliente(self):
         """Busca cliente por CPF ou CNPJ."""
@@ -261,6 +269,34 @@ class SistemaClientes:
 
         print(textwrap.dedent(info))
 
+    def buscar_por_nome(self):
+        """Busca clientes por parte do nome, razão social ou nome fantasia."""
+        print("\n" + "="*50)
+        print("         BUSCAR CLIENTE POR NOME")
+        print("="*50)
+
+        termo = input("Nome (ou parte dele): ").strip()
+        if not termo:
+            print("❌ Informe ao menos uma palavra!")
+            return
+
+        resultados = self.db.buscar_por_nome(termo)
+
+        if not resultados:
+            print("❌ Nenhum cliente encontrado!")
+            return
+
+        for cliente in resultados:
+            if cliente['tipo'] == 'PF':
+                documento = self.db.formatar_cpf(cliente['documento'])
+                print(f"  👤 {cliente['nome']} - CPF: {documento}")
+            else:
+                documento = self.db.formatar_cnpj(cliente['documento'])
+                fantasia = f" ({cliente['nome_fantasia']})" if cliente['nome_fantasia'] else ""
+                print(f"  🏢 {cliente['nome']}{fantasia} - CNPJ: {documento}")
+
+        print(f"\n📊 {len(resultados)} cliente(s) encontrado(s)")
+
     def exibir_estatisticas(self):
         """Exibe estatísticas do sistema."""
         print("\n" + "="*50)
@@ -278,6 +314,22 @@ class SistemaClientes:
 
         print(textwrap.dedent(info))
 
+        if stats['por_uf']:
+            print("🗺️  Por UF:")
+            for uf, total in sorted(stats['por_uf'].items(), key=lambda item: -item[1]):
+                print(f"   {uf:<4}{total:>8}")
+
+        if any(stats['por_faixa_etaria'].values()):
+            print("\n🎂 Pessoas físicas por faixa etária:")
+            for faixa, total in stats['por_faixa_etaria'].items():
+                print(f"   {faixa:<7}{total:>5}")
+
+        if stats['por_mes']:
+            print("\n📅 Cadastros por mês (últimos 12):")
+            for mes, total in list(stats['por_mes'].items())[-12:]:
+                print(f"   {mes}{total:>6}")
+        print()
+
         # Informações do banco de dados.
         print(f"💾 Banco de dados: {self.db.db_path}")
         print(f"📅 Sistema ativo desde: início da sessão")
@@ -315,6 +367,10 @@ class SistemaClientes:
                     print("↩️  Voltando ao menu principal...")
                     break
 
+                # Opção nova com tecla nova: o 8 continua sendo "Voltar".
+                elif opcao == "9":
+                    self.buscar_por_nome()
+
                 elif opcao == "0":
                     print("👋 Encerrando sistema de clientes...")
                     return False  # Indica para encerrar tudo.
@@ -1,6 +1,17 @@
+import multiprocessing
 import os
+import sqlite3
 import tempfile
-from database import DatabaseManager
+import threading
+from agencias import GerenciadorAgencias
+from database import (
+    INSERIR_PESSOA_FISICA, MIGRACOES, VERSAO_ESQUEMA, DatabaseManager, obter_gerenciador,
+    separar_cidade_uf,
+)
+from deduplicacao import detectar_duplicados, jaro_winkler
+from escrita_em_grupo import EscritorEmGrupo
+from gerador_dados import TAMANHO_BLOCO, cpf_por_indice, gerar_registros
+from operacoes import ProcessadorOperacoes, executar_silencioso, silenciar_saida
 
 
 def teste_validacao_documentos():
@@ -143,6 +154,477 @@ def teste_formatacao():
     print(f"CNPJ: {cnpj_teste} → {cnpj_formatado}")
 
 
+def teste_versao_esquema():
+    """Testa a inicialização preguiçosa e o controle de versão do esquema."""
+    print("\n\n🧪 TESTE: Versão do Esquema e Inicialização Preguiçosa")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "versao.db")
+
+        db = DatabaseManager(caminho)
+        print(f"Arquivo criado antes do uso: {'❌ Sim' if os.path.exists(caminho) else '✅ Não'}")
+
+        db.obter_estatisticas()
+        with sqlite3.connect(caminho) as conn:
+            versao = conn.execute("PRAGMA user_version").fetchone()[0]
+        print(f"user_version: {versao} (esperado {VERSAO_ESQUEMA})")
+
+        mesmo = obter_gerenciador(caminho) is obter_gerenciador(caminho)
+        print(f"Gerenciador reaproveitado por caminho: {'✅ Sim' if mesmo else '❌ Não'}")
+
+        # Vários processos abrindo o mesmo arquivo novo: a migração roda uma vez.
+        caminho = os.path.join(diretorio, "concorrente.db")
+        with multiprocessing.Pool(8) as pool:
+            inicializados = pool.map(_inicializar_banco, [caminho] * 8)
+        with sqlite3.connect(caminho) as conn:
+            versao = conn.execute("PRAGMA user_version").fetchone()[0]
+        ok = all(inicializados) and versao == VERSAO_ESQUEMA
+        print(f"8 processos inicializando o mesmo banco: "
+              f"{'✅ Todos inicializados' if ok else f'❌ {inicializados}'}")
+
+
+def _inicializar_banco(caminho):
+    with silenciar_saida():
+        db = DatabaseManager(caminho)
+        db.init_database()
+    return db._inicializado_em is not None
+
+
+def teste_busca_por_nome():
+    """Testa a busca de texto completo por nome."""
+    print("\n\n🧪 TESTE: Busca por Nome (FTS5)")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = DatabaseManager(os.path.join(diretorio, "busca.db"))
+        db.inserir_pessoa_fisica({
+            'nome': 'João da Silva', 'cpf': '11144477735',
+            'data_nascimento': '15/03/1985', 'endereco': 'Rua das Flores, 123',
+        })
+        db.inserir_pessoa_juridica({
+            'razao_social': 'Padaria Açúcar Ltda', 'nome_fantasia': 'Pão Quente',
+            'cnpj': '11222333000181', 'endereco': 'Av. Paulista, 1000',
+            'representante_legal': 'Maria Santos',
+        })
+
+        casos = [("joao", "PF"), ("sil jo", "PF"), ("acucar", "PJ"), ("pao qu", "PJ")]
+        for termo, tipo in casos:
+            resultados = db.buscar_por_nome(termo)
+            ok = len(resultados) == 1 and resultados[0]['tipo'] == tipo
+            print(f"  '{termo}': {'✅' if ok else '❌'} {[r['nome'] for r in resultados]}")
+
+        nenhum = db.buscar_por_nome("inexistente")
+        print(f"  'inexistente': {'✅ Nenhum resultado' if not nenhum else '❌ Encontrou'}")
+
+
+def teste_atualizacao_e_desativacao():
+    """Testa atualização de campos e soft delete, individuais e em lote."""
+    print("\n\n🧪 TESTE: Atualização e Desativação")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = DatabaseManager(os.path.join(diretorio, "atualizacao.db"))
+        db.inserir_pessoa_fisica({
+            'nome': 'João da Silva', 'cpf': '11144477735',
+            'data_nascimento': '15/03/1985', 'endereco': 'Rua das Flores, 123',
+        })
+        db.inserir_pessoa_fisica({
+            'nome': 'Ana Souza', 'cpf': '12345678909',
+            'data_nascimento': '01/01/1990', 'endereco': 'Rua B, 2',
+        })
+
+        print("\n1️⃣ Atualizando e-mail...")
+        db.atualizar_pessoa_fisica('111.444.777-35', {'email': 'joao@novo.com'})
+        email = db.buscar_cliente_por_documento('11144477735')['email']
+        print(f"E-mail gravado: {'✅' if email == 'joao@novo.com' else '❌'} {email}")
+
+        print("\n2️⃣ Campo fora da lista permitida...")
+        bloqueado = not db.atualizar_pessoa_fisica('11144477735', {'cpf': '12345678909'})
+        print(f"Atualização recusada: {'✅ Sim' if bloqueado else '❌ Não'}")
+
+        print("\n3️⃣ Atualização em lote...")
+        alterados = db.atualizar_pessoas_fisicas_em_lote([
+            ('11144477735', {'telefone': '1'}), ('12345678909', {'telefone': '2'}),
+        ])
+        print(f"Linhas alteradas: {'✅' if alterados == 2 else '❌'} {alterados}")
+
+        print("\n4️⃣ Desativando e reativando...")
+        db.desativar_cliente('11144477735')
+        oculto = db.buscar_cliente_por_documento('11144477735') is None
+        listados = len(db.listar_pessoas_fisicas())
+        print(f"Oculto da busca e listagem: {'✅ Sim' if oculto and listados == 1 else '❌ Não'}")
+        reativados = db.reativar_clientes(['11144477735', '12345678909'])
+        print(f"Reativados em lote: {'✅' if reativados == 1 else '❌'} {reativados}")
+
+        with sqlite3.connect(db.db_path) as conn:
+            plano = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT nome FROM pessoas_fisicas "
+                "WHERE ativo = 1 ORDER BY nome"
+            ).fetchall()
+        usa_indice = any("idx_pessoas_fisicas_ativas_nome" in linha[-1] for linha in plano)
+        print(f"Listagem usa índice parcial: {'✅ Sim' if usa_indice else '❌ Não'}")
+
+
+def teste_replica_memoria():
+    """Testa se a réplica em memória acompanha as escritas no arquivo."""
+    print("\n\n🧪 TESTE: Réplica em Memória")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "replica.db")
+        arquivo = DatabaseManager(caminho)
+        arquivo.inserir_pessoa_fisica({
+            'nome': 'João da Silva', 'cpf': '11144477735',
+            'data_nascimento': '15/03/1985', 'endereco': 'Rua das Flores, 123',
+        })
+
+        replica = DatabaseManager(caminho, replica_memoria=True)
+        replica.inserir_pessoa_fisica({
+            'nome': 'Ana Souza', 'cpf': '12345678909',
+            'data_nascimento': '01/01/1990', 'endereco': 'Rua B, 2',
+        })
+        replica.inserir_pessoa_juridica({
+            'razao_social': 'Empresa ABC Ltda', 'nome_fantasia': 'ABC Tech',
+            'cnpj': '11222333000181', 'endereco': 'Av. Paulista, 1000',
+            'representante_legal': 'Maria Santos',
+        })
+        replica.atualizar_pessoa_fisica('11144477735', {'email': 'joao@novo.com'})
+        replica.desativar_cliente('12345678909')
+
+        consultas = [
+            ("listar_pessoas_fisicas", lambda db: db.listar_pessoas_fisicas()),
+            ("listar_pessoas_juridicas", lambda db: db.listar_pessoas_juridicas()),
+            ("buscar_cliente_por_documento",
+             lambda db: db.buscar_cliente_por_documento('11144477735')),
+            ("cpf_existe", lambda db: db.cpf_existe('12345678909')),
+            ("buscar_por_nome", lambda db: db.buscar_por_nome('abc')),
+            ("obter_estatisticas", lambda db: db.obter_estatisticas()),
+        ]
+        for nome, consulta in consultas:
+            igual = consulta(replica) == consulta(arquivo)
+            print(f"  {nome}: {'✅ Igual ao arquivo' if igual else '❌ Divergente'}")
+
+        # Escritores concorrentes: os ids da réplica seguem a ordem do arquivo.
+        def inserir(inicio):
+            for indice in range(inicio, inicio + 25):
+                replica.inserir_pessoa_fisica({
+                    'nome': f'Cliente {indice}', 'cpf': cpf_por_indice(indice, 7),
+                    'data_nascimento': '01/01/1990', 'endereco': 'Rua C, 3',
+                })
+
+        threads = [threading.Thread(target=inserir, args=(i * 25,)) for i in range(4)]
+        with silenciar_saida():
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        consulta = "SELECT id, cpf FROM pessoas_fisicas ORDER BY id"
+        with replica._leitura() as conn:
+            ids_replica = conn.execute(consulta).fetchall()
+        with sqlite3.connect(caminho) as conn:
+            ids_arquivo = conn.execute(consulta).fetchall()
+        igual = ids_replica == ids_arquivo and len(ids_arquivo) == 102
+        print(f"  ids com escritores concorrentes: "
+              f"{'✅ Iguais ao arquivo' if igual else '❌ Divergentes'}")
+
+        replica.desativar_replica()
+
+
+def teste_estatisticas_mantidas():
+    """Testa os contadores de estatísticas mantidos por gatilhos."""
+    print("\n\n🧪 TESTE: Estatísticas Mantidas por Gatilhos")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = DatabaseManager(os.path.join(diretorio, "estatisticas.db"))
+        db.inserir_pessoa_fisica({
+            'nome': 'João da Silva', 'cpf': '11144477735',
+            'data_nascimento': '15/03/1985', 'endereco': 'Rua das Flores, 123 - São Paulo/SP',
+        })
+        db.inserir_pessoa_fisica({
+            'nome': 'Ana Souza', 'cpf': '12345678909',
+            'data_nascimento': '01/01/1990', 'endereco': 'Rua B, 2 - Curitiba/PR',
+        })
+        db.inserir_pessoa_juridica({
+            'razao_social': 'Empresa ABC Ltda', 'cnpj': '11222333000181',
+            'endereco': 'Av. Paulista, 1000 - São Paulo/SP',
+            'representante_legal': 'Maria Santos',
+        })
+        db.desativar_cliente('12345678909')
+
+        stats = db.obter_estatisticas()
+        print(f"Totais: PF {stats['pessoas_fisicas']}, PJ {stats['pessoas_juridicas']}")
+        print(f"Por UF: {stats['por_uf']}")
+        print(f"Por faixa etária: {stats['por_faixa_etaria']}")
+
+        with sqlite3.connect(db.db_path) as conn:
+            recontagem = conn.execute(
+                "SELECT COUNT(*) FROM pessoas_fisicas WHERE ativo = 1"
+            ).fetchone()[0]
+        corretos = (stats['pessoas_fisicas'] == recontagem == 1
+                    and stats['por_uf'] == {'SP': 2}
+                    and sum(stats['por_faixa_etaria'].values()) == 1
+                    and sum(stats['por_mes'].values()) == 2)
+        print(f"Contadores corretos: {'✅ Sim' if corretos else '❌ Não'}")
+
+
+def teste_cidade_uf():
+    """Testa a separação de cidade/UF do endereço e as contagens por região."""
+    print("\n\n🧪 TESTE: Cidade e UF")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = DatabaseManager(os.path.join(diretorio, "regioes.db"))
+        for nome, cpf, endereco in (
+            ('João da Silva', '11144477735', 'Rua A, 1 - Centro - São Paulo/SP'),
+            ('Ana Souza', '12345678909', 'Rua B, 2 - Vila Nova - Campinas/SP'),
+            ('Rui Lima', '52998224725', 'Rua C, 3 - Centro - Curitiba/PR'),
+            ('Eva Reis', '98765432100', 'Rua E, 5 - Centro - Embu-Guaçu/SP'),
+            ('Davi Rocha', '39053344705', 'Av. Paulista, 1000 - SP'),
+        ):
+            db.inserir_pessoa_fisica({
+                'nome': nome, 'cpf': cpf, 'data_nascimento': '01/01/1990',
+                'endereco': endereco,
+            })
+        db.atualizar_pessoa_fisica('52998224725', {'endereco': 'Rua D, 4 - Boa Vista - Recife/PE'})
+
+        por_uf = db.contar_por_uf()
+        cidades = db.contar_por_cidade('SP')
+        print(f"Por UF: {por_uf}")
+        print(f"Cidades de SP: {[c['cidade'] for c in cidades]}")
+
+        corretos = (por_uf == {'SP': 4, 'PE': 1}
+                    and [c['cidade'] for c in cidades] == ['Campinas', 'Embu-Guaçu', 'São Paulo']
+                    and db.obter_estatisticas()['por_uf'] == {'PE': 1, 'SP': 4})
+        print(f"Contagens por região: {'✅ Corretas' if corretos else '❌ Incorretas'}")
+
+        # Migração da versão 5 repetida e endereço que deixou de ter cidade/UF.
+        with sqlite3.connect(db.db_path) as conn:
+            conn.execute("UPDATE pessoas_fisicas SET endereco = 'Rua 7/8' "
+                         "WHERE cpf = '12345678909'")
+            for passo in MIGRACOES[4][:5]:
+                passo(conn)
+            linha = conn.execute("SELECT cidade, uf FROM pessoas_fisicas "
+                                 "WHERE cpf = '12345678909'").fetchone()
+        print(f"Migração repetida e valores antigos limpos: "
+              f"{'✅ Sim' if linha == (None, None) else f'❌ {linha}'}")
+
+    formatos = {
+        'Rua A, 1 - Centro - Embu-Guaçu/SP': ('Embu-Guaçu', 'SP'),
+        'Av. Paulista, 1000 - SP': (None, 'SP'),
+        'Rua B, 2, Recife/PE': ('Recife', 'PE'),
+        'Rua C, 3 - Centro - Rio de Janeiro - RJ': ('Rio de Janeiro', 'RJ'),
+        'Rua D, 4 - Curitiba-PR': ('Curitiba', 'PR'),
+        'Rua 7/8 - Centro': (None, None),
+        'Rua F, 6 - Centro - Lugar/XX': (None, None),
+    }
+    errados = {e: separar_cidade_uf(e) for e, esperado in formatos.items()
+               if separar_cidade_uf(e) != esperado}
+    print(f"Formatos de endereço: {'✅ Corretos' if not errados else f'❌ {errados}'}")
+
+
+
+def teste_agencias():
+    """Testa um banco por agência e as consultas distribuídas entre elas."""
+    print("\n\n🧪 TESTE: Bancos por agência")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as diretorio, GerenciadorAgencias(diretorio) as agencias:
+        for agencia, nome, cpf, endereco in (
+            ('0001', 'João da Silva', '11144477735', 'Rua A, 1 - Centro - São Paulo/SP'),
+            ('0002', 'Ana Souza', '12345678909', 'Rua B, 2 - Centro - Recife/PE'),
+            ('0002', 'Bruno Lima', '52998224725', 'Rua C, 3 - Centro - Santos/SP'),
+            ('0003', 'Carla Dias', '98765432100', 'Rua D, 4 - Centro - Curitiba/PR'),
+        ):
+            agencias.banco(agencia).inserir_pessoa_fisica({
+                'nome': nome, 'cpf': cpf, 'data_nascimento': '01/01/1990',
+                'endereco': endereco,
+            })
+
+        arquivos = sorted(os.listdir(diretorio))
+        encontrado = agencias.buscar_cliente_por_documento('987.654.321-00')
+        nomes = [c['nome'] for c in agencias.listar_pessoas_fisicas()]
+        estatisticas = agencias.obter_estatisticas()
+        print(f"Arquivos: {arquivos}")
+        print(f"Listagem combinada: {nomes}")
+        print(f"Por agência: {estatisticas['por_agencia']}")
+
+        corretos = (
+            agencias.agencias() == ['0001', '0002', '0003']
+            and len(agencias.banco('0002').listar_pessoas_fisicas()) == 2
+            and encontrado['agencia'] == '0003'
+            and nomes == ['Ana Souza', 'Bruno Lima', 'Carla Dias', 'João da Silva']
+            and estatisticas['pessoas_fisicas'] == 4
+            and estatisticas['por_agencia'] == {'0001': 1, '0002': 2, '0003': 1}
+            and agencias.contar_por_uf() == {'SP': 2, 'PE': 1, 'PR': 1}
+            and agencias.buscar_por_nome('lima')[0]['agencia'] == '0002'
+        )
+        print(f"Consultas entre agências: {'✅ Corretas' if corretos else '❌ Incorretas'}")
+
+        # Operações de uma agência: o cliente é cadastrado e buscado só no seu banco.
+        processador = ProcessadorOperacoes(agencias=agencias)
+        respostas = executar_silencioso(processador, [
+            {'operacao': 'criar_cliente', 'cpf': '39053344705', 'nome': 'Davi Rocha',
+             'data_nascimento': '01/01/1990', 'endereco': 'Rua E, 5', 'agencia': '0003'},
+            {'operacao': 'criar_conta', 'cpf': '39053344705', 'numero': 1, 'agencia': '0003'},
+            {'operacao': 'depositar', 'cpf': '39053344705', 'valor': 100, 'numero': 1},
+            {'operacao': 'criar_conta', 'cpf': '39053344705', 'numero': 2},
+            {'operacao': 'criar_conta', 'cpf': '12345678909', 'numero': 3, 'agencia': '../../x'},
+        ])
+        print(f"Processador por agência: {[r.get('motivo', 'ok') for r in respostas]}")
+        try:
+            agencias.caminho('../../x')
+            caminho_recusado = False
+        except ValueError:
+            caminho_recusado = True
+
+        particionado = (
+            [r['ok'] for r in respostas] == [True, True, True, False, False]
+            and respostas[3]['motivo'] == 'cliente_nao_encontrado'
+            and respostas[4]['motivo'] == 'argumentos_invalidos'
+            and agencias.banco('0003').cpf_existe('39053344705')
+            and not agencias.banco('0001').cpf_existe('39053344705')
+            and caminho_recusado
+        )
+        print(f"Operações por agência: {'✅ Isoladas' if particionado else '❌ Misturadas'}")
+
+
+def teste_escrita_em_grupo():
+    """Testa os cadastros gravados em grupo por uma thread de escrita."""
+    print("\n\n🧪 TESTE: Escrita em grupo")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = DatabaseManager(os.path.join(diretorio, 'grupo.db'))
+        db.init_database()
+        db.ativar_replica()
+        db.ativar_escrita_em_grupo(max_lote=100, max_espera_ms=50)
+
+        def cadastro(indice, cpf):
+            return {'nome': f'Cliente {indice}', 'cpf': cpf,
+                    'data_nascimento': '01/01/1990', 'endereco': 'Rua A, 1 - Centro - Recife/PE'}
+
+        recebidos = []
+        futuros = [
+            db.enfileirar_pessoa_fisica(cadastro(1, '111.444.777-35'), recebidos.append),
+            db.enfileirar_pessoa_fisica(cadastro(2, '12345678909')),
+            db.enfileirar_pessoa_fisica(cadastro(3, '11144477735')),  # Mesmo CPF.
+            db.enfileirar_pessoa_fisica(cadastro(4, '12345678900')),  # Dígitos inválidos.
+            db.enfileirar_pessoa_juridica({
+                'razao_social': 'ACME Ltda', 'cnpj': '11222333000181',
+                'endereco': 'Rua B, 2', 'representante_legal': 'Ana',
+            }),
+        ]
+        db.aguardar_escritas()
+        resultados = [futuro.result() for futuro in futuros]
+        print(f"Resultados: {resultados}")
+
+        # Inserções síncronas concorrentes dividem a transação.
+        sucessos = []
+        threads = [
+            threading.Thread(target=lambda c=cpf: sucessos.append(
+                db.inserir_pessoa_fisica(cadastro(0, c))))
+            for cpf in ('52998224725', '98765432100', '52998224725')
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        db.desativar_escrita_em_grupo()
+
+        corretos = (
+            resultados == ['inserido', 'inserido', 'duplicado', 'invalido', 'inserido']
+            and recebidos == ['inserido']
+            and sorted(sucessos) == [False, True, True]
+            and db.obter_estatisticas()['pessoas_fisicas'] == 4
+            and db.buscar_cliente_por_documento('98765432100') is not None
+            and db.inserir_pessoa_fisica(cadastro(5, '39053344705'))
+        )
+        db.desativar_replica()
+        print(f"Escrita em grupo: {'✅ Correta' if corretos else '❌ Incorreta'}")
+
+        # Erro fora do SQLite após o commit: as linhas são resolvidas e a
+        # thread continua atendendo a fila.
+        def falhar(gravados):
+            raise RuntimeError("réplica indisponível")
+
+        escritor = EscritorEmGrupo(db._abrir, falhar, max_espera_ms=5)
+        linha = db._linha_pessoa_fisica(cadastro(6, '71428793860'), '71428793860')
+        primeiro = escritor.enfileirar(INSERIR_PESSOA_FISICA, linha, 'inserir_pessoa_fisica')
+        escritor.aguardar()
+        segundo = escritor.enfileirar(INSERIR_PESSOA_FISICA, linha, 'inserir_pessoa_fisica')
+        escritor.aguardar()
+        escritor.encerrar()
+        resolvidos = [primeiro.result(timeout=5), segundo.result(timeout=5)]
+        ok = resolvidos == ['erro', 'duplicado']
+        print(f"Erro inesperado no grupo: {'✅ Linhas resolvidas' if ok else f'❌ {resolvidos}'}")
+
+
+def teste_deduplicacao():
+    """Testa a detecção de cadastros quase duplicados."""
+    print("\n\n🧪 TESTE: Detecção de duplicados")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db = DatabaseManager(os.path.join(diretorio, 'duplicados.db'))
+        for nome, cpf, nascimento, endereco in (
+            ('João da Silva Pereira', '11144477735', '12/03/1985', 'Rua das Flores, 10 - Centro - Recife/PE'),
+            ('Joao da Sliva Pereira', '12345678909', '12/03/1985', 'R. das Flores, 10 - Centro - Recife/PE'),
+            ('João da Silva Pereira', '52998224725', '30/07/1960', 'Av. Brasil, 500 - Boa Vista - Manaus/AM'),
+            ('Maria Souza', '98765432100', '21/03/1985', 'Rua das Flores, 10 - Centro - Recife/PE'),
+        ):
+            db.inserir_pessoa_fisica({'nome': nome, 'cpf': cpf, 'data_nascimento': nascimento,
+                                      'endereco': endereco})
+        for razao, fantasia, cnpj in (
+            ('Padaria Pão Quente Ltda', 'Pão Quente', '11222333000181'),
+            ('Padaria Pao Quente LTDA', 'Quente & Cia', '11444777000161'),
+        ):
+            db.inserir_pessoa_juridica({'razao_social': razao, 'nome_fantasia': fantasia,
+                                        'cnpj': cnpj, 'endereco': 'Rua B, 2 - Centro - Natal/RN',
+                                        'representante_legal': 'Ana Maria'})
+
+        pessoas = detectar_duplicados(db, 'PF', processos=2)
+        empresas = detectar_duplicados(db, 'PJ', max_bloco=1)
+        for relatorio in (pessoas, empresas):
+            for candidato in relatorio['candidatos']:
+                print(f"{candidato['pontuacao']:.3f} {candidato['nome_a']} ↔ {candidato['nome_b']} "
+                      f"({candidato['chaves']})")
+
+        pares = {(c['documento_a'], c['documento_b']) for c in pessoas['candidatos']}
+        corretos = (
+            pares == {('11144477735', '12345678909')}
+            and len(empresas['candidatos']) == 1
+            and round(jaro_winkler('martha', 'marhta'), 3) == 0.961
+        )
+        print(f"Duplicados: {'✅ Encontrados' if corretos else '❌ Incorretos'}")
+
+
+def teste_gerador_dados():
+    """Testa a validade, unicidade e reprodutibilidade dos dados gerados."""
+    print("\n\n🧪 TESTE: Gerador de dados")
+    print("="*50)
+
+    db = DatabaseManager()
+    total = 2 * TAMANHO_BLOCO + 500
+    pessoas = [r for bloco in gerar_registros('pf', total, semente=7) for r in bloco]
+    empresas = [r for bloco in gerar_registros('pj', 2000, semente=7) for r in bloco]
+
+    cpfs = [r['cpf'] for r in pessoas]
+    cnpjs = [r['cnpj'] for r in empresas]
+    validos = all(map(db.validar_cpf, cpfs)) and all(map(db.validar_cnpj, cnpjs))
+    unicos = len(set(cpfs)) == len(cpfs) and len(set(cnpjs)) == len(cnpjs)
+    print(f"{len(cpfs)} CPFs e {len(cnpjs)} CNPJs | Válidos: {'✅' if validos else '❌'} | "
+          f"Únicos: {'✅' if unicos else '❌'}")
+
+    # Mesma semente: mesmos registros com qualquer número de processos.
+    paralelo = [r for bloco in gerar_registros('pf', total, semente=7, processos=3) for r in bloco]
+    outra_semente = next(gerar_registros('pf', 10, semente=8))
+    reproduzivel = paralelo == pessoas and outra_semente != pessoas[:10]
+    print(f"Mesma semente com 1 e 3 processos: {'✅ Idênticos' if reproduzivel else '❌ Diferentes'}")
+
+
 def main():
     """Executa todos os testes."""
     print("🔍 INICIANDO TESTES DO SISTEMA DE BANCO DE DADOS")
@@ -153,6 +635,16 @@ def main():
         teste_validacao_documentos()
         teste_crud_clientes()
         teste_formatacao()
+        teste_versao_esquema()
+        teste_busca_por_nome()
+        teste_atualizacao_e_desativacao()
+        teste_replica_memoria()
+        teste_estatisticas_mantidas()
+        teste_cidade_uf()
+        teste_agencias()
+        teste_escrita_em_grupo()
+        teste_deduplicacao()
+        teste_gerador_dados()
 
         print("\n" + "="*60)
         print("🎉 TODOS OS TESTES CONCLUÍDOS COM SUCESSO!")
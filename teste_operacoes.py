@@ -0,0 +1,782 @@
+#!/usr/bin/env python3
+"""
+Teste do processamento não interativo de operações
+Foco: ProcessadorOperacoes, motor particionado (shards), modo em lote e servidor
+"""
+
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import os
+import runpy
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta
+
+from backup import GerenciadorBackups
+from carga import executar_carga
+from database import DatabaseManager, ultimo_erro
+import desafio
+from desafio import ContaCorrente, Deposito, PessoaFisica, PessoaJuridica, Saque
+from exportacao import LeitorColunar, exportar
+from fechamento_diario import calcular_ajustes, fechar_dia
+from idempotencia import AUSENTE, CacheIdempotencia, cache_idempotencia
+from limites import MotorLimites, Regra, motor_limites
+from metricas import RegistroMetricas
+
+from lote import executar_lote
+from operacoes import ProcessadorOperacoes, executar_silencioso, silenciar_saida
+from renderizacao import Modelo, Paginador, escrever_em_blocos
+from repositorio import RepositorioClientes
+from servidor import ServidorBancario
+from shards import MotorShards
+
+
+def cadastro(cpf, numero):
+    """Operações para cadastrar um cliente com uma conta."""
+    return [
+        {
+            "operacao": "criar_cliente",
+            "cpf": cpf,
+            "nome": f"Cliente {cpf}",
+            "data_nascimento": "01/01/1990",
+            "endereco": "Rua Teste, 1 - Centro - São Paulo/SP",
+        },
+        {"operacao": "criar_conta", "cpf": cpf, "numero": numero},
+    ]
+
+
+def teste_processador():
+    """Testa operações e motivos de falha do processador."""
+    print("🧪 TESTE: ProcessadorOperacoes")
+    print("=" * 60)
+
+    processador = ProcessadorOperacoes()
+    operacoes = cadastro("11144477735", 1) + [
+        {"operacao": "depositar", "cpf": "111.444.777-35", "valor": 100},
+        {"operacao": "sacar", "cpf": "11144477735", "valor": 600},
+        {"operacao": "sacar", "cpf": "11144477735", "valor": 200},
+        {"operacao": "sacar", "cpf": "99999999999", "valor": 10},
+        {"operacao": "extrato", "cpf": "11144477735"},
+    ]
+    resultados = executar_silencioso(processador, operacoes)
+
+    motivos = [r.get("motivo") for r in resultados]
+    print(f"   Motivos: {motivos}")
+    esperados = [
+        None, None, None, "limite_saque", "saldo_insuficiente",
+        "cliente_nao_encontrado", None,
+    ]
+    saldo_ok = resultados[-1]["saldo"] == 100
+    print(f"   Saldo final correto: {'✅' if saldo_ok else '❌'}")
+
+    assert motivos == esperados and saldo_ok
+
+
+def teste_shards():
+    """Testa roteamento e scatter/gather do motor particionado."""
+    print("\n\n🧪 TESTE: Motor de contas particionado")
+    print("=" * 60)
+
+    cpfs = ["11144477735", "12345678909", "98765432100", "52998224725"]
+    operacoes = []
+    for numero, cpf in enumerate(cpfs, 1):
+        operacoes += cadastro(cpf, numero)
+        operacoes.append({"operacao": "depositar", "cpf": cpf, "valor": 50 * numero})
+
+    with MotorShards(2) as motor:
+        resultados = motor.executar_lote(operacoes)
+        # Sem CPF não há shard dono: a operação é recusada, não roteada.
+        sem_cpf = motor.executar_lote([
+            {"operacao": "depositar", "numero": 1, "valor": 10},
+            {"operacao": "fechar_dia"},
+        ])
+        contas = motor.listar_contas()
+
+    todos_ok = all(r["ok"] for r in resultados)
+    saldos = [conta["saldo"] for conta in contas]
+    recusadas = all(r == {"ok": False, "motivo": "operacao_sem_cpf"} for r in sem_cpf)
+    print(f"   Operações aceitas: {'✅' if todos_ok else '❌'}")
+    print(f"   Operações sem CPF recusadas: {'✅' if recusadas else f'❌ {sem_cpf}'}")
+    print(f"   Saldos por conta: {saldos}")
+
+    assert todos_ok and recusadas and saldos == [50, 100, 150, 200]
+
+
+def teste_lote():
+    """Testa o modo em lote a partir de um arquivo JSONL."""
+    print("\n\n🧪 TESTE: Modo em lote")
+    print("=" * 60)
+
+    operacoes = cadastro("11144477735", None)[:1] + [
+        {"operacao": "nova_conta", "cpf": "11144477735"},
+        {"operacao": "deposito", "cpf": "11144477735", "valor": 100},
+        {"operacao": "saque", "cpf": "11144477735", "valor": 0},
+        {"operacao": "extrato", "cpf": "11144477735"},
+        {"operacao": "transferir", "cpf": "11144477735"},
+    ]
+
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".jsonl", delete=False, encoding="utf-8"
+    ) as arquivo:
+        linhas = [json.dumps(op) for op in operacoes]
+        # Linhas malformadas (3 e 6) são contadas e o lote continua.
+        linhas[2:2] = ['{"operacao": "deposito", "cpf": ']
+        linhas[5:5] = ['["extrato"]']
+        arquivo.write("\n".join(linhas))
+        caminho = arquivo.name
+
+    try:
+        resumo = executar_lote(caminho, silencioso=True)
+    finally:
+        os.unlink(caminho)
+
+    print(f"   Resumo: {resumo['sucessos']}/{resumo['operacoes']} sucessos, "
+          f"falhas {resumo['falhas']}")
+
+    assert (
+        resumo["falhas"] == {
+            "valor_invalido": 1, "operacao_desconhecida": 1, "linha_invalida": 2,
+        }
+        and resumo["sucessos"] == 4 and resumo["linhas_invalidas"] == [3, 6]
+    )
+
+
+async def _sessao_servidor(operacoes):
+    """Envia todas as operações de uma vez (pipelining) e lê as respostas."""
+    servidor = ServidorBancario()
+    socket_servidor = await servidor.iniciar("127.0.0.1", 0)
+    porta = socket_servidor.sockets[0].getsockname()[1]
+
+    leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+    for i, requisicao in enumerate(operacoes):
+        escritor.write((json.dumps({**requisicao, "id": i}) + "\n").encode())
+    await escritor.drain()
+
+    respostas = [json.loads(await leitor.readline()) for _ in operacoes]
+    escritor.close()
+    await escritor.wait_closed()
+    await asyncio.sleep(0.05)
+    socket_servidor.close()
+    await socket_servidor.wait_closed()
+    return respostas
+
+
+async def _sessao_linha_excedida():
+    """Envia uma requisição válida seguida de uma linha acima de 64 KiB."""
+    servidor = ServidorBancario()
+    socket_servidor = await servidor.iniciar("127.0.0.1", 0)
+    porta = socket_servidor.sockets[0].getsockname()[1]
+
+    leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+    escritor.write(b'{"operacao": "listar_contas"}\n')
+    escritor.write(b'{"operacao": "extrato", "cpf": "' + b"1" * 70_000 + b'"}\n')
+    await escritor.drain()
+
+    # O servidor responde às duas e encerra a conexão.
+    recebido = await asyncio.wait_for(leitor.read(), 5)
+    respostas = [json.loads(linha) for linha in recebido.splitlines()]
+    escritor.close()
+    await asyncio.sleep(0.05)
+    conexoes = servidor._conexoes
+    socket_servidor.close()
+    await socket_servidor.wait_closed()
+    return respostas, conexoes
+
+
+def teste_servidor():
+    """Testa o serviço de rede com requisições em pipeline."""
+    print("\n\n🧪 TESTE: Servidor asyncio")
+    print("=" * 60)
+
+    operacoes = cadastro("11144477735", 1) + [
+        {"operacao": "depositar", "cpf": "11144477735", "valor": 80},
+        {"operacao": "sacar", "cpf": "11144477735", "valor": 30},
+        {"operacao": "extrato", "cpf": "11144477735"},
+        {"operacao": "apagar_tudo"},
+    ]
+
+    with silenciar_saida():
+        respostas = asyncio.run(_sessao_servidor(operacoes))
+
+    em_ordem = [r["id"] for r in respostas] == list(range(len(operacoes)))
+    saldo_ok = respostas[4]["saldo"] == 50
+    desconhecida = respostas[5]["motivo"] == "operacao_desconhecida"
+    print(f"   Respostas em ordem: {'✅' if em_ordem else '❌'}")
+    print(f"   Saldo após depósito e saque: {'✅' if saldo_ok else '❌'}")
+
+    with silenciar_saida():
+        respostas, conexoes = asyncio.run(_sessao_linha_excedida())
+    excedida = (
+        [r["ok"] for r in respostas] == [True, False]
+        and respostas[1]["motivo"] == "requisicao_muito_grande" and conexoes == 0
+    )
+    print(f"   Linha acima do limite: {[r.get('motivo', 'ok') for r in respostas]} | "
+          f"Conexões abertas: {conexoes}")
+
+    assert em_ordem and saldo_ok and desconhecida and excedida
+
+
+def teste_exportacao():
+    """Testa a exportação em CSV e no formato colunar."""
+    print("\n\n🧪 TESTE: Exportação")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        db_path = os.path.join(diretorio, "exportacao.db")
+        with silenciar_saida():
+            db = DatabaseManager(db_path)
+            for nome, cpf in (("João da Silva", "11144477735"), ("Ana Souza", "12345678909")):
+                db.inserir_pessoa_fisica({
+                    "nome": nome, "cpf": cpf, "data_nascimento": "01/01/1990",
+                    "endereco": "Rua A, 1",
+                })
+
+        csv_resumo = exportar("PF", os.path.join(diretorio, "pf.csv"),
+                              tamanho_lote=1, db_path=db_path)
+        caminho_colunar = os.path.join(diretorio, "pf.bcol")
+        exportar("PF", caminho_colunar, tamanho_lote=1, db_path=db_path)
+
+        with LeitorColunar(caminho_colunar) as leitor:
+            nomes = list(leitor.coluna("nome"))
+            cpfs = list(leitor.coluna("cpf"))
+
+    print(f"   Linhas em CSV: {csv_resumo['linhas']} "
+          f"({csv_resumo['linhas_por_segundo']:.0f} linhas/s)")
+    print(f"   Colunar: {nomes} {cpfs}")
+
+    assert (csv_resumo["linhas"] == 2
+            and nomes == ["João da Silva", "Ana Souza"]
+            and cpfs == ["11144477735", "12345678909"])
+
+
+def teste_metricas():
+    """Testa o formato de exposição das métricas (Prometheus)."""
+    print("\n\n🧪 TESTE: Exposição de métricas")
+    print("=" * 60)
+
+    registro = RegistroMetricas()
+    registro.incrementar("banco_transacoes_total", 1_234_567, tipo="Deposito", resultado="sucesso")
+    registro.incrementar("banco_fechamento_valores_total", 1234567.89, tipo="juros")
+    registro.incrementar("banco_db_erros_total", operacao='busca "x"\\\n', tipo="bloqueio")
+    registro.definir("fila_pendente", 3)
+    registro.registrar_coletor(lambda: [("banco_idempotencia_chaves", (), 42)])
+    linhas = registro.exposicao().splitlines()
+    for linha in linhas:
+        print(f"   {linha}")
+
+    esperadas = [
+        "# HELP banco_transacoes_total Transações registradas por tipo e resultado.",
+        "# TYPE banco_transacoes_total counter",
+        'banco_transacoes_total{resultado="sucesso",tipo="Deposito"} 1234567',
+        'banco_fechamento_valores_total{tipo="juros"} 1234567.89',
+        r'banco_db_erros_total{operacao="busca \"x\"\\\n",tipo="bloqueio"} 1',
+        "# TYPE banco_idempotencia_chaves gauge",
+        "banco_idempotencia_chaves 42",
+        "# HELP fila_pendente fila_pendente",
+        "# TYPE fila_pendente gauge",
+        "fila_pendente 3",
+    ]
+    faltando = [linha for linha in esperadas if linha not in linhas]
+    if faltando:
+        print(f"   Linhas ausentes: {faltando}")
+    assert not faltando
+
+
+def teste_backup():
+    """Testa o backup online, a verificação de integridade e a retenção."""
+    print("\n\n🧪 TESTE: Backup")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        with silenciar_saida():
+            db = DatabaseManager(os.path.join(diretorio, "origem.db"))
+            db.inserir_pessoa_fisica({
+                "nome": "João da Silva", "cpf": "11144477735",
+                "data_nascimento": "15/03/1985", "endereco": "Rua A, 1",
+            })
+
+        backups = GerenciadorBackups(
+            db, os.path.join(diretorio, "backups"), manter=2, paginas_por_passo=1
+        )
+        destinos = [backups.executar() for _ in range(3)]
+        existentes = backups.listar()
+
+        # Sem intervalo, o agendamento faz um backup e a thread termina.
+        backups.iniciar()._thread.join(timeout=5)
+        unico = not backups._thread.is_alive()
+        with silenciar_saida():
+            destino_invalido = db.fazer_backup(os.path.join(diretorio, "nao", "existe.db"))
+
+        with silenciar_saida():
+            copia = DatabaseManager(str(destinos[-1]))
+            restaurado = copia.buscar_cliente_por_documento("11144477735") is not None
+        integro = db.verificar_integridade(destinos[-1])
+
+    print(f"   Cópias mantidas: {len(existentes)} de {len(destinos)}")
+    print(f"   Integridade: {'✅' if integro else '❌'}  Cliente na cópia: "
+          f"{'✅' if restaurado else '❌'}")
+    print(f"   Backup único sem intervalo: {'✅' if unico else '❌'}  Destino inválido "
+          f"recusado: {'✅' if destino_invalido is False else '❌'}")
+
+    assert (len(existentes) == 2 and existentes[-1] == destinos[-1] and integro and restaurado
+            and unico and destino_invalido is False)
+
+
+def teste_limites():
+    """Testa janelas deslizantes e políticas carregadas de JSON."""
+    print("\n\n🧪 TESTE: Motor de limites")
+    print("=" * 60)
+
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", delete=False, encoding="utf-8"
+    ) as arquivo:
+        json.dump({
+            "padrao": [{"nome": "saques_24h", "janela": "dia", "tipos": ["Saque"],
+                        "max_valor": 300}],
+            "contas": {"7": [{"nome": "por_hora", "janela": "hora", "max_quantidade": 2}],
+                       "0002/1": [{"nome": "um_por_dia", "janela": "dia", "max_quantidade": 1}]},
+        }, arquivo)
+        caminho = arquivo.name
+
+    try:
+        motor = MotorLimites()
+        motor.carregar(caminho)
+    finally:
+        os.unlink(caminho)
+
+    cliente = PessoaFisica("Teste", "01/01/1990", "11144477735", "Rua A")
+    comum = ContaCorrente(1, cliente)
+    especial = ContaCorrente(7, cliente)
+    inicio = datetime(2025, 1, 1, 12, 0)
+
+    def tentar(conta, transacao, minutos):
+        agora = inicio + timedelta(minutes=minutos)
+        violacao = motor.verificar(conta, transacao, agora)
+        if not violacao:
+            motor.registrar(conta, transacao, agora)
+        return violacao[0].nome if violacao else "ok"
+
+    resultados = [
+        tentar(comum, Saque(200), 0),
+        tentar(comum, Deposito(1000), 1),
+        tentar(comum, Saque(200), 2),
+        tentar(comum, Saque(200), 60 * 25),
+        tentar(especial, Deposito(1), 0),
+        tentar(especial, Deposito(1), 10),
+        tentar(especial, Deposito(1), 20),
+        tentar(especial, Deposito(1), 61),
+    ]
+    # A política da conta 1 da agência 0002 não vale para a conta 1 da 0001.
+    outra_agencia = ContaCorrente(1, cliente, agencia="0002")
+    resultados += [
+        tentar(outra_agencia, Deposito(1), 0),
+        tentar(outra_agencia, Deposito(1), 1),
+    ]
+    esperado = ["ok", "ok", "saques_24h", "ok", "ok", "ok", "por_hora", "ok",
+                "ok", "um_por_dia"]
+    print(f"   Resultados: {resultados}")
+
+    # Verificação, operação e contagem atômicas: só uma de 8 tentativas
+    # simultâneas cabe no limite de 1 transação.
+    motor.definir_politica(3, [Regra("unica", "dia", max_quantidade=1)])
+    conta = ContaCorrente(3, cliente)
+
+    def operacao():
+        time.sleep(0.01)
+        return True
+
+    sucessos = []
+    threads = [
+        threading.Thread(target=lambda: sucessos.append(
+            motor.aplicar(conta, Deposito(1), operacao, inicio)[1]))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"   Tentativas simultâneas aceitas: {sucessos.count(True)}/8")
+
+    assert resultados == esperado and sucessos.count(True) == 1
+
+
+def teste_idempotencia():
+    """Testa a supressão de transações repetidas e a expiração das chaves."""
+    print("\n\n🧪 TESTE: Chaves de idempotência")
+    print("=" * 60)
+
+    processador = ProcessadorOperacoes()
+    respostas = executar_silencioso(processador, cadastro("52998224725", 1) + [
+        {"operacao": "depositar", "cpf": "52998224725", "valor": 100,
+         "chave_idempotencia": "dep-1"},
+        {"operacao": "depositar", "cpf": "52998224725", "valor": 100,
+         "chave_idempotencia": "dep-1"},
+        {"operacao": "sacar", "cpf": "52998224725", "valor": 30,
+         "chave_idempotencia": "saq-1"},
+        {"operacao": "sacar", "cpf": "52998224725", "valor": 30,
+         "chave_idempotencia": "saq-1"},
+    ])
+    deposito, deposito_repetido, saque, saque_repetido = respostas[2:]
+    print(f"   Respostas: {respostas[2:]}")
+
+    suprimidas = (
+        deposito_repetido.get("repetida") and saque_repetido.get("repetida")
+        and deposito["ok"] and saque["ok"] and saque_repetido["saldo"] == 70.0
+    )
+
+    # A repetição devolve a resposta original, não o estado atual da conta;
+    # a mesma chave com outro valor ou tipo é recusada.
+    respostas = executar_silencioso(processador, [
+        {"operacao": "sacar", "cpf": "52998224725", "valor": 90,
+         "chave_idempotencia": "saq-2"},
+        {"operacao": "depositar", "cpf": "52998224725", "valor": 100,
+         "chave_idempotencia": "dep-1"},
+        {"operacao": "depositar", "cpf": "52998224725", "valor": 50},
+        {"operacao": "sacar", "cpf": "52998224725", "valor": 90,
+         "chave_idempotencia": "saq-2"},
+        {"operacao": "depositar", "cpf": "52998224725", "valor": 500,
+         "chave_idempotencia": "dep-1"},
+        {"operacao": "sacar", "cpf": "52998224725", "valor": 100,
+         "chave_idempotencia": "dep-1"},
+    ])
+    recusado, deposito_antigo, _, recusado_repetido, *conflitos = respostas
+    print(f"   Repetições após outras transações: {respostas}")
+
+    # O motivo é guardado com a resposta; alterar a devolvida não altera o cache.
+    conta = processador.contas[1]
+    saque = Saque(900, chave_idempotencia="saq-3")
+    with silenciar_saida():
+        conta.cliente.realizar_transacao(conta, saque)
+    saque.resultado["motivo"] = "alterado"
+    guardado = cache_idempotencia.obter((conta.agencia, conta.numero, "saq-3"))
+    originais = (
+        deposito_antigo["saldo"] == 100.0
+        and recusado["motivo"] == recusado_repetido["motivo"] == "saldo_insuficiente"
+        and recusado_repetido["saldo"] == 70.0 and recusado_repetido.get("repetida")
+        and all(r["motivo"] == "chave_idempotencia_conflitante" for r in conflitos)
+        and processador.contas[1].saldo == 120.0
+        and guardado["motivo"] == "limite_saque"
+    )
+
+    cache = CacheIdempotencia(capacidade=2, ttl=10)
+    cache.guardar("a", True, agora=0)
+    cache.guardar("b", False, agora=1)
+    cache.obter("a", agora=2)
+    cache.guardar("c", True, agora=3)  # Descarta "b", o menos usado.
+    despejo = cache.obter("b", agora=3) is AUSENTE and cache.obter("a", agora=3) is True
+    expiracao = cache.obter("c", agora=13) is AUSENTE and cache.obter("a", agora=5) is True
+    # O uso renova o prazo: "a", lida em 5, vale até 15.
+    expiracao = expiracao and cache.obter("a", agora=14) is True
+    print(f"   Capacidade respeitada: {despejo} | Expiração: {expiracao}")
+
+    assert suprimidas and originais and despejo and expiracao
+
+
+def teste_renderizacao():
+    """Testa a escrita em blocos e a paginação sob demanda."""
+    print("\n\n🧪 TESTE: Renderização de listagens")
+    print("=" * 60)
+
+    modelo = Modelo("[{indice:3d}] {nome}\n")
+    lidos = []
+
+    def fonte(total):
+        for indice in range(1, total + 1):
+            lidos.append(indice)
+            yield modelo(indice=indice, nome=f"Cliente {indice}")
+
+    class Saida(io.StringIO):
+        escritas = 0
+
+        def write(self, texto):
+            self.escritas += 1
+            return super().write(texto)
+
+    saida = Saida()
+    gravados = escrever_em_blocos(fonte(10_000), saida, tamanho_bloco=4096)
+    linhas = saida.getvalue().splitlines()
+    blocos = gravados == 10_000 and linhas[-1] == "[10000] Cliente 10000" and saida.escritas < 100
+    print(f"   {gravados} registros em {saida.escritas} escrita(s)")
+
+    # Próxima, próxima, anterior, sair: lê só até a página seguinte à terceira.
+    lidos.clear()
+    respostas = iter(["p", "", "a", "s"])
+    paginas = Paginador(fonte(1_000), 10, io.StringIO(), lambda _: next(respostas)).exibir()
+    sob_demanda = paginas == 4 and len(lidos) == 40
+    print(f"   Páginas lidas: {paginas} | Registros lidos da fonte: {len(lidos)}")
+
+    assert blocos and sob_demanda
+
+
+def teste_repositorio():
+    """Testa o processador sobre o cadastro do banco, com carga sob demanda."""
+    print("\n\n🧪 TESTE: Repositório de clientes")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        with silenciar_saida():
+            db = DatabaseManager(os.path.join(diretorio, "repositorio.db"))
+            for nome, cpf in (("Ana Souza", "12345678909"), ("Rui Lima", "52998224725"),
+                              ("Eva Reis", "98765432100")):
+                db.inserir_pessoa_fisica({
+                    "nome": nome, "cpf": cpf, "data_nascimento": "01/01/1990",
+                    "endereco": "Rua A, 1 - Centro - Recife/PE",
+                })
+            db.inserir_pessoa_juridica({
+                "razao_social": "ACME Ltda", "cnpj": "11222333000181",
+                "endereco": "Rua B, 2", "representante_legal": "Ana Souza",
+            })
+
+        repositorio = RepositorioClientes(db, capacidade=1)
+        processador = ProcessadorOperacoes(repositorio)
+        respostas = executar_silencioso(processador, [
+            {"operacao": "criar_conta", "cpf": "123.456.789-09"},
+            {"operacao": "depositar", "cpf": "12345678909", "valor": 100},
+            {"operacao": "criar_cliente", "cpf": "11144477735", "nome": "Novo",
+             "data_nascimento": "01/01/2000", "endereco": "Rua C"},
+            {"operacao": "criar_cliente", "cpf": "52998224725", "nome": "Rui",
+             "data_nascimento": "01/01/1990", "endereco": "Rua A"},
+        ])
+        print(f"   Respostas: {[r.get('motivo', 'ok') for r in respostas]}")
+
+        # Só o mais recente fica fixado; sem conta aberta, os demais podem sair.
+        repositorio.obter("98765432100")
+        repositorio.obter("11222333000181")
+        gc.collect()
+        empresa = repositorio.obter("11.222.333/0001-81")
+        titular = processador.contas[1].cliente
+
+        operacoes_ok = (
+            [r["ok"] for r in respostas] == [True, True, True, False]
+            and respostas[3]["motivo"] == "cliente_existente"
+            and db.cpf_existe("11144477735")
+        )
+        identidade = (
+            repositorio.obter("12345678909") is titular
+            and isinstance(empresa, PessoaJuridica) and empresa.nome == "ACME Ltda"
+        )
+        limitado = repositorio.em_memoria <= 3
+        print(f"   Em memória: {repositorio.em_memoria} de {len(repositorio)} cadastrados")
+
+        # Listagem pelo menu: `python desafio.py` roda uma segunda cópia do
+        # módulo, com classes diferentes das criadas pelo repositório.
+        como_script = runpy.run_path(desafio.__file__, run_name="desafio_script")
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            como_script["listar_clientes"](repositorio)
+        listagem = saida.getvalue()
+        listados = (
+            "CPF:\t\t123.456.789-09" in listagem
+            and "CNPJ:\t\t11.222.333/0001-81" in listagem
+            and "Razão Social:\tACME Ltda" in listagem
+        )
+        print(f"   Listagem com PF e PJ: {'✅' if listados else '❌'}")
+
+        # Empresa sem representante: o erro informado é o do campo ausente.
+        saida = io.StringIO()
+        with contextlib.redirect_stdout(saida):
+            recusada = not repositorio.append(
+                PessoaJuridica("Sem Rep Ltda", "11444777000161", "Rua D")
+            )
+        sem_representante = recusada and "Representante Legal é obrigatório" in saida.getvalue()
+        print(f"   Empresa sem representante: {'✅' if sem_representante else '❌'}")
+
+    assert operacoes_ok and identidade and limitado and listados and sem_representante
+
+
+def teste_instrumentacao():
+    """Testa a instrumentação do menu ativada por BANCO_INSTRUMENTACAO."""
+    print("\n\n🧪 TESTE: Instrumentação do menu")
+    print("=" * 60)
+
+    # Novo cliente, nova conta, depósito, extrato e sair.
+    cpf = "11144477735"
+    entrada = "\n".join(["5", cpf, "Teste", "01/01/1990", "Rua A", "4", cpf,
+                         "1", cpf, "100", "3", cpf, "0"]) + "\n"
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        arquivo = os.path.join(diretorio, "latencias.json")
+        subprocess.run(
+            [sys.executable, desafio.__file__], input=entrada, text=True,
+            capture_output=True, env={**os.environ, "BANCO_INSTRUMENTACAO": arquivo},
+            timeout=60,
+        )
+        with open(arquivo, encoding="utf-8") as entrada_json:
+            operacoes = json.load(entrada_json)
+
+    esperadas = ["desafio.depositar", "desafio.exibir_extrato", "Cliente.realizar_transacao"]
+    medidas = [nome for nome in esperadas if operacoes.get(nome, {}).get("total", {}).get("chamadas")]
+    print(f"   Operações do domínio medidas: {medidas}")
+    assert medidas == esperadas
+
+
+def teste_carga():
+    """Testa o teste de carga e a detecção de banco bloqueado."""
+    print("\n\n🧪 TESTE: Teste de carga")
+    print("=" * 60)
+
+    relatorio = executar_carga(atores=2, duracao=0.5, clientes=500)
+    print(f"   {relatorio['operacoes']} operações ({relatorio['por_segundo']:.0f} ops/s)")
+    executou = relatorio["operacoes"] > 0 and all(
+        dados["chamadas"] > 0 and dados["falhas"] == 0 and "p99_us" in dados
+        for dados in relatorio["por_operacao"].values()
+    )
+
+    # Outra conexão segura o banco: a escrita falha como "bloqueio".
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "bloqueado.db")
+        with silenciar_saida():
+            db = DatabaseManager(caminho)
+            db.init_database()
+        db.timeout_bloqueio = 0.01
+        conn = sqlite3.connect(caminho)
+        conn.execute("BEGIN EXCLUSIVE")
+        try:
+            with silenciar_saida():
+                inserido = db.inserir_pessoa_fisica({
+                    "nome": "Teste", "cpf": "12345678909",
+                    "data_nascimento": "01/01/1990", "endereco": "Rua A",
+                })
+        finally:
+            conn.rollback()
+            conn.close()
+        bloqueio = not inserido and ultimo_erro() == "bloqueio" and ultimo_erro() is None
+        print(f"   Escrita com o banco bloqueado: {'recusada' if bloqueio else 'aceita'}")
+
+    assert executou and bloqueio
+
+
+def teste_fechamento():
+    """Testa o fechamento diário em lote, com retomada pelo checkpoint."""
+    print("\n\n🧪 TESTE: Fechamento diário")
+    print("=" * 60)
+
+    processador = ProcessadorOperacoes()
+    operacoes = []
+    for numero, (cpf, saldo) in enumerate(
+        (("11144477735", 0), ("12345678909", 100), ("52998224725", 2000)), 1
+    ):
+        operacoes += cadastro(cpf, numero)
+        if saldo:
+            operacoes.append({"operacao": "depositar", "cpf": cpf, "valor": saldo})
+    executar_silencioso(processador, operacoes)
+    contas = processador.contas
+    uso_antes = motor_limites.uso(contas[2])
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        checkpoint = os.path.join(diretorio, "fechamento.json")
+        dia = datetime(2025, 1, 31).date()
+
+        # Primeira execução interrompida após um bloco de duas contas.
+        parcial = fechar_dia(contas.values(), dia, checkpoint, tamanho_bloco=2, max_blocos=1)
+        with open(checkpoint, encoding="utf-8") as arquivo:
+            gravado = json.load(arquivo)
+        final = fechar_dia(contas.values(), dia, checkpoint, tamanho_bloco=2)
+        repetido = executar_silencioso(processador, [
+            {"operacao": "fechar_dia", "data": "31/01/2025"},
+        ])[0]
+        print(f"   Parcial: {parcial['processadas']}/{parcial['contas']} | "
+              f"Final: juros R$ {final['juros']:.2f}, tarifas R$ {final['tarifas']:.2f}")
+
+    saldos = [round(contas[n].saldo, 2) for n in (1, 2, 3)]
+    ultima = contas[2].historico.transacoes[-1]
+    print(f"   Saldos: {saldos} | Última do extrato: {ultima['tipo']} R$ {ultima['valor']:.2f}")
+
+    # Fechamento de um dia passado: o histórico segue em ordem cronológica e
+    # o dia fechado fica na referência do lançamento.
+    historico = contas[2].historico
+    datas = [datetime.strptime(t["data"], "%d/%m/%Y %H:%M:%S") for t in historico.transacoes]
+    hoje = historico.pagina_extrato(desde=datetime.now().strftime("%d/%m/%Y"))
+    em_ordem = (
+        datas == sorted(datas) and ultima["referencia"] == "31/01/2025"
+        and len(hoje["linhas"]) == 3 and hoje["linhas"][-1].endswith("(ref. 31/01/2025)")
+    )
+    print(f"   Histórico em ordem cronológica: {em_ordem}")
+
+    correto = (
+        not parcial["concluido"] and gravado["processadas"] == 2
+        and final["concluido"] and final["retomado"] and final["ajustadas"] == 3
+        and em_ordem
+        and saldos == [0, 99.53, 2000.6]
+        and (final["juros"], final["tarifas"]) == (0.63, 0.5)
+        and repetido["ok"] and repetido["ajustadas"] == 0
+        and [t["tipo"] for t in contas[2].historico.transacoes] == ["Deposito", "Juros", "Tarifa"]
+        and contas[2].historico.pagina_extrato()["saldo_anterior"] == 0.0
+        and uso_antes == "Transações hoje: 1/10"
+        and motor_limites.uso(contas[2]) == "Transações hoje: 0/10"
+    )
+
+    # O fechamento reinicia só os contadores diários: o limite mensal continua.
+    motor_limites.definir_politica(99, [
+        Regra("mensal", "mes", max_valor=1000, deslizante=False),
+        Regra("diario", "dia", max_quantidade=1, deslizante=False),
+    ])
+    try:
+        processador = ProcessadorOperacoes()
+        depositos = [{"operacao": "depositar", "cpf": "11144477735", "valor": valor}
+                     for valor in (900, 900)]
+        antes = executar_silencioso(processador, cadastro("11144477735", 99) + depositos)[2:]
+        executar_silencioso(processador, [{"operacao": "fechar_dia"}])
+        depois = executar_silencioso(processador, depositos + [
+            {"operacao": "depositar", "cpf": "11144477735", "valor": 50},
+        ])
+    finally:
+        motor_limites.remover_politica(99)
+    print(f"   Depósitos antes/depois do fechamento: "
+          f"{[r['ok'] for r in antes]} / {[r['ok'] for r in depois]}")
+    limites_preservados = (
+        [r["ok"] for r in antes] == [True, False]
+        and [r["ok"] for r in depois] == [False, False, True]
+    )
+
+    # Tarifa limitada ao saldo, em centavos.
+    _, tarifas = calcular_ajustes(array("d", [0.333]))
+    arredondada = list(tarifas) == [0.33]
+
+    assert correto and limites_preservados and arredondada
+
+
+def _passou(teste) -> bool:
+    """Executa um teste; uma verificação que falha conta como falha do teste."""
+    try:
+        teste()
+        return True
+    except AssertionError:
+        return False
+
+
+def main():
+    """Executa os testes de operações."""
+    resultados = [
+        ("ProcessadorOperacoes", _passou(teste_processador)),
+        ("Motor particionado", _passou(teste_shards)),
+        ("Modo em lote", _passou(teste_lote)),
+        ("Servidor asyncio", _passou(teste_servidor)),
+        ("Exportação", _passou(teste_exportacao)),
+        ("Métricas", _passou(teste_metricas)),
+        ("Backup", _passou(teste_backup)),
+        ("Motor de limites", _passou(teste_limites)),
+        ("Idempotência", _passou(teste_idempotencia)),
+        ("Renderização", _passou(teste_renderizacao)),
+        ("Repositório de clientes", _passou(teste_repositorio)),
+        ("Instrumentação do menu", _passou(teste_instrumentacao)),
+        ("Teste de carga", _passou(teste_carga)),
+        ("Fechamento diário", _passou(teste_fechamento)),
+    ]
+
+    print("\n\n📊 RELATÓRIO FINAL")
+    print("=" * 60)
+    for nome, resultado in resultados:
+        print(f"{nome:<25} {'✅ PASSOU' if resultado else '❌ FALHOU'}")
+
+
+if __name__ == "__main__":
+    main()
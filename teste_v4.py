@@ -4,6 +4,7 @@ Teste da versão 4.2 do Sistema Bancário
 Foco: Validação do limite de 10 transações diárias, funcionalidades de data/hora e log em arquivo
 """
 
+import io
 import sys
 import os
 from datetime import datetime, timedelta
@@ -53,7 +54,7 @@ def teste_limite_transacoes_diarias():
     for i, transacao in enumerate(conta.historico.transacoes[-5:], 1):  # Últimas 5.
         print(f"   {i}. {transacao['tipo']}: R$ {transacao['valor']:.2f} - {transacao['data']}")
 
-    return len(list(conta.historico.transacoes_do_dia())) == 10
+    assert len(list(conta.historico.transacoes_do_dia())) == 10
 
 def teste_funcionalidades_datetime():
     """Testa as funcionalidades de data e hora."""
@@ -90,7 +91,7 @@ def teste_funcionalidades_datetime():
     for transacao in transacoes_hoje:
         print(f"   - {transacao['tipo']}: R$ {transacao['valor']:.2f}")
 
-    return len(transacoes_hoje) == 3
+    assert len(transacoes_hoje) == 3
 
 def teste_log_arquivo():
     """🆕 Testa o log em arquivo."""
@@ -120,6 +121,15 @@ def teste_log_arquivo():
     resultado = cliente.realizar_transacao(conta, saque)
     print(f"   Saque: {'✅ Sucesso' if resultado else '❌ Falha'}")
 
+    # Cadastro e depósito pelo menu (funções decoradas), com um CPF vazio digitado.
+    entrada_original = sys.stdin
+    sys.stdin = io.StringIO("\n\n")
+    try:
+        criar_cliente([])
+        depositar([])
+    finally:
+        sys.stdin = entrada_original
+
     print("\n3. Verificando arquivo de log gerado:")
     if log_file.exists():
         print("   ✅ Arquivo log.txt criado com sucesso!")
@@ -146,10 +156,10 @@ def teste_log_arquivo():
         print(f"   Argumentos registrados: {'✅' if tem_argumentos else '❌'}")
         print(f"   Valor de retorno: {'✅' if tem_retorno else '❌'}")
 
-        return len(linhas) >= 2 and tem_data and tem_funcao
+        assert len(linhas) >= 2 and tem_data and tem_funcao
     else:
         print("   ❌ Arquivo de log não foi criado!")
-        return False
+        assert False, "log.txt não foi criado"
 
 def teste_decorator_log():
     """Testa o decorator de log de transações."""
@@ -168,7 +178,45 @@ def teste_decorator_log():
     saque = Saque(50.00)
     resultado = cliente.realizar_transacao(conta, saque)
 
-    return True
+def teste_extrato_paginado():
+    """Testa as páginas do extrato, com cursor e saldo anterior."""
+    print("\n\n🧪 TESTE V4.2: Extrato paginado")
+    print("="*60)
+
+    cliente = PessoaFisica(nome="Teste Extrato", data_nascimento="01/01/1990", cpf="12345678999", endereco="Rua Teste, 123")
+    conta = ContaCorrente.nova_conta(cliente=cliente, numero=1)
+    cliente.adicionar_conta(conta)
+
+    # 25 depósitos de R$ 10,00 (registrados direto, sem o limite diário).
+    for _ in range(25):
+        Deposito(10.00).registrar(conta)
+
+    primeira = conta.historico.pagina_extrato(limite=10)
+    segunda = conta.historico.pagina_extrato(primeira["proximo"], limite=10)
+    ultima = conta.historico.pagina_extrato(segunda["proximo"], limite=10)
+    print(f"   Primeira página: {primeira['linhas'][0]} ... saldo anterior R$ {primeira['saldo_anterior']:.2f}")
+    print(f"   Última página: {len(ultima['linhas'])} linha(s), próximo = {ultima['proximo']}")
+
+    paginas_ok = (
+        primeira["linhas"][0].startswith("25.")
+        and primeira["saldo_anterior"] == 150.00
+        and segunda["saldo_anterior"] == 50.00
+        and len(ultima["linhas"]) == 5 and ultima["proximo"] is None
+    )
+
+    # Linhas em cache: rever a página não formata de novo.
+    cache_ok = conta.historico.pagina_extrato(limite=10)["linhas"][0] is primeira["linhas"][0]
+
+    hoje = datetime.now().strftime("%d/%m/%Y")
+    amanha = (datetime.now() + timedelta(days=1)).strftime("%d/%m/%Y")
+    desde_hoje = conta.historico.pagina_extrato(limite=10, desde=hoje)
+    desde_ok = (
+        desde_hoje["linhas"][0].startswith(" 1.") and desde_hoje["proximo"] == 10
+        and not conta.historico.pagina_extrato(desde=amanha)["linhas"]
+    )
+    print(f"   Cursor e saldo: {'✅' if paginas_ok else '❌'} | Cache: {'✅' if cache_ok else '❌'} | Desde a data: {'✅' if desde_ok else '❌'}")
+
+    assert paginas_ok and cache_ok and desde_ok
 
 def main():
     """Executa todos os testes da v4.2."""
@@ -180,36 +228,44 @@ def main():
 
     # Teste 1: Limite de transações.
     try:
-        resultado1 = teste_limite_transacoes_diarias()
-        resultados.append(("Limite 10 transações", resultado1))
+        teste_limite_transacoes_diarias()
+        resultados.append(("Limite 10 transações", True))
     except Exception as e:
         print(f"❌ Erro no teste de limite: {e}")
         resultados.append(("Limite 10 transações", False))
 
     # Teste 2: Funcionalidades de data/hora.
     try:
-        resultado2 = teste_funcionalidades_datetime()
-        resultados.append(("Funcionalidades DateTime", resultado2))
+        teste_funcionalidades_datetime()
+        resultados.append(("Funcionalidades DateTime", True))
     except Exception as e:
         print(f"❌ Erro no teste de datetime: {e}")
         resultados.append(("Funcionalidades DateTime", False))
 
     # Teste 3: Log em arquivo.
     try:
-        resultado3 = teste_log_arquivo()
-        resultados.append(("Log em Arquivo", resultado3))
+        teste_log_arquivo()
+        resultados.append(("Log em Arquivo", True))
     except Exception as e:
         print(f"❌ Erro no teste de log em arquivo: {e}")
         resultados.append(("Log em Arquivo", False))
 
     # Teste 4: Decorator de log.
     try:
-        resultado4 = teste_decorator_log()
-        resultados.append(("Decorator de Log", resultado4))
+        teste_decorator_log()
+        resultados.append(("Decorator de Log", True))
     except Exception as e:
         print(f"❌ Erro no teste de decorator: {e}")
         resultados.append(("Decorator de Log", False))
 
+    # Teste 5: Extrato paginado.
+    try:
+        teste_extrato_paginado()
+        resultados.append(("Extrato Paginado", True))
+    except Exception as e:
+        print(f"❌ Erro no teste de extrato: {e}")
+        resultados.append(("Extrato Paginado", False))
+
     # Relatório final.
     print("\n\n📊 RELATÓRIO FINAL DOS TESTES V4.2")
     print("="*60)